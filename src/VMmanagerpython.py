@@ -12,9 +12,59 @@ import sys
 import json
 import csv
 import shutil
+import tempfile
+import multiprocessing
+import functools
+import concurrent.futures
+import re
+from collections import namedtuple
+from collections import deque
 from styles import MenuStyle  # Add this import at the top
 from tag_sidebar import TagSidebar
 from tag_manager import TagManager
+from status_engine import StatusEngine
+from probe_scheduler import ProbeScheduler
+from dns_cache import DnsCache, DnsTimeoutError
+from selector_prober import SelectorProber
+from sharded_prober import ShardedProber
+from status_store import StatusStore
+from sqlite_storage import DB_FILE_NAME, SqliteStorage
+from shared_snapshot import LeaderLease, SnapshotReader, SnapshotWriter
+from status_history import FleetHistory
+from write_behind import WriteBehind
+from inventory_import import InventoryRow, read_inventory
+from inventory_sync import InventoryDiff, diff_inventory, format_diff
+
+# Status changes are applied to the cards on a fixed-rate tick, bounded per frame
+STATUS_FRAME_MS = 50
+STATUS_FRAME_CAP = 250
+STATUS_FRAME_BUDGET = 0.004  # Seconds of Tk time per frame
+
+# How often a tracked inventory file is checked for changes (automatic sync)
+INVENTORY_CHECK_SECONDS = 60
+
+# Host names and IPv4 addresses; ":", "=" and "," would break the data file formats
+MACHINE_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]{0,252}")
+
+# Outcome of VMManager.add_pcs(): lists of machine names
+BulkAddResult = namedtuple("BulkAddResult", ["added", "duplicates", "invalid"])
+
+# Outcome of VMManager.import_inventory(): lists of machine names
+ImportResult = namedtuple("ImportResult", ["added", "updated", "invalid"])
+
+# Collections saved by VMManager.save_later(): name -> (VMManager attribute, FileManager save method)
+SAVED_COLLECTIONS = {
+    "pcs": ("pc_names", "save_pcs"),
+    "last_used_times": ("last_used_times", "save_last_used_times"),
+    "descriptions": ("descriptions", "save_descriptions"),
+    "machine_rdp_paths": ("machine_rdp_paths", "save_machine_rdp_paths"),
+    "categories": ("categories", "save_categories"),
+    "category_colors": ("category_colors", "save_category_colors"),
+    "machine_categories": ("machine_categories", "save_machine_categories"),
+    "tags": ("tags", "save_tags"),
+    "machine_tags": ("machine_tags", "save_machine_tags"),
+    "machine_probe_configs": ("machine_probe_configs", "save_machine_probe_configs"),
+}
 
 THEMES = {
     "dark": {
@@ -98,9 +148,14 @@ THEMES = {
 
 class FileManager:
     """Manages all file operations and data storage for the application.
-    Handles reading/writing of machine data, settings, categories, and tags."""
-    def __init__(self):
-        self.data_dir = self._get_data_directory()
+    Handles reading/writing of machine data, settings, categories, and tags.
+    data_dir overrides the configured data directory (e.g. for the headless CLI)."""
+    def __init__(self, data_dir=None):
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+            self.data_dir = data_dir
+        else:
+            self.data_dir = self._get_data_directory()
         self.pc_file_path = os.path.join(self.data_dir, "pcs.txt")
         self.last_used_file_path = os.path.join(self.data_dir, "last_used.txt")
         self.descriptions_file_path = os.path.join(self.data_dir, "descriptions.txt")
@@ -111,6 +166,7 @@ class FileManager:
         self.tags_file_path = os.path.join(self.data_dir, "tags.txt")
         self.machine_tags_file_path = os.path.join(self.data_dir, "machine_tags.txt")
         self.machine_ips_file = os.path.join(self.data_dir, "machine_ips.txt")
+        self.machine_probe_file_path = os.path.join(self.data_dir, "machine_probe.txt")
 
     def _get_data_directory(self):
         """Get the data directory path from settings or use default"""
@@ -119,7 +175,8 @@ class FileManager:
         exe_settings_path = os.path.join(exe_dir, "settings.txt")
         
         # Then check the default location in LOCALAPPDATA
-        default_data_dir = os.path.join(os.getenv("LOCALAPPDATA"), "VmManager")
+        # (falls back to the home directory where LOCALAPPDATA doesn't exist, e.g. Linux)
+        default_data_dir = os.path.join(os.getenv("LOCALAPPDATA") or os.path.expanduser("~"), "VmManager")
         default_settings_path = os.path.join(default_data_dir, "settings.txt")
         
         # Try to read settings from executable directory first, then default location
@@ -149,9 +206,7 @@ class FileManager:
         return []
 
     def save_pcs(self, pc_names):
-        with open(self.pc_file_path, "w") as file:
-            for pc in pc_names:
-                file.write(pc + "\n")
+        self._write_atomic(self.pc_file_path, (pc + "\n" for pc in pc_names))
 
     def load_last_used_times(self):
         if os.path.exists(self.last_used_file_path):
@@ -160,9 +215,7 @@ class FileManager:
         return {}
 
     def save_last_used_times(self, last_used_times):
-        with open(self.last_used_file_path, "w") as file:
-            for pc, time in last_used_times.items():
-                file.write(f"{pc}:{time}\n")
+        self._write_atomic(self.last_used_file_path, (f"{pc}:{time}\n" for pc, time in last_used_times.items()))
 
     def load_descriptions(self):
         if os.path.exists(self.descriptions_file_path):
@@ -171,9 +224,8 @@ class FileManager:
         return {}
 
     def save_descriptions(self, descriptions):
-        with open(self.descriptions_file_path, "w") as file:
-            for pc, description in descriptions.items():
-                file.write(f"{pc}:{description}\n")
+        self._write_atomic(self.descriptions_file_path,
+                           (f"{pc}:{description}\n" for pc, description in descriptions.items()))
 
     def load_machine_rdp_paths(self):
         if os.path.exists(self.machine_rdp_file_path):
@@ -182,9 +234,8 @@ class FileManager:
         return {}
 
     def save_machine_rdp_paths(self, machine_rdp_paths):
-        with open(self.machine_rdp_file_path, "w") as file:
-            for pc, rdp_path in machine_rdp_paths.items():
-                file.write(f"{pc}:{rdp_path}\n")
+        self._write_atomic(self.machine_rdp_file_path,
+                           (f"{pc}:{rdp_path}\n" for pc, rdp_path in machine_rdp_paths.items()))
 
     def update_paths(self):
         """Update all file paths when data directory changes"""
@@ -193,6 +244,12 @@ class FileManager:
         self.descriptions_file_path = os.path.join(self.data_dir, "descriptions.txt")
         self.settings_file_path = os.path.join(self.data_dir, "settings.txt")
         self.machine_rdp_file_path = os.path.join(self.data_dir, "machine_rdp.txt")
+        self.categories_file_path = os.path.join(self.data_dir, "categories.txt")
+        self.machine_categories_file_path = os.path.join(self.data_dir, "machine_categories.txt")
+        self.tags_file_path = os.path.join(self.data_dir, "tags.txt")
+        self.machine_tags_file_path = os.path.join(self.data_dir, "machine_tags.txt")
+        self.machine_ips_file = os.path.join(self.data_dir, "machine_ips.txt")
+        self.machine_probe_file_path = os.path.join(self.data_dir, "machine_probe.txt")
 
     def load_categories(self):
         """Load categories from file"""
@@ -224,9 +281,7 @@ class FileManager:
 
     def save_categories(self, categories):
         """Save categories to file"""
-        with open(self.categories_file_path, "w") as file:
-            for category in categories:
-                file.write(f"{category}\n")
+        self._write_atomic(self.categories_file_path, (f"{category}\n" for category in categories))
 
     def load_machine_categories(self):
         """Load machine category assignments"""
@@ -237,9 +292,8 @@ class FileManager:
 
     def save_machine_categories(self, machine_categories):
         """Save machine category assignments"""
-        with open(self.machine_categories_file_path, "w") as file:
-            for machine, category in machine_categories.items():
-                file.write(f"{machine}:{category}\n")
+        self._write_atomic(self.machine_categories_file_path,
+                           (f"{machine}:{category}\n" for machine, category in machine_categories.items()))
 
     def load_tags(self):
         """Load all existing tags"""
@@ -250,9 +304,7 @@ class FileManager:
 
     def save_tags(self, tags):
         """Save all tags"""
-        with open(self.tags_file_path, "w") as file:
-            for tag in tags:
-                file.write(f"{tag}\n")
+        self._write_atomic(self.tags_file_path, (f"{tag}\n" for tag in tags))
 
     def load_machine_tags(self):
         """Load machine-tag assignments"""
@@ -266,14 +318,12 @@ class FileManager:
 
     def save_machine_tags(self, machine_tags):
         """Save machine-tag assignments"""
-        with open(self.machine_tags_file_path, "w") as file:
-            for machine, tags in machine_tags.items():
-                file.write(f"{machine}:{','.join(tags)}\n")
+        self._write_atomic(self.machine_tags_file_path,
+                           (f"{machine}:{','.join(tags)}\n" for machine, tags in machine_tags.items()))
 
     def save_category_colors(self, category_colors):
         """Save category colors to file"""
-        with open(os.path.join(self.data_dir, 'category_colors.json'), 'w') as f:
-            json.dump(category_colors, f)
+        self._write_atomic(os.path.join(self.data_dir, 'category_colors.json'), (json.dumps(category_colors),))
 
     def load_category_colors(self):
         """Load category colors from file"""
@@ -297,28 +347,91 @@ class FileManager:
     def save_machine_ips(self, machine_ips):
         """Save machine IPs"""
         try:
-            with open(self.machine_ips_file, "w") as f:
-                for pc_name, ip in machine_ips.items():
-                    f.write(f"{pc_name}={ip}\n")
+            self._write_atomic(self.machine_ips_file,
+                               (f"{pc_name}={ip}\n" for pc_name, ip in machine_ips.items()))
         except Exception as e:
             print(f"Error saving machine IPs: {str(e)}")
 
+    def load_machine_probe_configs(self):
+        """Load per-machine probe overrides as {pc_name: {"port", "timeout", "min_interval"}}.
+
+        Each line is pc_name=port,timeout,min_interval; empty fields use the
+        fleet-wide defaults from settings."""
+        configs = {}
+        if os.path.exists(self.machine_probe_file_path):
+            try:
+                with open(self.machine_probe_file_path, "r") as f:
+                    for line in f:
+                        if '=' not in line:
+                            continue
+                        pc_name, values = line.rstrip("\n").rsplit('=', 1)
+                        port, timeout, min_interval = (values.split(',') + ["", "", ""])[:3]
+                        config = {}
+                        if port:
+                            config["port"] = int(port)
+                        if timeout:
+                            config["timeout"] = float(timeout)
+                        if min_interval:
+                            config["min_interval"] = float(min_interval)
+                        if config:
+                            configs[pc_name] = config
+            except Exception as e:
+                print(f"Error loading machine probe settings: {str(e)}")
+        return configs
+
+    def save_machine_probe_configs(self, configs):
+        """Save per-machine probe overrides"""
+        try:
+            self._write_atomic(self.machine_probe_file_path, (
+                f"{pc_name}={config.get('port', '')},{config.get('timeout', '')},"
+                f"{config.get('min_interval', '')}\n"
+                for pc_name, config in configs.items() if config
+            ))
+        except Exception as e:
+            print(f"Error saving machine probe settings: {str(e)}")
+
+    def _write_atomic(self, file_path, lines):
+        """Write lines to a temporary file and rename it over file_path,
+        so a crash or concurrent save can never leave a half-written file"""
+        directory = os.path.dirname(file_path) or "."
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load_settings(self):
+        if os.path.exists(self.settings_file_path):
+            with open(self.settings_file_path, "r") as file:
+                return dict(line.strip().split("=", 1) for line in file)
+        return {}
+
+    def save_settings(self, settings):
+        self._write_atomic(self.settings_file_path, (f"{key}={value}\n" for key, value in settings.items()))
+
+    def close(self):
+        """Nothing to release: text files are only open while they are read or written"""
+
     # ... other file operations ...
 
 class SettingsManager:
     """Manages application settings and RDP configuration.
-    Ensures required settings exist and handles default configurations."""
-    def __init__(self, file_manager):
+    Ensures required settings exist and handles default configurations.
+    With interactive=False no dialogs are shown, so it works without a display."""
+    def __init__(self, file_manager, interactive=True):
         self.file_manager = file_manager
         self.settings = self.load_settings()
-        self.ensure_rdp_path()
+        if interactive:
+            self.ensure_rdp_path()
 
     def load_settings(self):
-        if os.path.exists(self.file_manager.settings_file_path):
-            with open(self.file_manager.settings_file_path, "r") as file:
-                settings = dict(line.strip().split("=", 1) for line in file)
-        else:
-            settings = {}
+        settings = self.file_manager.load_settings()
 
         # Ensure default for rdp_path if not set
         if "rdp_path" not in settings:
@@ -327,9 +440,7 @@ class SettingsManager:
         return settings
 
     def save_settings(self):
-        with open(self.file_manager.settings_file_path, "w") as file:
-            for key, value in self.settings.items():
-                file.write(f"{key}={value}\n")
+        self.file_manager.save_settings(self.settings)
 
     def ensure_rdp_path(self):
         if not self.settings["rdp_path"]:
@@ -350,12 +461,22 @@ class SettingsManager:
 
 class VMManager:
     """Core application logic for managing virtual machines.
-    Handles machine status, connections, categories, and tags."""
-    def __init__(self):
-        self.file_manager = FileManager()
-        self.settings_manager = SettingsManager(self.file_manager)
+    Handles machine status, connections, categories, and tags.
+    Pass interactive=False to build it without Tk dialogs (headless use)."""
+    def __init__(self, data_dir=None, interactive=True):
+        self.file_manager = FileManager(data_dir)
+        # Data directories migrated with sqlite_storage.py keep everything in one database
+        if os.path.exists(os.path.join(self.file_manager.data_dir, DB_FILE_NAME)):
+            self.file_manager = SqliteStorage(self.file_manager.data_dir)
+        self.settings_manager = SettingsManager(self.file_manager, interactive=interactive)
         self.pc_names = self.file_manager.load_pcs()
-        self.machine_status = {pc_name: False for pc_name in self.pc_names}
+        self.status_store = StatusStore(
+            self.pc_names,
+            slow_latency_ms=float(self.settings_manager.settings.get("slow_latency_ms", 150))
+        )
+        self.status_history = FleetHistory(
+            capacity=int(self.settings_manager.settings.get("history_samples", 256))
+        )
         self.last_used_times = self.file_manager.load_last_used_times()
         self.descriptions = self.file_manager.load_descriptions()
         self.machine_rdp_paths = self.file_manager.load_machine_rdp_paths()
@@ -368,13 +489,93 @@ class VMManager:
         self.active_tag_filters = set()  # Add this to track multiple selected tags
         self.category_colors = self.file_manager.load_category_colors()  # Add this line
         self.machine_ips = self.file_manager.load_machine_ips()  # Add this line
+        self._machine_ips_lock = threading.Lock()  # Serialises IP updates from probe threads
+        # IP changes found while polling are saved in one delayed write
+        self.write_behind = WriteBehind(delay=float(self.settings_manager.settings.get("ip_flush_delay", 5)))
+        # Edits made in the UI are saved shortly afterwards by save_later(), off the Tk thread
+        self.data_writer = WriteBehind(delay=float(self.settings_manager.settings.get("save_delay", 0.5)))
+        self.dns_cache = DnsCache(
+            positive_ttl=int(self.settings_manager.settings.get("dns_positive_ttl", 300)),
+            negative_ttl=int(self.settings_manager.settings.get("dns_negative_ttl", 30)),
+            lookup_timeout=float(self.settings_manager.settings.get("dns_timeout", 2))
+        )
+        # "selectors" switches very large fleets to the single-threaded batch prober,
+        # "processes" shards probing across worker processes to keep it off the UI process
+        batch_prober = None
+        self.sharded_prober = None
+        probe_backend = self.settings_manager.settings.get("probe_backend", "asyncio")
+        if probe_backend == "selectors":
+            batch_prober = SelectorProber(port=self.get_probe_port(), timeout=self.get_probe_timeout(),
+                                          dns_cache=self.dns_cache)
+        elif probe_backend == "processes":
+            workers = int(self.settings_manager.settings.get("probe_workers", 0)) or None
+            batch_prober = self.sharded_prober = ShardedProber(
+                workers=workers,
+                port=self.get_probe_port(),
+                timeout=self.get_probe_timeout(),
+                dns_options={
+                    "positive_ttl": self.dns_cache.positive_ttl,
+                    "negative_ttl": self.dns_cache.negative_ttl,
+                    "lookup_timeout": self.dns_cache.lookup_timeout
+                }
+            )
+        # Optional RDP X.224 handshake, run at most once per interval per machine (0 = off)
+        handshake_interval = float(self.settings_manager.settings.get("rdp_handshake_interval", 0)) or None
+        if handshake_interval and batch_prober:
+            print(f"rdp_handshake_interval is not supported with probe_backend={probe_backend}; "
+                  "only the RDP port will be checked")
+            handshake_interval = None
+        self.status_engine = StatusEngine(
+            on_result=self._handle_status_result,
+            port=self.get_probe_port(),
+            timeout=self.get_probe_timeout(),
+            handshake_interval=handshake_interval,
+            dns_cache=self.dns_cache,
+            max_concurrency=int(self.settings_manager.settings.get("max_concurrent_probes", 200)),
+            batch_prober=batch_prober
+        )
+        self.probe_scheduler = ProbeScheduler(
+            base_interval=self.get_refresh_interval(),
+            max_interval=int(self.settings_manager.settings.get("max_probe_interval", 120)),
+            background_interval=int(self.settings_manager.settings.get("background_probe_interval", 300)),
+            # Hosts failing this many probes in a row are only re-probed every breaker_probe_interval
+            failure_threshold=int(self.settings_manager.settings.get("breaker_failure_threshold", 5)),
+            open_interval=int(self.settings_manager.settings.get("breaker_probe_interval", 1800))
+        )
+        self.probe_scheduler.set_machines(self.pc_names)
+        self.machine_probe_configs = self.file_manager.load_machine_probe_configs()
+        for pc_name in self.machine_probe_configs:
+            self._apply_probe_config(pc_name)
+
+        # Opt-in: instances sharing a data directory elect one prober and the rest
+        # read its results from a memory-mapped snapshot file
+        self.leader_lease = None
+        if self.settings_manager.settings.get("shared_status", "0") == "1":
+            self.leader_lease = LeaderLease(
+                os.path.join(self.file_manager.data_dir, "prober.lock"),
+                lease_seconds=float(self.settings_manager.settings.get("shared_status_lease", 15))
+            )
+        self.snapshot_path = os.path.join(self.file_manager.data_dir, "status_snapshot.bin")
+        self.snapshot_writer = None
+        self.snapshot_reader = None
+        self._is_probe_leader = False
+        self._lease_checked_at = None
+        self._published_version = None
+        self._applied_sequence = None
 
     def connect_to_pc(self, pc_name):
-        """Connect to a PC with IP verification"""
+        """Connect to a PC with IP verification.
+
+        The IP is resolved in the background so a slow DNS server can't
+        freeze the window; the connection is made once the lookup is done."""
+        self.ui.when_resolved(pc_name, lambda lookup: self._connect_resolved(pc_name, lookup))
+
+    def _connect_resolved(self, pc_name, lookup):
+        """Verify the resolved IP and start the RDP client; returns True if it was started"""
         try:
             # Verify IP before connecting
             try:
-                current_ip = socket.gethostbyname(pc_name)
+                current_ip = lookup.result()
                 stored_ip = self.machine_ips.get(pc_name)
                 
                 if stored_ip and stored_ip != current_ip:
@@ -389,9 +590,15 @@ class VMManager:
                         return False
                     
                     # Always store the current IP (whether it's new or changed)
-                    self.machine_ips[pc_name] = current_ip
-                    self.file_manager.save_machine_ips(self.machine_ips)
+                    self._set_machine_ip(pc_name, current_ip)
                 
+            except DnsTimeoutError:
+                messagebox.showerror(
+                    "DNS Timeout",
+                    f"Looking up {pc_name} took longer than {self.dns_cache.lookup_timeout} seconds.\n\n"
+                    "The DNS server may be slow or unreachable; please try again."
+                )
+                return False
             except socket.gaierror:
                 # Replace the old message boxes with our new DNS cache dialog
                 if messagebox.askyesno(
@@ -406,29 +613,34 @@ class VMManager:
             rdp_file = self.machine_rdp_paths.get(pc_name, self.settings_manager.settings["rdp_path"])
             subprocess.Popen(["mstsc", rdp_file, "/v:" + pc_name])
             self.connected_machines.add(pc_name)
+            self.probe_scheduler.boost(pc_name)
             self.last_used_times[pc_name] = datetime.now().strftime("%d/%m %H:%M")
-            self.file_manager.save_last_used_times(self.last_used_times)
+            self.save_later("last_used_times")
+            # Status ticks only recolour cards, so show the new "Last Used" time here
+            self.ui.refresh_cards(changed=[pc_name])
             return True
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to connect to {pc_name}: {str(e)}")
             return False
 
-    def check_machine_status(self, pc_name, port=3389, timeout=3):
-        """Check if machine is running and verify its IP address"""
+    def check_machine_status(self, pc_name, port=None, timeout=None):
+        """Check if machine is running and verify its IP address.
+
+        Blocks for up to the DNS and connect timeouts, so never call it on
+        the Tk thread; the UI probes through status_engine.sweep() instead."""
+        default_port, default_timeout = self.status_engine.probe_target(pc_name)
+        port = port or default_port
+        timeout = timeout or default_timeout
         try:
             # Get the current IP address
-            current_ip = socket.gethostbyname(pc_name)
+            current_ip = self.dns_cache.resolve(pc_name)
             
             # If we have a stored IP, compare it
-            stored_ip = self.machine_ips.get(pc_name)
-            if stored_ip and stored_ip != current_ip:
-                # Just update the stored IP silently during status check
-                self.machine_ips[pc_name] = current_ip
-                self.file_manager.save_machine_ips(self.machine_ips)
+            self._update_machine_ip(pc_name, current_ip)
             
             # Test connection
-            with socket.create_connection((pc_name, port), timeout=timeout):
+            with socket.create_connection((current_ip, port), timeout=timeout):
                 return True
         except socket.gaierror:
             # Don't show error message during status check
@@ -436,21 +648,332 @@ class VMManager:
         except (socket.timeout, ConnectionRefusedError, OSError):
             return False
 
-    def add_pc(self, pc_name):
-        """Add a new PC to the list"""
-        if pc_name and pc_name not in self.pc_names:
-            self.pc_names.append(pc_name)
-            self.machine_status[pc_name] = False
-            self.file_manager.save_pcs(self.pc_names)
+    def _update_machine_ip(self, pc_name, current_ip):
+        """Silently store a changed IP detected during a status check"""
+        stored_ip = self.machine_ips.get(pc_name)
+        if stored_ip and stored_ip != current_ip:
+            self._set_machine_ip(pc_name, current_ip)
+
+    def _set_machine_ip(self, pc_name, ip):
+        """Update a stored IP and queue the IP file for a write-behind save"""
+        with self._machine_ips_lock:
+            self.machine_ips[pc_name] = ip
+        self.write_behind.mark_dirty("machine_ips", self.save_machine_ips)
+
+    def save_machine_ips(self):
+        """Write the stored IPs to disk"""
+        with self._machine_ips_lock:
+            machine_ips = dict(self.machine_ips)
+        self.file_manager.save_machine_ips(machine_ips)
+
+    def save_later(self, *collections):
+        """Queue collections (keys of SAVED_COLLECTIONS) for a background save.
+
+        A burst of edits, e.g. tagging 50 machines, is written once after
+        the save_delay setting; the UI never waits for the disk."""
+        for collection in collections:
+            self.data_writer.mark_dirty(collection, functools.partial(self._save_collection, collection))
+
+    def _save_collection(self, collection):
+        attribute, save = SAVED_COLLECTIONS[collection]
+        data = getattr(self, attribute)
+        # Copy first: the Tk thread may keep editing while this is written
+        getattr(self.file_manager, save)(list(data) if isinstance(data, list) else dict(data))
+
+    def flush_saves(self):
+        """Write all queued saves now (e.g. before copying the data directory)"""
+        self.data_writer.flush()
+        self.write_behind.flush()
+
+    def shutdown(self):
+        """Stop background work and write anything still pending"""
+        self.status_engine.stop()
+        if self.leader_lease:
+            self.leader_lease.release()
+        for snapshot_file in (self.snapshot_writer, self.snapshot_reader):
+            if snapshot_file is not None:
+                snapshot_file.close()
+        if self.sharded_prober:
+            self.sharded_prober.shutdown()
+        self.write_behind.close()
+        self.data_writer.close()
+        self.dns_cache.shutdown()
+        self.file_manager.close()
+
+    def _handle_status_result(self, pc_name, is_online, ip, latency_ms=None):
+        """Record a probe result reported by the status engine"""
+        if pc_name not in self.status_store:
+            return  # Machine was deleted while the probe was running
+        if is_online is None:
+            # DNS did not answer in time: not probed, so keep the last known status
+            self.probe_scheduler.release([pc_name])
+            return
+        self.status_store.update(pc_name, is_online, ip=ip, latency_ms=latency_ms)
+        self.status_history.record(pc_name, is_online, latency_ms)
+        if self.probe_scheduler.record_result(pc_name, is_online):
+            self.status_store.mark_changed(pc_name)  # Breaker opened or closed: redraw the card
+        if ip:
+            self._update_machine_ip(pc_name, ip)
+
+    def pop_status_changes(self):
+        """Get and clear the machines whose status changed since the last call"""
+        return self.status_store.pop_changes()
+
+    def drain_status_changes(self, limit=None):
+        """Take up to limit machines whose status changed; returns (pc_names, overflowed)"""
+        return self.status_store.drain_changes(limit)
+
+    def get_refresh_interval(self):
+        """Get the status refresh interval in seconds"""
+        try:
+            return max(1, int(self.settings_manager.settings.get("refresh_interval", 5)))
+        except ValueError:
+            return 5
+
+    def set_refresh_interval(self, refresh_interval):
+        """Change the status refresh interval and apply it immediately"""
+        self.settings_manager.settings["refresh_interval"] = refresh_interval
+        self.probe_scheduler.set_base_interval(self.get_refresh_interval())
+
+    def get_probe_timeout(self):
+        """Get the connect timeout in seconds; slower machines count as down"""
+        try:
+            return max(0.1, float(self.settings_manager.settings.get("probe_timeout", 3)))
+        except ValueError:
+            return 3
+
+    def set_latency_thresholds(self, slow_latency_ms, probe_timeout):
+        """Change the slow and down thresholds and apply them to the running probes"""
+        self.settings_manager.settings["slow_latency_ms"] = slow_latency_ms
+        self.settings_manager.settings["probe_timeout"] = probe_timeout
+        self.status_store.set_slow_latency(slow_latency_ms)
+        self.status_engine.timeout = self.get_probe_timeout()
+        if self.status_engine.batch_prober:
+            self.status_engine.batch_prober.timeout = self.get_probe_timeout()
+
+    def get_probe_port(self):
+        """Get the fleet-wide probe port"""
+        try:
+            return int(self.settings_manager.settings.get("probe_port", 3389))
+        except ValueError:
+            return 3389
+
+    def set_probe_port(self, port):
+        """Change the fleet-wide probe port for machines without their own"""
+        self.settings_manager.settings["probe_port"] = port
+        self.status_engine.port = port
+        if self.status_engine.batch_prober:
+            self.status_engine.batch_prober.port = port
+
+    def get_probe_config(self, pc_name):
+        """Get the per-machine probe overrides of a machine (empty if it uses the defaults)"""
+        return dict(self.machine_probe_configs.get(pc_name, {}))
+
+    def set_probe_config(self, pc_name, port=None, timeout=None, min_interval=None):
+        """Set or clear (None) the probe port, timeout and minimum interval of one machine"""
+        if port is not None and not 0 < port < 65536:
+            raise ValueError("Port must be between 1 and 65535")
+        if (timeout is not None and timeout <= 0) or (min_interval is not None and min_interval <= 0):
+            raise ValueError("Timeout and interval must be greater than zero")
+        config = {key: value for key, value in
+                  (("port", port), ("timeout", timeout), ("min_interval", min_interval))
+                  if value is not None}
+        if config:
+            self.machine_probe_configs[pc_name] = config
+        else:
+            self.machine_probe_configs.pop(pc_name, None)
+        self._apply_probe_config(pc_name)
+        self.save_later("machine_probe_configs")
+
+    def _apply_probe_config(self, pc_name):
+        """Hand a machine's probe overrides to the status engine and scheduler"""
+        config = self.machine_probe_configs.get(pc_name, {})
+        overrides = {key: config[key] for key in ("port", "timeout") if key in config}
+        if overrides:
+            self.status_engine.probe_overrides[pc_name] = overrides
+        else:
+            self.status_engine.probe_overrides.pop(pc_name, None)
+        self.probe_scheduler.set_min_interval(pc_name, config.get("min_interval"))
+
+    def run_due_probes(self):
+        """Send every machine whose probe is due to the status engine"""
+        if self.leader_lease and not self._sync_shared_status():
+            return 0  # Another instance probes; its results were read from the snapshot
+        due = self.probe_scheduler.pop_due()
+        if due:
+            sweep = self.status_engine.sweep(due)
+            sweep.add_done_callback(lambda done: self._finish_sweep(due, done))
+        return len(due)
+
+    def _finish_sweep(self, pc_names, sweep):
+        """Hand machines of a failed sweep back to the scheduler so they are probed again"""
+        if sweep.cancelled():
+            error = "cancelled"
+        elif sweep.exception() is not None:
+            error = str(sweep.exception())
+        else:
+            return
+        print(f"Status sweep failed: {error}")
+        self.probe_scheduler.release(pc_names)
+
+    def is_probe_leader(self):
+        """True if this instance runs the prober (always the case without shared status)"""
+        return self.leader_lease is None or self._is_probe_leader
+
+    def _sync_shared_status(self):
+        """Renew or contend for the prober lease, then publish or read the snapshot.
+
+        Returns True if this instance is the leader and should probe."""
+        now = time.monotonic()
+        if self._lease_checked_at is None or now - self._lease_checked_at >= self.leader_lease.lease_seconds / 3:
+            self._lease_checked_at = now
+            self._is_probe_leader = self.leader_lease.try_acquire()
+
+        if self._is_probe_leader:
+            if self.snapshot_writer is None:
+                self.snapshot_writer = SnapshotWriter(self.snapshot_path)
+                self._published_version = None
+            version, records = self.status_store.snapshot()
+            if version != self._published_version:
+                self.snapshot_writer.publish(records)
+                self._published_version = version
             return True
+
+        if self.snapshot_writer is not None:
+            # Lost the lease (e.g. after a long stall): stop writing
+            self.snapshot_writer.close()
+            self.snapshot_writer = None
+        self._apply_shared_snapshot()
         return False
 
+    def _apply_shared_snapshot(self):
+        """Copy newer results from the leader's snapshot into the local status store"""
+        if self.snapshot_reader is None:
+            self.snapshot_reader = SnapshotReader(self.snapshot_path)
+        snapshot = self.snapshot_reader.read()
+        if snapshot is None or snapshot[0] == self._applied_sequence:
+            return
+        sequence, _, records = snapshot
+        self._applied_sequence = sequence
+        for pc_name, record in records.items():
+            if record.last_probe is None or pc_name not in self.status_store:
+                continue
+            if record.last_probe == self.status_store.get(pc_name).last_probe:
+                continue
+            self.status_store.update(pc_name, record.online, ip=record.ip,
+                                     latency_ms=record.latency_ms, probed_at=record.last_probe)
+            self.status_history.record(pc_name, record.online, record.latency_ms, record.last_probe)
+
+    def add_pc(self, pc_name):
+        """Add a new PC to the list; returns False if the name is invalid or already listed.
+
+        Uses the same checks as add_pcs()."""
+        return bool(self.add_pcs([pc_name]).added)
+
+    def add_pcs(self, pc_names):
+        """Add many PCs at once; returns a BulkAddResult.
+
+        Names are stripped and blank ones ignored. Names that are already in
+        the list or repeated in the input (ignoring case) are duplicates;
+        names that aren't valid host names or addresses are invalid. The
+        machine list is saved once for the whole batch."""
+        known = {pc_name.lower() for pc_name in self.pc_names}
+        added, duplicates, invalid = [], [], []
+        for pc_name in pc_names:
+            pc_name = pc_name.strip()
+            if not pc_name:
+                continue
+            if not MACHINE_NAME_PATTERN.fullmatch(pc_name):
+                invalid.append(pc_name)
+            elif pc_name.lower() in known:
+                duplicates.append(pc_name)
+            else:
+                known.add(pc_name.lower())
+                added.append(pc_name)
+
+        if added:
+            self._register_pcs(added)
+            self.save_later("pcs")
+        return BulkAddResult(added, duplicates, invalid)
+
+    def _register_pcs(self, pc_names):
+        """Append new machines to the list and start tracking their status"""
+        self.pc_names.extend(pc_names)
+        for pc_name in pc_names:
+            self.status_store.add(pc_name)
+            self.probe_scheduler.add(pc_name)
+
+    def import_inventory(self, machines):
+        """Add or update machines from InventoryRow records (see inventory_import).
+
+        Machines already in the list (ignoring case) are updated: non-empty
+        descriptions, categories and RDP paths replace the current ones and
+        tags are added. Unknown categories and tags are created. Every
+        affected collection is saved once for the whole batch."""
+        known = {pc_name.lower(): pc_name for pc_name in self.pc_names}
+        known_tags = set(self.tags)
+        added, updated, invalid = [], [], []
+        changed = set()
+        for row in machines:
+            if not MACHINE_NAME_PATTERN.fullmatch(row.name):
+                invalid.append(row.name)
+                continue
+            pc_name = known.get(row.name.lower())
+            if pc_name is None:
+                pc_name = known[row.name.lower()] = row.name
+                added.append(pc_name)
+            else:
+                updated.append(pc_name)
+
+            if row.description:
+                self.descriptions[pc_name] = row.description
+                changed.add("descriptions")
+            if row.rdp_path:
+                self.machine_rdp_paths[pc_name] = row.rdp_path
+                changed.add("machine_rdp_paths")
+            if row.category:
+                if row.category not in self.categories:
+                    self.categories.append(row.category)
+                    self.category_colors.setdefault(row.category, "#808080")
+                    changed.update(("categories", "category_colors"))
+                self.machine_categories[pc_name] = row.category
+                changed.add("machine_categories")
+            if row.tags:
+                machine_tags = self.machine_tags.setdefault(pc_name, [])
+                for tag in row.tags:
+                    if tag not in known_tags:
+                        known_tags.add(tag)
+                        self.tags.append(tag)
+                        changed.add("tags")
+                    if tag not in machine_tags:
+                        machine_tags.append(tag)
+                changed.add("machine_tags")
+
+        if added:
+            self._register_pcs(added)
+            changed.add("pcs")
+        self.save_later(*changed)
+        return ImportResult(added, updated, invalid)
+
     def delete_pc(self, pc_name):
         """Delete a PC from the list and remove all associated data"""
-        if pc_name in self.pc_names:
-            # Remove from main lists and dictionaries
-            self.pc_names.remove(pc_name)
-            self.machine_status.pop(pc_name, None)
+        return bool(self.remove_pcs([pc_name]))
+
+    def remove_pcs(self, pc_names):
+        """Delete several PCs and all their data; returns the names that were removed"""
+        known = set(self.pc_names)
+        removed = [pc_name for pc_name in dict.fromkeys(pc_names) if pc_name in known]
+        if not removed:
+            return []
+
+        # Remove from the main list in one pass, keeping the list object
+        removed_set = set(removed)
+        self.pc_names[:] = [pc_name for pc_name in self.pc_names if pc_name not in removed_set]
+        for pc_name in removed:
+            self.status_store.remove(pc_name)
+            self.status_history.remove(pc_name)
+            self.probe_scheduler.remove(pc_name)
+            self.status_engine.forget(pc_name)
             self.last_used_times.pop(pc_name, None)
             self.descriptions.pop(pc_name, None)
             self.machine_rdp_paths.pop(pc_name, None)
@@ -462,18 +985,88 @@ class VMManager:
             self.machine_tags.pop(pc_name, None)
             
             # Remove from IPs
-            self.machine_ips.pop(pc_name, None)
+            with self._machine_ips_lock:
+                self.machine_ips.pop(pc_name, None)
+
+            # Remove probe overrides
+            self.machine_probe_configs.pop(pc_name, None)
             
-            # Save all changes
-            self.file_manager.save_pcs(self.pc_names)
-            self.file_manager.save_last_used_times(self.last_used_times)
-            self.file_manager.save_descriptions(self.descriptions)
-            self.file_manager.save_machine_rdp_paths(self.machine_rdp_paths)
-            self.file_manager.save_machine_categories(self.machine_categories)
-            self.file_manager.save_machine_tags(self.machine_tags)
-            self.file_manager.save_machine_ips(self.machine_ips)
-            return True
-        return False
+        # Save all changes
+        self.save_later("pcs", "last_used_times", "descriptions", "machine_rdp_paths",
+                        "machine_categories", "machine_tags", "machine_probe_configs")
+        self.write_behind.mark_dirty("machine_ips", self.save_machine_ips)
+        return removed
+
+    def inventory_row(self, pc_name):
+        """Get a machine's synced fields as an InventoryRow (category "" means Default)"""
+        category = self.machine_categories.get(pc_name, "Default")
+        return InventoryRow(
+            name=pc_name,
+            description=self.descriptions.get(pc_name, ""),
+            category="" if category == "Default" else category,
+            tags=tuple(self.machine_tags.get(pc_name, ())),
+            rdp_path=self.machine_rdp_paths.get(pc_name, ""),
+        )
+
+    def diff_inventory(self, inventory, remove_missing=True):
+        """Work out what syncing with an Inventory would change, without changing anything.
+
+        Returns (InventoryDiff, invalid names); new machines with invalid
+        names are left out of the diff."""
+        current = {pc_name: self.inventory_row(pc_name) for pc_name in self.pc_names}
+        diff = diff_inventory(current, inventory.machines, inventory.fields, remove_missing)
+        invalid = [row.name for row in diff.added if not MACHINE_NAME_PATTERN.fullmatch(row.name)]
+        if invalid:
+            diff = diff._replace(added=[row for row in diff.added if MACHINE_NAME_PATTERN.fullmatch(row.name)])
+        return diff, invalid
+
+    def sync_inventory(self, inventory, remove_missing=False):
+        """Apply an Inventory without asking, as automatic sync does.
+
+        New and changed machines are applied; machines missing from the
+        inventory are never removed here, only returned so the caller can
+        confirm their removal. Returns (applied InventoryDiff, missing names)."""
+        diff, _ = self.diff_inventory(inventory, remove_missing)
+        applied = diff._replace(removed=[])
+        self.apply_inventory_diff(applied)
+        return applied, diff.removed
+
+    def apply_inventory_diff(self, diff):
+        """Apply an InventoryDiff from diff_inventory(), touching only the machines it names"""
+        self.import_inventory(diff.added)
+        self.remove_pcs(diff.removed)
+
+        # Synced field -> (dict holding it, collection to save); empty values remove the entry
+        mappings = {
+            "description": (self.descriptions, "descriptions"),
+            "category": (self.machine_categories, "machine_categories"),
+            "rdp_path": (self.machine_rdp_paths, "machine_rdp_paths"),
+        }
+        known_tags = set(self.tags)
+        changed = set()
+        for change in diff.changed:
+            pc_name = change.name
+            for field, (_, value) in change.fields.items():
+                if field == "tags":
+                    for tag in value:
+                        if tag not in known_tags:
+                            known_tags.add(tag)
+                            self.tags.append(tag)
+                            changed.add("tags")
+                    self.machine_tags[pc_name] = list(value)
+                    changed.add("machine_tags")
+                    continue
+                if field == "category" and value and value not in self.categories:
+                    self.categories.append(value)
+                    self.category_colors.setdefault(value, "#808080")
+                    changed.update(("categories", "category_colors"))
+                mapping, collection = mappings[field]
+                if value:
+                    mapping[pc_name] = value
+                else:
+                    mapping.pop(pc_name, None)
+                changed.add(collection)
+        self.save_later(*changed)
 
     def add_or_edit_description(self, pc_name):
         """Add or edit description for a PC"""
@@ -486,7 +1079,7 @@ class VMManager:
         
         if description is not None:  # None means user cancelled
             self.descriptions[pc_name] = description
-            self.file_manager.save_descriptions(self.descriptions)
+            self.save_later("descriptions")
             return True
         return False
 
@@ -494,14 +1087,51 @@ class VMManager:
         """Set custom RDP path for specific machine"""
         if rdp_path:
             self.machine_rdp_paths[pc_name] = rdp_path
-            self.file_manager.save_machine_rdp_paths(self.machine_rdp_paths)
+            self.save_later("machine_rdp_paths")
             messagebox.showinfo("Success", f"RDP path for {pc_name} has been updated.")
             return True
         return False
 
     def get_machine_status(self, pc_name):
-        """Get current status of a machine"""
-        return self.machine_status.get(pc_name, False)
+        """Get current status of a machine: True, False, or None if it hasn't been probed yet"""
+        return self.status_store.get(pc_name).online
+
+    def get_status_age(self, pc_name):
+        """Seconds since the machine was last probed, or None if it never was"""
+        return self.status_store.age(pc_name)
+
+    def is_status_stale(self, pc_name, now=None):
+        """True if the last result is much older than the machine's probe interval"""
+        age = self.status_store.age(pc_name, now)
+        if age is None:
+            return False
+        stale_factor = float(self.settings_manager.settings.get("stale_factor", 3))
+        return age > stale_factor * self.probe_scheduler.interval_for(pc_name) + self.get_probe_timeout()
+
+    def get_stale_machines(self):
+        """Get the machines whose status is stale"""
+        now = time.time()
+        return {pc_name for pc_name in self.pc_names if self.is_status_stale(pc_name, now)}
+
+    def invalidate_dns(self, hostname=None):
+        """Drop cached DNS answers, including those held by probe worker processes"""
+        self.dns_cache.invalidate(hostname)
+        if self.sharded_prober:
+            self.sharded_prober.invalidate_dns(hostname)
+
+    def is_breaker_open(self, pc_name):
+        """True if the machine failed so often that it is only probed rarely"""
+        return self.probe_scheduler.is_open(pc_name)
+
+    def reset_breaker(self, pc_name):
+        """Close a machine's circuit breaker and re-check it right away"""
+        self.invalidate_dns(pc_name)
+        if self.probe_scheduler.reset_breaker(pc_name):
+            self.status_store.mark_changed(pc_name)
+
+    def get_machine_health(self, pc_name):
+        """Get "healthy", "slow" or "down" for a machine from its last probe"""
+        return self.status_store.health(pc_name)
 
     def get_last_used_time(self, pc_name):
         """Get last used time for a machine"""
@@ -522,8 +1152,7 @@ class VMManager:
             # Use gray as default if no color specified
             default_color = "#808080"
             self.category_colors[category_name] = category_color if category_color else default_color
-            self.file_manager.save_categories(self.categories)
-            self.file_manager.save_category_colors(self.category_colors)
+            self.save_later("categories", "category_colors")
             return True
         return False
 
@@ -542,8 +1171,7 @@ class VMManager:
                     del self.machine_categories[machine]
             
             # Save changes
-            self.file_manager.save_categories(self.categories)
-            self.file_manager.save_machine_categories(self.machine_categories)
+            self.save_later("categories", "machine_categories")
             return True
         return False
 
@@ -551,7 +1179,7 @@ class VMManager:
         """Assign a machine to a category"""
         if category_name in self.categories:
             self.machine_categories[machine_name] = category_name
-            self.file_manager.save_machine_categories(self.machine_categories)
+            self.save_later("machine_categories")
             return True
         return False
 
@@ -574,7 +1202,7 @@ class VMManager:
         if self.machine_categories.get(pc_name, "Default") != "Default":
             category = self.machine_categories.get(pc_name)
             self.machine_categories[pc_name] = "Default"
-            self.file_manager.save_machine_categories(self.machine_categories)
+            self.save_later("machine_categories")
             return True
         return False
 
@@ -763,7 +1391,7 @@ class VMManager:
         """Add a new tag"""
         if tag_name and tag_name not in self.tags:
             self.tags.append(tag_name)
-            self.file_manager.save_tags(self.tags)
+            self.save_later("tags")
             return True
         return False
 
@@ -775,8 +1403,7 @@ class VMManager:
             for machine in self.machine_tags:
                 if tag_name in self.machine_tags[machine]:
                     self.machine_tags[machine].remove(tag_name)
-            self.file_manager.save_tags(self.tags)
-            self.file_manager.save_machine_tags(self.machine_tags)
+            self.save_later("tags", "machine_tags")
             return True
         return False
 
@@ -790,7 +1417,7 @@ class VMManager:
             
         if tag_name not in self.machine_tags[machine_name]:
             self.machine_tags[machine_name].append(tag_name)
-            self.file_manager.save_machine_tags(self.machine_tags)
+            self.save_later("machine_tags")
             return True
         return False
 
@@ -799,7 +1426,7 @@ class VMManager:
         if (machine_name in self.machine_tags and 
             tag_name in self.machine_tags[machine_name]):
             self.machine_tags[machine_name].remove(tag_name)
-            self.file_manager.save_machine_tags(self.machine_tags)
+            self.save_later("machine_tags")
             return True
         return False
 
@@ -829,8 +1456,7 @@ class VMManager:
             self.categories.remove(category)
             
             # Save changes
-            self.file_manager.save_categories(self.categories)
-            self.file_manager.save_machine_categories(self.machine_categories)
+            self.save_later("categories", "machine_categories")
             return True
         return False
 
@@ -900,7 +1526,7 @@ class VMManager:
         
         # Reconstruct categories list with Default first
         self.categories = ["Default"] + new_order
-        self.file_manager.save_categories(self.categories)
+        self.save_later("categories")
         return True
 
     def remove_tag_from_machine(self, machine_name, tag):
@@ -912,7 +1538,7 @@ class VMManager:
                 if not self.machine_tags[machine_name]:
                     del self.machine_tags[machine_name]
                 # Save changes
-                self.file_manager.save_machine_tags(self.machine_tags)
+                self.save_later("machine_tags")
                 return True
         return False 
 
@@ -1074,10 +1700,24 @@ class VMManagerUI:
         self.create_main_area()
         
         # Initialize buttons
+        self.stale_machines = set()  # Machines drawn as stale
+        self.stale_checked_at = 0
         self.position_buttons()
         
+        # Automatic inventory sync (see check_inventory_sync)
+        self.inventory_checked_at = 0
+        self.inventory_file_state = None  # (mtime, size) seen at the last check
+        self.inventory_synced_state = None  # (mtime, size) of the last file synced
+        self.inventory_sync_pending = False
+
         # Start updating machine status
-        self.root.after(1000, self.update_machine_status)
+        self.seen_status_version = None
+        self.status_redraws = deque()  # Cards waiting to be recoloured by drain_status_changes()
+        self.probe_window_state = "active"
+        self.probe_visible_machines = None
+        self.vm_manager.status_engine.start()
+        self.root.after(500, self.update_machine_status)
+        self.root.after(STATUS_FRAME_MS, self.drain_status_changes)
 
     def create_header(self):
         self.header_frame = tk.Frame(self.root, height=60, bg=self.header_bg_color)
@@ -1130,6 +1770,18 @@ class VMManagerUI:
         )
         self.settings_button.pack(pady=10, padx=10)
 
+        # Fleet-wide status history overview
+        self.fleet_health_button = tk.Button(
+            self.left_frame,
+            text="Fleet Health",
+            command=self.show_fleet_health_window,
+            font=('Helvetica', 12),
+            bg=self.secondary_bg_color,
+            fg=self.text_color,
+            activebackground=self.hover_active_color
+        )
+        self.fleet_health_button.pack(pady=(0, 10), padx=10)
+
         # Add Category Management section
         self.create_category_section()
 
@@ -1184,8 +1836,7 @@ class VMManagerUI:
         - Hover tooltips for tags
         """
         # Get machine status
-        is_running = self.vm_manager.get_machine_status(text)
-        status_color = "#4CAF50" if is_running else "#FF5252"  # Green if running, red if not
+        status_color = self.get_status_color(text)
         
         # Button background with tag for the specific button
         button_tag = f"button_{text}"  # Create unique tag for this button
@@ -1195,8 +1846,9 @@ class VMManagerUI:
             corner_radius,
             fill=self.button_bg_color,
             outline=status_color,
+            dash=self.get_status_dash(text),
             width=2,
-            tags=(button_tag, "button_bg")
+            tags=(button_tag, "button_bg", f"status_outline_{text}")
         )
         
         # Add hover bindings for tag popup
@@ -1265,9 +1917,10 @@ class VMManagerUI:
             indicator_y - indicator_radius,
             indicator_x + indicator_radius,
             indicator_y + indicator_radius,
-            fill=status_color,
+            fill=self.get_indicator_fill(text, status_color),
             outline=status_color,
-            tags=(button_tag, "button"))
+            width=2,
+            tags=(button_tag, "button", f"status_indicator_{text}"))
 
         # Category indicator as a small diamond (bottom left)
         category = self.vm_manager.get_machine_category(text)
@@ -1429,44 +2082,118 @@ class VMManagerUI:
 
 
     def update_machine_status(self):
-        """Update status of all machines"""
-        for pc_name in self.vm_manager.pc_names:
-            # Run status check in a separate thread to prevent UI freezing
-            threading.Thread(
-                target=self._check_single_machine_status,
-                args=(pc_name,),
-                daemon=True
-            ).start()
-        
-        # Update display based on current filters
-        if hasattr(self, 'tag_sidebar'):
-            selected_tags = self.tag_sidebar.get_selected_tags()
-            if selected_tags:
-                # Get machines that match the tag filter
-                filtered_pcs = self.vm_manager.get_machines_by_multiple_tags(selected_tags)
-                
-                # If there's also a category filter active, intersect the results
-                if hasattr(self, 'current_filter') and self.current_filter:
-                    category_pcs = self.vm_manager.get_machines_by_category(self.current_filter)
-                    # Only show machines that match both filters
-                    filtered_pcs = [pc for pc in filtered_pcs if pc in category_pcs]
-                
-                self.position_buttons(filtered_pcs)
-            elif hasattr(self, 'current_filter') and self.current_filter:
-                # Only category filter is active
-                filtered_pcs = self.vm_manager.get_machines_by_category(self.current_filter)
-                self.position_buttons(filtered_pcs)
-            else:
-                # No filters active, show all machines
-                self.position_buttons()
-            
-        # Schedule next update
-        self.root.after(5000, self.update_machine_status)
+        """Dispatch due status probes and look for results that went stale"""
+        self.update_probe_visibility()
+        self.vm_manager.run_due_probes()
+
+        # Results age without any store write, so look for stale ones every few seconds
+        if time.monotonic() - self.stale_checked_at >= 5:
+            self.stale_checked_at = time.monotonic()
+            stale_machines = self.vm_manager.get_stale_machines()
+            flipped = stale_machines ^ self.stale_machines
+            self.stale_machines = stale_machines
+            self.status_redraws.extend(flipped)
+
+        # Follow the inventory file when automatic sync is on
+        if time.monotonic() - self.inventory_checked_at >= INVENTORY_CHECK_SECONDS:
+            self.inventory_checked_at = time.monotonic()
+            self.check_inventory_sync()
 
-    def _check_single_machine_status(self, pc_name):
-        """Check status of a single machine"""
-        is_running = self.vm_manager.check_machine_status(pc_name)
-        self.vm_manager.machine_status[pc_name] = is_running
+        # Schedule next update
+        self.root.after(500, self.update_machine_status)
+
+    def drain_status_changes(self):
+        """Recolour cards whose status changed, a bounded number per frame.
+
+        Probe results reach the Tk thread only through the status store's
+        change queue. Each frame takes at most STATUS_FRAME_CAP cards and
+        stops early once STATUS_FRAME_BUDGET seconds have been spent, so a
+        burst of thousands of changes (e.g. after a network outage) is
+        spread over several frames instead of freezing the window. If the
+        queue overflowed, every card is redrawn over the following frames."""
+        # Only cards whose status actually flipped are touched; the rest of
+        # the canvas is left alone. Nothing to do if the store hasn't moved.
+        status_version = self.vm_manager.status_store.version
+        if status_version != self.seen_status_version or self.status_redraws:
+            self.seen_status_version = status_version
+            deadline = time.perf_counter() + STATUS_FRAME_BUDGET
+            applied = 0
+            while applied < STATUS_FRAME_CAP and time.perf_counter() < deadline:
+                if not self.status_redraws:
+                    changes, overflowed = self.vm_manager.drain_status_changes(STATUS_FRAME_CAP - applied)
+                    if overflowed:
+                        changes = list(self.vm_manager.pc_names)  # Lost track: resync every card
+                    if not changes:
+                        break
+                    self.stale_machines.difference_update(changes)  # A fresh result is never stale
+                    self.status_redraws.extend(changes)
+                self.apply_status_changes((self.status_redraws.popleft(),))
+                applied += 1
+            if applied == STATUS_FRAME_CAP or self.status_redraws:
+                self.seen_status_version = None  # More waiting: come back next frame
+
+        self.root.after(STATUS_FRAME_MS, self.drain_status_changes)
+
+    def update_probe_visibility(self):
+        """Tell the probe scheduler which cards are on screen and whether the window is in use"""
+        try:
+            if self.root.state() in ("iconic", "withdrawn"):
+                window_state = "hidden"
+            elif self.root.focus_displayof() is None:
+                window_state = "unfocused"
+            else:
+                window_state = "active"
+        except tk.TclError:
+            window_state = "active"
+        if window_state != self.probe_window_state:
+            self.probe_window_state = window_state
+            self.vm_manager.probe_scheduler.set_window_state(window_state)
+
+        # Cards that are filtered out are not drawn, so only the viewport matters
+        left = self.canvas.canvasx(0)
+        top = self.canvas.canvasy(0)
+        right = left + self.canvas.winfo_width()
+        bottom = top + self.canvas.winfo_height()
+        visible = set()
+        for item in self.canvas.find_overlapping(left, top, right, bottom):
+            for tag in self.canvas.gettags(item):
+                if tag.startswith("status_outline_"):
+                    visible.add(tag[len("status_outline_"):])
+        if visible != self.probe_visible_machines:
+            self.probe_visible_machines = visible
+            self.vm_manager.probe_scheduler.set_visible_machines(visible)
+
+    def get_status_color(self, pc_name):
+        """Get the card colour for a machine's current status"""
+        if self.vm_manager.is_breaker_open(pc_name):
+            return "#9E9E9E"  # Grey: failing for a long time, only probed rarely
+        health = self.vm_manager.get_machine_health(pc_name)
+        if health == "unknown":
+            return "#90A4AE"  # Blue grey: not probed yet
+        if health == "healthy":
+            return "#4CAF50"  # Green
+        if health == "slow":
+            return "#FFA726"  # Amber: answering, but above the slow threshold
+        return "#FF5252"  # Red
+
+    def get_indicator_fill(self, pc_name, status_color):
+        """Status dot fill: hollow while the status is unknown or stale, solid otherwise"""
+        if self.vm_manager.get_machine_health(pc_name) == "unknown" or pc_name in self.stale_machines:
+            return self.button_bg_color
+        return status_color
+
+    def get_status_dash(self, pc_name):
+        """Get the card outline dash pattern; dashed while the circuit breaker is open"""
+        return (6, 4) if self.vm_manager.is_breaker_open(pc_name) else ""
+
+    def apply_status_changes(self, pc_names):
+        """Recolour the status outline and indicator of the given machine cards"""
+        for pc_name in pc_names:
+            status_color = self.get_status_color(pc_name)
+            self.canvas.itemconfigure(f"status_outline_{pc_name}", outline=status_color,
+                                      dash=self.get_status_dash(pc_name))
+            self.canvas.itemconfigure(f"status_indicator_{pc_name}",
+                                      fill=self.get_indicator_fill(pc_name, status_color), outline=status_color)
 
     def switch_theme(self):
         """Toggle between light and dark theme"""
@@ -1630,17 +2357,21 @@ class VMManagerUI:
     def add_single_pc(self):
         new_pc = self.single_pc_entry.get().strip()
         if new_pc:
-            self.vm_manager.add_pc(new_pc)
+            result = self.vm_manager.add_pcs([new_pc])
+            if not result.added:
+                self.show_bulk_add_result(result)
+                return
             self.single_pc_entry.delete(0, tk.END)
             self.position_buttons()
 
     def add_multiple_pcs(self):
         pcs = self.multi_pc_text.get("1.0", tk.END).strip().splitlines()
         if pcs:
-            for pc in pcs:
-                self.vm_manager.add_pc(pc.strip())
+            result = self.vm_manager.add_pcs(pcs)
             self.multi_pc_text.delete("1.0", tk.END)
             self.position_buttons()
+            if result.duplicates or result.invalid:
+                self.show_bulk_add_result(result)
     def on_mousewheel(self, event):
         self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
 
@@ -1857,6 +2588,53 @@ class VMManagerUI:
             else:
                 self.position_buttons()
 
+    def edit_probe_config(self, pc_name):
+        """Edit the status check port, timeout and minimum interval of one machine"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Status Check Settings - {pc_name}")
+        dialog.configure(bg=self.primary_bg_color)
+        dialog.transient(self.root)
+        dialog.grab_set()
+        self.center_window(dialog, 360, 300)
+
+        config = self.vm_manager.get_probe_config(pc_name)
+        fields = [
+            ("port", f"Port (default {self.vm_manager.get_probe_port()}):"),
+            ("timeout", f"Timeout in seconds (default {self.vm_manager.get_probe_timeout():g}):"),
+            ("min_interval", "Minimum seconds between checks (optional):"),
+        ]
+        entries = {}
+        for key, label in fields:
+            tk.Label(dialog, text=label, bg=self.primary_bg_color,
+                     fg=self.text_color).pack(pady=(10, 5))
+            entry = tk.Entry(dialog, bg=self.secondary_bg_color, fg=self.text_color,
+                             width=10, justify='center')
+            if key in config:
+                entry.insert(0, f"{config[key]:g}")
+            entry.pack()
+            entries[key] = entry
+
+        def save():
+            try:
+                values = {key: entries[key].get().strip() for key, _ in fields}
+                self.vm_manager.set_probe_config(
+                    pc_name,
+                    port=int(values["port"]) if values["port"] else None,
+                    timeout=float(values["timeout"]) if values["timeout"] else None,
+                    min_interval=float(values["min_interval"]) if values["min_interval"] else None
+                )
+            except ValueError as e:
+                messagebox.showerror("Error", f"Invalid status check settings: {str(e)}", parent=dialog)
+                return
+            self.vm_manager.probe_scheduler.boost(pc_name)
+            dialog.destroy()
+
+        tk.Label(dialog, text="Leave a field empty to use the default.",
+                 bg=self.primary_bg_color, fg=self.text_color).pack(pady=(10, 0))
+        tk.Button(dialog, text="Save", command=save,
+                  bg=self.button_bg_color, fg=self.text_color).pack(pady=10)
+        dialog.bind('<Return>', lambda e: save())
+
     def delete_pc(self, pc_name):
         """Delete a machine and refresh the display"""
         if self.vm_manager.delete_pc(pc_name):
@@ -1873,6 +2651,56 @@ class VMManagerUI:
             
             self.position_buttons(filtered_pcs)
 
+    def show_fleet_health_window(self):
+        """Show uptime, flaps and latency for every machine, flakiest first"""
+        health_window = tk.Toplevel(self.root)
+        health_window.title("Fleet Health")
+        health_window.configure(bg=self.primary_bg_color)
+        self.center_window(health_window, 650, 500)
+
+        windows = {"Last hour": 3600, "Last 24 hours": 86400, "All history": None}
+        selected_window = tk.StringVar(value="Last hour")
+
+        controls = tk.Frame(health_window, bg=self.primary_bg_color)
+        controls.pack(fill="x", padx=10, pady=10)
+        tk.Label(controls, text="Period:", bg=self.primary_bg_color,
+                 fg=self.text_color, font=('Segoe UI', 10)).pack(side=tk.LEFT)
+        period_menu = ttk.Combobox(controls, textvariable=selected_window,
+                                   values=list(windows), state="readonly", width=15)
+        period_menu.pack(side=tk.LEFT, padx=5)
+
+        columns = ("machine", "uptime", "flaps", "latency", "samples")
+        tree = ttk.Treeview(health_window, columns=columns, show="headings")
+        for column, heading, width in [
+            ("machine", "Machine", 200),
+            ("uptime", "Uptime %", 100),
+            ("flaps", "Flaps", 80),
+            ("latency", "Mean Latency", 120),
+            ("samples", "Samples", 80)
+        ]:
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor="w" if column == "machine" else "center")
+        scrollbar = ttk.Scrollbar(health_window, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0, 10), pady=(0, 10))
+        tree.pack(fill=tk.BOTH, expand=True, padx=(10, 0), pady=(0, 10))
+
+        def refresh_health(event=None):
+            tree.delete(*tree.get_children())
+            window = windows[selected_window.get()]
+            for pc_name, summary in self.vm_manager.status_history.flakiest(window=window):
+                mean_latency = summary["mean_latency"]
+                tree.insert("", tk.END, values=(
+                    pc_name,
+                    f"{summary['uptime']:.1f}",
+                    summary["flaps"],
+                    f"{mean_latency:.0f} ms" if mean_latency is not None else "n/a",
+                    summary["samples"]
+                ))
+
+        period_menu.bind("<<ComboboxSelected>>", refresh_health)
+        refresh_health()
+
     def update_settings(self):
         settings_window = tk.Toplevel(self.root)
         settings_window.title("Settings")
@@ -1951,7 +2779,9 @@ class VMManagerUI:
             ("Change Data Directory", self.change_data_directory),
             ("Export Settings", self.export_settings),
             ("Import Settings", self.import_settings),
-            ("Export Machine List", self.export_machine_list)
+            ("Export Machine List", self.export_machine_list),
+            ("Import Machine List", self.import_machine_list),
+            ("Sync Inventory", self.show_inventory_sync_dialog)
         ]:
             tk.Button(export_frame, text=button_text,
                      command=command,
@@ -1972,9 +2802,35 @@ class VMManagerUI:
         refresh_entry.insert(0, str(self.vm_manager.settings_manager.settings.get("refresh_interval", 5)))
         refresh_entry.pack(pady=(0,15))
 
+        tk.Label(conn_frame, text="Slow Connection Threshold (ms):",
+                bg=self.primary_bg_color, fg=self.text_color).pack(pady=(0,5))
+
+        slow_latency_entry = tk.Entry(conn_frame, bg=self.secondary_bg_color,
+                                    fg=self.text_color, width=10, justify='center')
+        slow_latency_entry.insert(0, str(self.vm_manager.settings_manager.settings.get("slow_latency_ms", 150)))
+        slow_latency_entry.pack(pady=(0,15))
+
+        tk.Label(conn_frame, text="Offline After No Answer For (seconds):",
+                bg=self.primary_bg_color, fg=self.text_color).pack(pady=(0,5))
+
+        probe_timeout_entry = tk.Entry(conn_frame, bg=self.secondary_bg_color,
+                                     fg=self.text_color, width=10, justify='center')
+        probe_timeout_entry.insert(0, str(self.vm_manager.settings_manager.settings.get("probe_timeout", 3)))
+        probe_timeout_entry.pack(pady=(0,15))
+
+        tk.Label(conn_frame, text="Default Status Check Port:",
+                bg=self.primary_bg_color, fg=self.text_color).pack(pady=(0,5))
+
+        probe_port_entry = tk.Entry(conn_frame, bg=self.secondary_bg_color,
+                                  fg=self.text_color, width=10, justify='center')
+        probe_port_entry.insert(0, str(self.vm_manager.get_probe_port()))
+        probe_port_entry.pack(pady=(0,15))
+
         # Save Button - moved outside of frames and adjusted padding
         tk.Button(main_frame, text="Save Settings",
-                  command=lambda: self.save_settings(settings_window, refresh_entry),
+                  command=lambda: self.save_settings(settings_window, refresh_entry,
+                                                     slow_latency_entry, probe_timeout_entry,
+                                                     probe_port_entry),
                   bg=self.button_bg_color, fg=self.text_color,
                   width=button_width).pack(pady=(10, 0))
 
@@ -2019,10 +2875,11 @@ class VMManagerUI:
                     os.makedirs(default_data_dir, exist_ok=True)
                     
                     # Move all data files to default location if not already there
+                    self.vm_manager.flush_saves()
                     if current_data_dir != default_data_dir:
                         try:
                             for filename in os.listdir(current_data_dir):
-                                if filename.endswith('.txt'):
+                                if filename.endswith('.txt') or filename == DB_FILE_NAME:
                                     src = os.path.join(current_data_dir, filename)
                                     dst = os.path.join(default_data_dir, filename)
                                     shutil.copy2(src, dst)
@@ -2163,8 +3020,9 @@ class VMManagerUI:
                 os.makedirs(new_dir, exist_ok=True)
                 
                 # Move all files to new location
+                self.vm_manager.flush_saves()
                 for filename in os.listdir(old_dir):
-                    if filename.endswith('.txt'):
+                    if filename.endswith('.txt') or filename == DB_FILE_NAME:
                         old_path = os.path.join(old_dir, filename)
                         new_path = os.path.join(new_dir, filename)
                         shutil.copy2(old_path, new_path)  # Copy instead of move
@@ -2250,8 +3108,7 @@ class VMManagerUI:
                 
                 # Save all updated settings
                 self.vm_manager.settings_manager.save_settings()
-                self.vm_manager.file_manager.save_machine_rdp_paths(self.vm_manager.machine_rdp_paths)
-                self.vm_manager.file_manager.save_descriptions(self.vm_manager.descriptions)
+                self.vm_manager.save_later("machine_rdp_paths", "descriptions")
                 
                 # Apply any custom theme settings
                 if "custom_theme" in import_data:
@@ -2292,23 +3149,259 @@ class VMManagerUI:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export machine list: {str(e)}")
 
-    def save_settings(self, settings_window, refresh_entry):
+    def import_machine_list(self):
+        """Import machines from a CSV or NDJSON inventory, e.g. a file written by Export Machine List"""
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Inventory files", "*.csv *.ndjson *.jsonl"), ("CSV files", "*.csv"),
+                       ("NDJSON files", "*.ndjson *.jsonl"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title("Import Machine List")
+        progress_window.configure(bg=self.primary_bg_color)
+        progress_window.transient(self.root)
+        progress_label = tk.Label(progress_window, text=f"Reading {os.path.basename(file_path)}...",
+                                  bg=self.primary_bg_color, fg=self.text_color)
+        progress_label.pack(padx=20, pady=(15, 5))
+        progress_var = tk.DoubleVar()
+        ttk.Progressbar(progress_window, variable=progress_var, maximum=100, length=300,
+                        mode='determinate').pack(padx=20, pady=(0, 15))
+
+        # The file is parsed on a worker thread; it only publishes counters,
+        # which the Tk thread picks up while polling the future
+        progress = {"rows": 0, "fraction": 0.0}
+        reading = self.read_inventory_async(
+            file_path, progress=lambda rows, fraction: progress.update(rows=rows, fraction=fraction))
+
+        def show_progress():
+            if reading.done() or not progress_window.winfo_exists():
+                return
+            progress_var.set(progress["fraction"] * 100)
+            progress_label.configure(text=f"Read {progress['rows']} rows...")
+            self.root.after(100, show_progress)
+
+        def apply_inventory(future):
+            if progress_window.winfo_exists():
+                progress_window.destroy()
+            try:
+                inventory = future.result()
+            except (OSError, ValueError, csv.Error) as e:
+                messagebox.showerror("Error", f"Failed to import machine list: {str(e)}")
+                return
+            result = self.vm_manager.import_inventory(inventory.machines)
+            self.position_buttons()
+            lines = [f"Read {inventory.rows} rows.",
+                     f"Added {len(result.added)} PCs, updated {len(result.updated)}."]
+            if inventory.duplicates:
+                lines.append(f"Merged {inventory.duplicates} repeated rows.")
+            if result.invalid:
+                examples = ", ".join(result.invalid[:5]) + (", ..." if len(result.invalid) > 5 else "")
+                lines.append(f"Ignored {len(result.invalid)} invalid names: {examples}")
+            messagebox.showinfo("Import Machine List", "\n".join(lines))
+
+        show_progress()
+        self.when_future_done(reading, apply_inventory, poll_ms=100)
+
+    def read_inventory_async(self, file_path, progress=None):
+        """Read an inventory file on a worker thread; returns a Future of the Inventory"""
+        reading = concurrent.futures.Future()
+
+        def read():
+            try:
+                reading.set_result(read_inventory(file_path, progress=progress))
+            except Exception as e:
+                reading.set_exception(e)
+
+        threading.Thread(target=read, daemon=True).start()
+        return reading
+
+    def show_inventory_sync_dialog(self):
+        """Preview (dry run) and apply a sync with an external inventory file"""
+        settings = self.vm_manager.settings_manager.settings
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Sync Inventory")
+        dialog.configure(bg=self.primary_bg_color)
+        self.center_window(dialog, 600, 500)
+
+        path_frame = tk.Frame(dialog, bg=self.primary_bg_color)
+        path_frame.pack(fill="x", padx=10, pady=(10, 5))
+        tk.Label(path_frame, text="Inventory file:", bg=self.primary_bg_color,
+                 fg=self.text_color).pack(side=tk.LEFT)
+        path_var = tk.StringVar(value=settings.get("inventory_sync_path", ""))
+        tk.Entry(path_frame, textvariable=path_var).pack(side=tk.LEFT, fill="x", expand=True, padx=5)
+
+        def browse():
+            file_path = filedialog.askopenfilename(
+                parent=dialog,
+                filetypes=[("Inventory files", "*.csv *.ndjson *.jsonl"), ("All files", "*.*")]
+            )
+            if file_path:
+                path_var.set(file_path)
+
+        tk.Button(path_frame, text="Browse...", command=browse,
+                  bg=self.button_bg_color, fg=self.text_color).pack(side=tk.LEFT)
+
+        remove_var = tk.BooleanVar(value=settings.get("inventory_sync_remove_missing", "0") == "1")
+        auto_var = tk.BooleanVar(value=settings.get("inventory_sync_auto", "0") == "1")
+        for text, variable in [("Remove machines missing from the file", remove_var),
+                               ("Sync automatically when the file changes", auto_var)]:
+            tk.Checkbutton(dialog, text=text, variable=variable, bg=self.primary_bg_color, fg=self.text_color,
+                           selectcolor=self.secondary_bg_color,
+                           activebackground=self.primary_bg_color).pack(anchor="w", padx=10)
+
+        preview_text = tk.Text(dialog, height=18, bg=self.secondary_bg_color, fg=self.text_color, wrap="none")
+        preview_text.pack(fill="both", expand=True, padx=10, pady=5)
+
+        def show_text(text):
+            preview_text.configure(state="normal")
+            preview_text.delete("1.0", tk.END)
+            preview_text.insert("1.0", text)
+            preview_text.configure(state="disabled")
+
+        buttons = tk.Frame(dialog, bg=self.primary_bg_color)
+        buttons.pack(pady=(0, 10))
+        pending = {"diff": None}
+
+        def save_choices():
+            settings["inventory_sync_path"] = path_var.get().strip()
+            settings["inventory_sync_remove_missing"] = "1" if remove_var.get() else "0"
+            settings["inventory_sync_auto"] = "1" if auto_var.get() else "0"
+            self.vm_manager.settings_manager.save_settings()
+
+        def preview():
+            save_choices()
+            pending["diff"] = None
+            apply_button.configure(state="disabled")
+            file_path = settings["inventory_sync_path"]
+            if not file_path:
+                show_text("Choose an inventory file first.")
+                return
+            show_text(f"Reading {os.path.basename(file_path)}...")
+            self.when_future_done(self.read_inventory_async(file_path), show_preview, poll_ms=100)
+
+        def show_preview(reading):
+            if not dialog.winfo_exists():
+                return
+            try:
+                inventory = reading.result()
+            except (OSError, ValueError, csv.Error) as e:
+                show_text(f"Could not read the inventory: {str(e)}")
+                return
+            diff, invalid = self.vm_manager.diff_inventory(inventory, remove_var.get())
+            show_text(format_diff(diff, invalid))
+            if diff.added or diff.removed or diff.changed:
+                pending["diff"] = diff
+                apply_button.configure(state="normal")
+
+        def apply():
+            if pending["diff"] is None:
+                return
+            if pending["diff"].removed and not messagebox.askyesno(
+                    "Confirm", f"Remove {len(pending['diff'].removed)} machines and all their data?",
+                    parent=dialog):
+                return
+            self.apply_inventory_sync(pending["diff"])
+            pending["diff"] = None
+            apply_button.configure(state="disabled")
+            show_text("Sync applied.")
+
+        tk.Button(buttons, text="Preview", command=preview,
+                  bg=self.button_bg_color, fg=self.text_color, width=12).pack(side=tk.LEFT, padx=5)
+        apply_button = tk.Button(buttons, text="Apply", command=apply, state="disabled",
+                                 bg=self.button_bg_color, fg=self.text_color, width=12)
+        apply_button.pack(side=tk.LEFT, padx=5)
+        tk.Button(buttons, text="Close", command=lambda: (save_choices(), dialog.destroy()),
+                  bg=self.button_bg_color, fg=self.text_color, width=12).pack(side=tk.LEFT, padx=5)
+
+    def apply_inventory_sync(self, diff):
+        """Apply an inventory diff and redraw only the affected cards"""
+        self.vm_manager.apply_inventory_diff(diff)
+        self.refresh_cards(added=[row.name for row in diff.added], removed=diff.removed,
+                           changed=[change.name for change in diff.changed])
+
+    def check_inventory_sync(self):
+        """Sync with the tracked inventory file if automatic sync is on and the file changed.
+
+        The file is only read once its mtime and size are the same on two
+        checks in a row, so a file still being regenerated is left alone.
+        Adds and changes are applied right away; removals are only made
+        after the user confirms them."""
+        settings = self.vm_manager.settings_manager.settings
+        file_path = settings.get("inventory_sync_path", "")
+        if settings.get("inventory_sync_auto", "0") != "1" or not file_path or self.inventory_sync_pending:
+            return
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return
+        state = (file_stat.st_mtime, file_stat.st_size)
+        previous, self.inventory_file_state = self.inventory_file_state, state
+        if state != previous or state == self.inventory_synced_state:
+            return
+
+        def apply(reading):
+            self.inventory_sync_pending = False
+            self.inventory_synced_state = state
+            try:
+                inventory = reading.result()
+            except (OSError, ValueError, csv.Error) as e:
+                print(f"Inventory sync failed: {str(e)}")
+                return
+            applied, missing = self.vm_manager.sync_inventory(
+                inventory, settings.get("inventory_sync_remove_missing", "0") == "1")
+            self.refresh_cards(added=[row.name for row in applied.added],
+                               changed=[change.name for change in applied.changed])
+            if missing and messagebox.askyesno(
+                    "Inventory Sync",
+                    f"{len(missing)} machines are no longer listed in {os.path.basename(file_path)}:\n"
+                    f"{', '.join(missing[:10])}{' ...' if len(missing) > 10 else ''}\n\n"
+                    "Remove them and all their data?"):
+                self.apply_inventory_sync(InventoryDiff([], missing, []))
+
+        self.inventory_sync_pending = True
+        self.when_future_done(self.read_inventory_async(file_path), apply, poll_ms=100)
+
+    def save_settings(self, settings_window, refresh_entry, slow_latency_entry=None, probe_timeout_entry=None,
+                      probe_port_entry=None):
         """Save all settings and close the settings window"""
         try:
-            # Save refresh interval
+            # Save refresh interval and apply it to the running status loop
             refresh_interval = int(refresh_entry.get())
-            self.vm_manager.settings_manager.settings["refresh_interval"] = refresh_interval
+            if refresh_interval < 1:
+                raise ValueError("Refresh interval must be at least 1 second")
+            if slow_latency_entry is not None and probe_timeout_entry is not None:
+                try:
+                    slow_latency_ms = float(slow_latency_entry.get())
+                    probe_timeout = float(probe_timeout_entry.get())
+                except ValueError:
+                    messagebox.showerror("Error", "Latency thresholds must be numbers!")
+                    return
+                if slow_latency_ms <= 0 or probe_timeout <= 0:
+                    messagebox.showerror("Error", "Latency thresholds must be greater than zero!")
+                    return
+                self.vm_manager.set_latency_thresholds(slow_latency_ms, probe_timeout)
+            if probe_port_entry is not None:
+                try:
+                    probe_port = int(probe_port_entry.get())
+                    if not 0 < probe_port < 65536:
+                        raise ValueError
+                except ValueError:
+                    messagebox.showerror("Error", "Status check port must be between 1 and 65535!")
+                    return
+                self.vm_manager.set_probe_port(probe_port)
+            self.vm_manager.set_refresh_interval(refresh_interval)
             
             # Save all settings
             self.vm_manager.settings_manager.save_settings()
-            self.vm_manager.file_manager.save_machine_rdp_paths(self.vm_manager.machine_rdp_paths)
-            self.vm_manager.file_manager.save_descriptions(self.vm_manager.descriptions)
+            self.vm_manager.save_later("machine_rdp_paths", "descriptions")
             
             messagebox.showinfo("Success", "Settings saved successfully!")
             settings_window.destroy()
             
         except ValueError:
-            messagebox.showerror("Error", "Refresh interval must be a number!")
+            messagebox.showerror("Error", "Refresh interval must be a whole number of seconds (1 or more)!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
 
@@ -2400,7 +3493,7 @@ class VMManagerUI:
                 pc_list.remove(pc_name)
                 pc_list.insert(drop_pos, pc_name)
                 # Save the new order
-                self.vm_manager.file_manager.save_pcs(pc_list)
+                self.vm_manager.save_later("pcs")
 
         # Reset drag data
         self.drag_data = {"x": 0, "y": 0, "item": None, "original_pos": None, "moved": False}
@@ -2506,34 +3599,71 @@ class VMManagerUI:
         info_font_size = max(info_font_size, 8)
         status_font_size = max(status_font_size, 8)
 
+        # Kept so single cards can be redrawn in place (see refresh_cards)
+        self.card_grid = {
+            "per_row": BUTTONS_PER_ROW, "margin_left": MARGIN_LEFT, "margin_top": MARGIN_TOP,
+            "spacing": BUTTON_SPACING, "width": button_width, "height": button_height,
+            "corner_radius": CORNER_RADIUS, "fonts": (title_font_size, info_font_size, status_font_size),
+            "canvas_width": canvas_width
+        }
+        self.card_slots = {}  # pc_name -> grid index of its card
+
         for idx, pc_name in enumerate(filtered_pcs):
-            col = idx % BUTTONS_PER_ROW
-            row = idx // BUTTONS_PER_ROW
-            
-            x = MARGIN_LEFT + col * (button_width + BUTTON_SPACING)
-            y = MARGIN_TOP + row * (button_height + BUTTON_SPACING)
-            
-            last_used = self.vm_manager.get_last_used_time(pc_name)
-            description = self.vm_manager.get_description(pc_name)
-
-            # Create button with responsive dimensions and font sizes
-            self.create_rounded_button(
-                pc_name, 
-                last_used, 
-                description,
-                lambda name=pc_name: self.vm_manager.connect_to_pc(name),
-                x, y, 
-                button_width, 
-                button_height, 
-                CORNER_RADIUS,
-                title_font_size,
-                info_font_size,
-                status_font_size
-            )
+            self.draw_card(pc_name, idx)
 
         # Update scroll region using filtered list length
-        total_height = MARGIN_TOP + ((len(filtered_pcs) - 1) // BUTTONS_PER_ROW + 1) * (button_height + BUTTON_SPACING)
-        self.canvas.config(scrollregion=(0, 0, canvas_width, total_height))
+        self.update_card_scrollregion()
+
+    def draw_card(self, pc_name, idx):
+        """Draw one machine card in grid slot idx of the current layout"""
+        grid = self.card_grid
+        col = idx % grid["per_row"]
+        row = idx // grid["per_row"]
+        
+        x = grid["margin_left"] + col * (grid["width"] + grid["spacing"])
+        y = grid["margin_top"] + row * (grid["height"] + grid["spacing"])
+        
+        last_used = self.vm_manager.get_last_used_time(pc_name)
+        description = self.vm_manager.get_description(pc_name)
+
+        # Create button with responsive dimensions and font sizes
+        self.create_rounded_button(
+            pc_name, 
+            last_used, 
+            description,
+            lambda name=pc_name: self.vm_manager.connect_to_pc(name),
+            x, y, 
+            grid["width"], 
+            grid["height"], 
+            grid["corner_radius"],
+            *grid["fonts"]
+        )
+        self.card_slots[pc_name] = idx
+
+    def update_card_scrollregion(self):
+        grid = self.card_grid
+        rows = (len(self.card_slots) - 1) // grid["per_row"] + 1
+        total_height = grid["margin_top"] + rows * (grid["height"] + grid["spacing"])
+        self.canvas.config(scrollregion=(0, 0, grid["canvas_width"], total_height))
+
+    def refresh_cards(self, added=(), removed=(), changed=()):
+        """Update the display after machines were added, removed or edited.
+
+        Without filters, edited cards are redrawn in place and new cards are
+        appended to the grid; everything else is left alone. Removals shift
+        the grid, and filters may hide or show cards, so those redraw the
+        whole view."""
+        if removed or self.current_filter or self.active_tag_filters:
+            self.refresh_filtered_view()
+            return
+        for pc_name in changed:
+            if pc_name in self.card_slots:
+                self.canvas.delete(f"button_{pc_name}")
+                self.draw_card(pc_name, self.card_slots[pc_name])
+        for pc_name in added:
+            self.draw_card(pc_name, len(self.card_slots))
+        if added:
+            self.update_card_scrollregion()
 
     def show_category_context_menu(self, event, category):
         """Show context menu for category button"""
@@ -2690,9 +3820,7 @@ class VMManagerUI:
                 self.current_filter = new_name
             
             # Save all changes
-            self.vm_manager.file_manager.save_categories(self.vm_manager.categories)
-            self.vm_manager.file_manager.save_machine_categories(self.vm_manager.machine_categories)
-            self.vm_manager.file_manager.save_category_colors(self.vm_manager.category_colors)
+            self.vm_manager.save_later("categories", "machine_categories", "category_colors")
             
             # Update the UI
             self.update_category_buttons()
@@ -3102,7 +4230,7 @@ class VMManagerUI:
     def change_category_color(self, category, color):
         """Change the color of a category"""
         self.vm_manager.category_colors[category] = color
-        self.vm_manager.file_manager.save_category_colors(self.vm_manager.category_colors)
+        self.vm_manager.save_later("category_colors")
         self.update_category_buttons()
 
     def remove_category(self, category):
@@ -3382,15 +4510,24 @@ class VMManagerUI:
         """Add multiple PCs from dialog text area"""
         pc_text = text_area.get("1.0", tk.END).strip()
         if pc_text:
-            pcs = pc_text.splitlines()
-            added_count = 0
-            for pc in pcs:
-                if self.vm_manager.add_pc(pc.strip()):
-                    added_count += 1
+            result = self.vm_manager.add_pcs(pc_text.splitlines())
             self.position_buttons()
             dialog.destroy()
-            if added_count > 0:
-                messagebox.showinfo("Success", f"Added {added_count} PCs successfully!")
+            if result.added or result.duplicates or result.invalid:
+                self.show_bulk_add_result(result)
+
+    def show_bulk_add_result(self, result):
+        """Report how many machines a bulk add added, skipped as duplicates and rejected"""
+        lines = [f"Added {len(result.added)} PCs."]
+        if result.duplicates:
+            lines.append(f"Skipped {len(result.duplicates)} already in the list.")
+        if result.invalid:
+            examples = ", ".join(result.invalid[:5]) + (", ..." if len(result.invalid) > 5 else "")
+            lines.append(f"Ignored {len(result.invalid)} invalid names: {examples}")
+        if result.invalid or not result.added:
+            messagebox.showwarning("Add PCs", "\n".join(lines))
+        else:
+            messagebox.showinfo("Success", "\n".join(lines))
 
     def _create_tags_menu(self, menu, pc_name):
         """Create the improved tags submenu"""
@@ -3449,6 +4586,9 @@ class VMManagerUI:
         menu.add_cascade(label="Share", menu=self._create_share_menu(pc_name))
         menu.add_command(label="Set RDP Path", command=lambda: self.set_rdp_path(pc_name))
         menu.add_command(label="Edit Description", command=lambda: self.edit_description(pc_name))
+        menu.add_command(label="Status Check Settings", command=lambda: self.edit_probe_config(pc_name))
+        if self.vm_manager.is_breaker_open(pc_name):
+            menu.add_command(label="Resume Status Checks", command=lambda: self.vm_manager.reset_breaker(pc_name))
         menu.add_command(label="Delete", command=lambda: self.delete_pc(pc_name))
         
         menu.tk_popup(event.x_root, event.y_root)
@@ -3602,7 +4742,10 @@ class VMManagerUI:
         def add_pc():
             pc_name = entry.get().strip()
             if pc_name:
-                self.vm_manager.add_pc(pc_name)
+                result = self.vm_manager.add_pcs([pc_name])
+                if not result.added:
+                    self.show_bulk_add_result(result)
+                    return
                 dialog.destroy()
                 self.refresh_buttons()
         
@@ -3773,6 +4916,8 @@ class VMManagerUI:
 
     def run_elevated_command(self, shell_type, command):
         """Run a command with elevated privileges"""
+        # These commands clear the system DNS cache, so drop our own lookups too
+        self.vm_manager.invalidate_dns()
         try:
             if shell_type == "cmd":
                 # Create a temporary batch file
@@ -3808,6 +4953,43 @@ class VMManagerUI:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to run command: {str(e)}")
 
+    def when_future_done(self, future, callback, poll_ms=50):
+        """Call callback(future) on the Tk thread once a background future completes"""
+        if future.done():
+            callback(future)
+        else:
+            self.root.after(poll_ms, lambda: self.when_future_done(future, callback, poll_ms))
+
+    def when_resolved(self, pc_name, callback, poll_ms=50):
+        """Resolve pc_name in the background and call callback(lookup) on the Tk thread.
+
+        The lookup runs on the DNS cache's interactive worker, so it never
+        waits behind a status sweep. If it misses its deadline (lookup_timeout
+        from when it starts, queue_timeout while queued) callback gets a
+        future failed with DnsTimeoutError instead."""
+        dns_cache = self.vm_manager.dns_cache
+        lookup = dns_cache.submit(pc_name, interactive=True)
+        submitted_at = time.monotonic()
+
+        def poll():
+            if lookup.done():
+                callback(lookup)
+                return
+            if lookup.started.done() and lookup.started.exception() is None:
+                deadline = lookup.started.result() + dns_cache.lookup_timeout
+            else:
+                deadline = submitted_at + dns_cache.queue_timeout
+            if time.monotonic() < deadline:
+                self.root.after(poll_ms, poll)
+                return
+            lookup.cancel()  # The cache still records the answer for later lookups
+            timed_out = concurrent.futures.Future()
+            timed_out.set_exception(DnsTimeoutError(
+                f"DNS lookup for {pc_name} timed out after {dns_cache.lookup_timeout} seconds"))
+            callback(timed_out)
+
+        poll()
+
     def show_troubleshoot_window(self, pc_name=None):
         """Show troubleshooting window for a machine"""
         troubleshoot_dialog = tk.Toplevel(self.root)
@@ -3835,6 +5017,15 @@ class VMManagerUI:
                 self._ping_running = False
             troubleshoot_dialog.destroy()
 
+        # Keep this machine on a short probe interval while the window is open
+        self.vm_manager.probe_scheduler.watch(pc_name)
+
+        def on_destroy(event):
+            if event.widget is troubleshoot_dialog:
+                self.vm_manager.probe_scheduler.unwatch(pc_name)
+
+        troubleshoot_dialog.bind("<Destroy>", on_destroy, add="+")
+
         # Main frame
         main_frame = tk.Frame(troubleshoot_dialog, bg=self.primary_bg_color)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -3849,12 +5040,9 @@ class VMManagerUI:
         )
         info_frame.pack(fill="x", pady=(0, 15))
 
-        # Current IP
-        current_ip = "Checking..."
-        try:
-            current_ip = socket.gethostbyname(pc_name)
-        except socket.gaierror:
-            current_ip = "Could not resolve hostname"
+        # Current IP is resolved in the background so a slow DNS server
+        # can't freeze the window while it opens
+        current_ip = "Resolving..."
 
         # Stored IP
         stored_ip = self.vm_manager.machine_ips.get(pc_name, "No stored IP")
@@ -3868,13 +5056,26 @@ class VMManagerUI:
             font=('Segoe UI', 10)
         ).pack(anchor="w", pady=5, padx=10)
 
-        tk.Label(
+        current_ip_label = tk.Label(
             info_frame,
             text=f"Current IP: {current_ip}",
             bg=self.primary_bg_color,
             fg=self.text_color,
             font=('Segoe UI', 10)
-        ).pack(anchor="w", pady=5, padx=10)
+        )
+        current_ip_label.pack(anchor="w", pady=5, padx=10)
+
+        def show_current_ip(lookup):
+            try:
+                resolved_ip = lookup.result()
+            except DnsTimeoutError:
+                resolved_ip = "DNS lookup timed out"
+            except socket.gaierror:
+                resolved_ip = "Could not resolve hostname"
+            if current_ip_label.winfo_exists():
+                current_ip_label.configure(text=f"Current IP: {resolved_ip}")
+
+        self.when_resolved(pc_name, show_current_ip)
 
         tk.Label(
             info_frame,
@@ -3953,59 +5154,67 @@ class VMManagerUI:
 
         def update_status():
             """Enhanced status update with health check"""
-            is_running = self.vm_manager.check_machine_status(pc_name)
-            
+            # Probe through the status engine so the timed connect is stored
+            # with the machine's status, then show it once it completes
+            probe = self.vm_manager.status_engine.sweep([pc_name])
+            self.when_future_done(probe, show_status)
+
+        def show_status(probe):
+            if not status_label.winfo_exists():
+                return
+            try:
+                probe.result()
+            except Exception:
+                health_text.set("Health: Check Failed")
+                health_label.configure(fg="red")
+                return
+
+            record = self.vm_manager.status_store.get(pc_name)
+            health = self.vm_manager.get_machine_health(pc_name)
+
             # Basic status
-            status = "Online" if is_running else "Offline"
-            color = "green" if is_running else "red"
+            status = "Online" if record.online else "Offline"
+            color = "green" if record.online else "red"
             status_text.set(f"Status: {status}")
             status_label.configure(fg=color)
-            
-            # Health check
-            health_status = "Good"
-            health_color = "green"
-            
-            try:
-                # Check RDP port
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                rdp_status = sock.connect_ex((pc_name, 3389)) == 0
-                sock.close()
-                
-                # Quick ping test
-                ping_result = subprocess.run(
-                    ["ping", "-n", "1", "-w", "1000", pc_name],
-                              capture_output=True, 
-                    text=True
-                )
-                ping_success = "Reply from" in ping_result.stdout
-                
-                # Determine health based on checks
-                if not is_running:
-                    health_status = "Offline"
-                    health_color = "red"
-                elif not rdp_status:
-                    health_status = "RDP Unavailable"
-                    health_color = "orange"
-                elif not ping_success:
-                    health_status = "High Latency"
-                    health_color = "orange"
-                
-                # Add to history - temporarily enable text widget
-                history_text.configure(state="normal")
-                current_time = datetime.now().strftime("%H:%M:%S")
-                history_text.insert("1.0", f"[{current_time}] Status: {status}, Health: {health_status}\n")
-                history_text.delete("5.0", tk.END)
-                history_text.configure(state="disabled")
-                history_text.see("1.0")  # Scroll to latest entry
-                
-            except Exception as e:
-                health_status = "Check Failed"
+
+            # Health from the measured RDP connect time
+            latency_text = f" ({record.latency_ms:.0f} ms)" if record.latency_ms is not None else ""
+            if health == "down":
+                health_status = "Offline"
                 health_color = "red"
-            
+            elif health == "slow":
+                health_status = f"High Latency{latency_text}"
+                health_color = "orange"
+            else:
+                health_status = f"Good{latency_text}"
+                health_color = "green"
+
+            # Add to history - temporarily enable text widget
+            history_text.configure(state="normal")
+            current_time = datetime.now().strftime("%H:%M:%S")
+            history_text.insert("1.0", f"[{current_time}] Status: {status}, Health: {health_status}\n")
+            history_text.delete("51.0", tk.END)
+            history_text.configure(state="disabled")
+            history_text.see("1.0")  # Scroll to latest entry
+
             health_text.set(f"Health: {health_status}")
             health_label.configure(fg=health_color)
 
+        # Start with what the status engine recorded before this window was opened
+        history_summary = self.vm_manager.status_history.summary(pc_name, window=3600)
+        if history_summary and history_summary["samples"]:
+            mean_latency = history_summary["mean_latency"]
+            latency_text = f"{mean_latency:.0f} ms" if mean_latency is not None else "n/a"
+            history_text.insert(tk.END,
+                f"Last hour: {history_summary['uptime']:.1f}% up, {history_summary['flaps']} flaps, "
+                f"mean latency {latency_text}\n")
+        for timestamp, online, latency_ms in reversed(self.vm_manager.status_history.samples(pc_name)[-20:]):
+            sample_time = datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+            latency_text = f" ({latency_ms} ms)" if latency_ms is not None else ""
+            history_text.insert(tk.END,
+                f"[{sample_time}] Status: {'Online' if online else 'Offline'}{latency_text}\n")
+
         # Make history text read-only
         history_text.configure(state="disabled")
 
@@ -4060,17 +5269,25 @@ class VMManagerUI:
                 troubleshoot_dialog.after(1000, continuous_ping)  # Run every second
 
         def check_rdp_port():
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(2)
-                result = sock.connect_ex((pc_name, 3389))
-                if result == 0:
-                    messagebox.showinfo("Port Check", "RDP Port (3389) is open and accessible!")
+            # Runs on the status engine's loop so the window stays responsive
+            port, _ = self.vm_manager.status_engine.probe_target(pc_name)
+
+            def show_port_result(check):
+                try:
+                    port_open, rdp_answered = check.result()
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to check RDP port: {str(e)}")
+                    return
+                if not port_open:
+                    messagebox.showwarning("Port Check", f"RDP Port ({port}) is not accessible.")
+                elif rdp_answered:
+                    messagebox.showinfo("Port Check", f"RDP Port ({port}) is open and the RDP service is answering!")
                 else:
-                    messagebox.warning("Port Check", "RDP Port (3389) is not accessible.")
-                sock.close()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to check RDP port: {str(e)}")
+                    messagebox.showwarning("Port Check",
+                                           f"RDP Port ({port}) is open, but the RDP service did not answer "
+                                           "a connection request. The session host may be hung.")
+
+            self.when_future_done(self.vm_manager.status_engine.check_rdp(pc_name), show_port_result)
 
         def test_network_path():
             try:
@@ -4343,17 +5560,31 @@ class VMManagerUI:
                 elif step == 2:
                     step_label.configure(text="Step 2 of 5: DNS Resolution")
                     result_text.insert(tk.END, "Checking DNS resolution...\n\n")
-                    try:
-                        ip = socket.gethostbyname(pc_name)
-                        result_text.insert(tk.END, f"✅ DNS Resolution successful\n")
-                        result_text.insert(tk.END, f"Resolved IP: {ip}\n")
-                        result_text.insert(tk.END, "\nNext step will check RDP port.")
-                    except socket.gaierror:
-                        result_text.insert(tk.END, "❌ DNS Resolution failed\n\n")
-                        result_text.insert(tk.END, "Recommended actions:\n")
-                        result_text.insert(tk.END, "1. Clear DNS cache\n")
-                        result_text.insert(tk.END, "2. Check DNS server settings\n")
-                        result_text.insert(tk.END, "3. Verify hostname is correct\n")
+
+                    def show_dns_result(lookup):
+                        # The user may have moved on or closed the wizard meanwhile
+                        if not result_text.winfo_exists() or current_step["value"] != 2:
+                            return
+                        result_text.configure(state="normal")
+                        try:
+                            ip = lookup.result()
+                            result_text.insert(tk.END, f"✅ DNS Resolution successful\n")
+                            result_text.insert(tk.END, f"Resolved IP: {ip}\n")
+                            result_text.insert(tk.END, "\nNext step will check RDP port.")
+                        except DnsTimeoutError:
+                            result_text.insert(tk.END, "❌ DNS lookup timed out\n\n")
+                            result_text.insert(tk.END, "Recommended actions:\n")
+                            result_text.insert(tk.END, "1. Check DNS server settings\n")
+                            result_text.insert(tk.END, "2. Verify the DNS server is reachable\n")
+                        except socket.gaierror:
+                            result_text.insert(tk.END, "❌ DNS Resolution failed\n\n")
+                            result_text.insert(tk.END, "Recommended actions:\n")
+                            result_text.insert(tk.END, "1. Clear DNS cache\n")
+                            result_text.insert(tk.END, "2. Check DNS server settings\n")
+                            result_text.insert(tk.END, "3. Verify hostname is correct\n")
+                        result_text.configure(state="disabled")
+
+                    self.when_resolved(pc_name, show_dns_result)
 
                 elif step == 3:
                     step_label.configure(text="Step 3 of 5: RDP Port Check")
@@ -4501,34 +5732,50 @@ class VMManagerUI:
             report.append(f"Machine: {pc_name}")
             report.append(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             
-            # List of diagnostic checks to run
+            # List of diagnostic checks to run; DNS resolution and the machine
+            # status probe run in the background, the rest in between
             checks = [
-                ("DNS Resolution", check_dns_resolution),
                 ("RDP Port", check_rdp_availability),
                 ("Network Path", check_network_path),
-                ("Ping Response", check_ping_response),
-                ("Machine Status", check_machine_status)
+                ("Ping Response", check_ping_response)
             ]
             
-            progress_step = 100 / len(checks)
-            
-            for check_name, check_func in checks:
-                progress_label.configure(text=f"Running {check_name}...")
-                result = check_func()
+            progress_step = 100 / (len(checks) + 2)
+
+            def add_result(check_name, result):
                 report.append(f"[{check_name}]\n{result}\n")
                 progress_var.set(progress_var.get() + progress_step)
-                diagnostics_frame.update()
-            
-            progress_label.configure(text="Diagnostics complete!")
-            progress_var.set(100)
-            
-            # Show report
-            show_diagnostic_report("\n".join(report))
 
-        def check_dns_resolution():
+            def run_checks(lookup):
+                if not diagnostics_frame.winfo_exists():
+                    return
+                add_result("DNS Resolution", check_dns_resolution(lookup))
+                for check_name, check_func in checks:
+                    progress_label.configure(text=f"Running {check_name}...")
+                    diagnostics_frame.update()
+                    add_result(check_name, check_func())
+                progress_label.configure(text="Running Machine Status...")
+                self.when_future_done(self.vm_manager.status_engine.sweep([pc_name]), finish)
+
+            def finish(sweep):
+                if not diagnostics_frame.winfo_exists():
+                    return
+                add_result("Machine Status", check_machine_status(sweep))
+                progress_label.configure(text="Diagnostics complete!")
+                progress_var.set(100)
+                
+                # Show report
+                show_diagnostic_report("\n".join(report))
+
+            progress_label.configure(text="Running DNS Resolution...")
+            self.when_resolved(pc_name, run_checks)
+
+        def check_dns_resolution(lookup):
             try:
-                ip = socket.gethostbyname(pc_name)
+                ip = lookup.result()
                 return f"✅ DNS Resolution successful\nResolved IP: {ip}"
+            except DnsTimeoutError:
+                return "❌ DNS lookup timed out"
             except socket.gaierror:
                 return "❌ DNS Resolution failed"
 
@@ -4566,8 +5813,13 @@ class VMManagerUI:
             except Exception as e:
                 return f"❌ Ping check failed: {str(e)}"
 
-        def check_machine_status():
-            is_running = self.vm_manager.check_machine_status(pc_name)
+        def check_machine_status(sweep):
+            try:
+                is_running = sweep.result().get(pc_name)
+            except Exception as e:
+                return f"❌ Status check failed: {str(e)}"
+            if is_running is None:
+                return "❔ Machine status unknown (DNS did not answer in time)"
             return "✅ Machine is running" if is_running else "❌ Machine is offline"
 
         def show_diagnostic_report(report_text):
@@ -4988,6 +6240,8 @@ class ThemeSwitch(tk.Canvas):
 def main():
     app = VMManagerUI()  # Create UI first, it will create VMManager with proper reference
     app.root.mainloop()
+    app.vm_manager.shutdown()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Needed by the probe worker processes in frozen builds
     main()
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""Benchmark the status probe backends against local listener sockets.
+
+Runs a full sweep over 1k/10k/50k targets with both the selectors batch
+prober and the asyncio status engine, and reports wall time plus the CPU
+time used by the probing thread.
+
+Every target is a distinct 127.x.y.z address so each probe is a separate
+connection; a single listener bound to all interfaces accepts them.
+
+With --hostnames the targets are hostnames instead, resolved from a cold
+DNS cache by a resolver that takes --dns-latency seconds per lookup, so
+the sweep also measures lookups queueing behind the DNS worker pool.
+Machines whose lookup timed out are reported as unknown.
+
+Usage: python benchmarks/bench_selector_prober.py [--sizes 1000 10000 50000]
+                                                  [--hostnames] [--dns-latency 0.005]
+"""
+import argparse
+import os
+import selectors
+import socket
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_cache import DnsCache
+from selector_prober import SelectorProber
+from status_engine import StatusEngine
+
+
+class LocalListener:
+    """Accepts and immediately closes connections on a background thread"""
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("0.0.0.0", 0))
+        self.sock.listen(4096)
+        self.sock.setblocking(False)
+        self.port = self.sock.getsockname()[1]
+        self.running = True
+        self.thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self.thread.start()
+
+    def _accept_loop(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self.sock, selectors.EVENT_READ)
+        while self.running:
+            for _ in selector.select(0.1):
+                while True:
+                    try:
+                        conn, _ = self.sock.accept()
+                    except (BlockingIOError, OSError):
+                        break
+                    conn.close()
+        selector.close()
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        self.sock.close()
+
+
+def make_targets(count):
+    return [f"127.{i // 62500 + 1}.{(i // 250) % 250}.{i % 250 + 1}" for i in range(count)]
+
+
+class SlowResolver:
+    """Resolves bench hostnames to their 127.x.y.z address after a fixed delay"""
+    def __init__(self, addresses, latency):
+        self.addresses = addresses
+        self.latency = latency
+
+    def __call__(self, hostname):
+        time.sleep(self.latency)
+        return self.addresses[hostname]
+
+
+def make_hostnames(count):
+    return {f"host-{i}.bench": address for i, address in enumerate(make_targets(count))}
+
+
+def report(label, count, wall, cpu, results):
+    online = sum(1 for value in results.values() if value)
+    unknown = sum(1 for value in results.values() if value is None)
+    print(f"{label:<10} {count:>7} targets  wall {wall:7.2f} s  "
+          f"cpu {cpu:7.2f} s  online {online:>7}  unknown {unknown:>6}  "
+          f"{count / wall:>9.0f} probes/s")
+
+
+def run_timed(label, count, sweep):
+    """Run sweep() on a fresh thread and measure its wall and thread CPU time"""
+    measured = {}
+
+    def worker():
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        measured["results"] = sweep()
+        measured["wall"] = time.perf_counter() - wall_start
+        measured["cpu"] = time.thread_time() - cpu_start
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    report(label, count, measured["wall"], measured["cpu"], measured["results"])
+
+
+def bench_selectors(port, targets, batch_size, dns_cache=None):
+    prober = SelectorProber(port=port, timeout=3, batch_size=batch_size, dns_cache=dns_cache)
+    try:
+        run_timed("selectors", len(targets),
+                  lambda: {name: result[0] for name, result in prober.probe_many(targets).items()})
+    finally:
+        prober.dns_cache.shutdown()
+
+
+def bench_asyncio(port, targets, concurrency, dns_cache=None):
+    engine = StatusEngine(port=port, timeout=3, max_concurrency=concurrency, dns_cache=dns_cache)
+    engine.start()
+    cpu_before = time.process_time()
+    wall_start = time.perf_counter()
+    results = engine.sweep(targets).result()
+    wall = time.perf_counter() - wall_start
+    # The engine runs on its own thread; report process CPU for the sweep
+    cpu = time.process_time() - cpu_before
+    engine.stop()
+    engine.dns_cache.shutdown()
+    report("asyncio", len(targets), wall, cpu, results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--batch-size", type=int, default=1024,
+                        help="sockets per selectors batch and asyncio concurrency cap")
+    parser.add_argument("--backends", nargs="+", default=["selectors", "asyncio"],
+                        choices=["selectors", "asyncio"])
+    parser.add_argument("--hostnames", action="store_true",
+                        help="probe hostnames resolved from a cold DNS cache instead of IP literals")
+    parser.add_argument("--dns-latency", type=float, default=0.005,
+                        help="seconds per lookup for --hostnames")
+    args = parser.parse_args()
+
+    def dns_cache(addresses):
+        # A fresh, cold cache per run; None keeps the default resolver for IP literals
+        return DnsCache(resolver=SlowResolver(addresses, args.dns_latency)) if args.hostnames else None
+
+    listener = LocalListener()
+    try:
+        for size in args.sizes:
+            addresses = make_hostnames(size) if args.hostnames else {}
+            targets = list(addresses) if args.hostnames else make_targets(size)
+            if "selectors" in args.backends:
+                bench_selectors(listener.port, targets, args.batch_size, dns_cache(addresses))
+            if "asyncio" in args.backends:
+                bench_asyncio(listener.port, targets, args.batch_size, dns_cache(addresses))
+    finally:
+        listener.close()
+
+
+if __name__ == "__main__":
+    main()
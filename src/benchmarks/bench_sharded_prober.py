@@ -0,0 +1,95 @@
+"""Benchmark the multi-process sharded prober against the single-process engine.
+
+Runs full sweeps over local listener targets with the single-process
+selectors prober and with the sharded prober, while a simulated UI thread
+ticks every 10 ms in the main process. Reports sweep wall time, CPU used
+by the main (UI) process, and how late the UI ticks ran on average, which
+is what the user feels as a sluggish window.
+
+Usage: python benchmarks/bench_sharded_prober.py [--sizes 10000 50000] [--workers 4]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_selector_prober import LocalListener, make_targets
+from selector_prober import SelectorProber
+from sharded_prober import ShardedProber
+from status_engine import StatusEngine
+
+
+class UiTicker:
+    """Stands in for the Tk loop: a 10 ms tick that does a little Python work"""
+    def __init__(self, period=0.01):
+        self.period = period
+        self.lateness = []
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        next_tick = time.perf_counter() + self.period
+        while self.running:
+            time.sleep(max(0, next_tick - time.perf_counter()))
+            self.lateness.append(time.perf_counter() - next_tick)
+            sum(range(2000))  # Redraw-sized chunk of work
+            next_tick += self.period
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        return sum(self.lateness) / len(self.lateness) * 1000 if self.lateness else 0.0
+
+
+def run_sweep(label, targets, batch_prober):
+    results = {}
+
+    def on_result(pc_name, is_online, ip, latency_ms):
+        results[pc_name] = is_online  # Result bookkeeping stays in the UI process
+
+    engine = StatusEngine(on_result=on_result, batch_prober=batch_prober)
+    engine.start()
+    engine.sweep(targets[:10]).result()  # Warm up (starts worker processes)
+
+    ticker = UiTicker()
+    cpu_before = time.process_time()
+    wall_start = time.perf_counter()
+    engine.sweep(targets).result()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_before
+    lateness_ms = ticker.stop()
+    engine.stop()
+
+    online = sum(1 for value in results.values() if value)
+    print(f"{label:<10} {len(targets):>7} targets  wall {wall:7.2f} s  UI-process cpu {cpu:7.2f} s  "
+          f"UI tick lateness {lateness_ms:6.2f} ms  online {online:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for the sharded prober (default: CPUs - 1)")
+    parser.add_argument("--batch-size", type=int, default=1024, help="sockets per selectors batch")
+    args = parser.parse_args()
+
+    listener = LocalListener()
+    sharded = ShardedProber(workers=args.workers, port=listener.port, timeout=3, batch_size=args.batch_size)
+    single = SelectorProber(port=listener.port, timeout=3, batch_size=args.batch_size)
+    try:
+        for size in args.sizes:
+            targets = make_targets(size)
+            run_sweep("single", targets, single)
+            run_sweep(f"sharded/{sharded.workers}", targets, sharded)
+    finally:
+        sharded.shutdown()
+        single.dns_cache.shutdown()
+        listener.close()
+
+
+if __name__ == "__main__":
+    main()
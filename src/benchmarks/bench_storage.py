@@ -0,0 +1,79 @@
+"""Benchmark the text-file and SQLite storage backends.
+
+For each fleet size, fills a fresh data directory with machines, tags,
+categories, descriptions and IPs, then measures:
+  - startup load: every load_* call the application makes when it starts
+  - single edit: tagging one machine and saving the machine-tag assignments
+
+Usage: python benchmarks/bench_storage.py [--sizes 10000 100000] [--edits 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlite_storage import SqliteStorage, migrate
+from VMmanagerpython import FileManager
+
+
+def fill(file_manager, size):
+    pc_names = [f"vm-{i:06d}.lab.example.com" for i in range(size)]
+    file_manager.save_pcs(pc_names)
+    file_manager.save_categories(["Default"] + [f"Category {i}" for i in range(20)])
+    file_manager.save_machine_categories({pc: f"Category {i % 20}" for i, pc in enumerate(pc_names)})
+    file_manager.save_tags([f"tag{i}" for i in range(50)])
+    file_manager.save_machine_tags({pc: [f"tag{i % 50}", f"tag{(i * 7) % 50}"] for i, pc in enumerate(pc_names)})
+    file_manager.save_descriptions({pc: f"Machine number {i}" for i, pc in enumerate(pc_names)})
+    file_manager.save_machine_ips({pc: f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i, pc in enumerate(pc_names)})
+    file_manager.save_settings({"refresh_interval": 5, "rdp_path": ""})
+    return pc_names
+
+
+def load_all(storage):
+    return (storage.load_settings(), storage.load_pcs(), storage.load_last_used_times(),
+            storage.load_descriptions(), storage.load_machine_rdp_paths(), storage.load_categories(),
+            storage.load_machine_categories(), storage.load_tags(), storage.load_machine_tags(),
+            storage.load_category_colors(), storage.load_machine_ips(), storage.load_machine_probe_configs())
+
+
+def measure(name, open_storage, pc_names, edits):
+    storage = open_storage()
+    started = time.perf_counter()
+    loaded = load_all(storage)
+    load_time = time.perf_counter() - started
+
+    machine_tags = loaded[8]
+    started = time.perf_counter()
+    for i in range(edits):
+        pc_name = pc_names[(i * 7919) % len(pc_names)]
+        machine_tags[pc_name] = machine_tags.get(pc_name, []) + [f"edit{i}"]
+        storage.save_machine_tags(machine_tags)
+    edit_time = (time.perf_counter() - started) / edits
+    storage.close()
+    print(f"  {name:<8} load {load_time * 1000:9.1f} ms   single edit {edit_time * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--edits", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            file_manager = FileManager(data_dir)
+            pc_names = fill(file_manager, size)
+            storage = SqliteStorage(data_dir)
+            migrate(file_manager, storage)
+            storage.close()
+
+            print(f"{size} machines:")
+            measure("text", lambda: FileManager(data_dir), pc_names, args.edits)
+            measure("sqlite", lambda: SqliteStorage(data_dir), pc_names, args.edits)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import threading
+from collections import deque
+
+
+class ChangeQueue:
+    """Bounded, coalescing FIFO of changed keys handed from probe threads to the UI.
+
+    A key that is already waiting is not queued twice, so a machine that
+    flaps during one frame costs a single redraw. If more than capacity
+    distinct keys pile up the queue gives up on tracking them: it empties
+    itself and the next drain() reports an overflow, telling the consumer
+    to resynchronise everything instead."""
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._order = deque()
+        self._queued = set()
+        self._overflowed = False
+
+    def __len__(self):
+        return len(self._queued)
+
+    def put(self, key):
+        """Queue a key unless it is already waiting"""
+        with self._lock:
+            if self._overflowed or key in self._queued:
+                return
+            if len(self._queued) >= self.capacity:
+                self._overflowed = True
+                self._order.clear()
+                self._queued.clear()
+                return
+            self._order.append(key)
+            self._queued.add(key)
+
+    def discard(self, key):
+        """Drop a waiting key (e.g. its machine was removed)"""
+        with self._lock:
+            if key in self._queued:
+                self._queued.discard(key)
+                self._order.remove(key)
+
+    def drain(self, limit=None):
+        """Take up to limit keys, oldest first; returns (keys, overflowed)"""
+        with self._lock:
+            if self._overflowed:
+                self._overflowed = False
+                return [], True
+            count = len(self._order) if limit is None else min(limit, len(self._order))
+            keys = [self._order.popleft() for _ in range(count)]
+            self._queued.difference_update(keys)
+            return keys, False
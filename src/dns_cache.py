@@ -0,0 +1,182 @@
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+class DnsTimeoutError(socket.gaierror):
+    """Raised when a lookup does not finish within its deadline"""
+
+
+class DnsLookup(Future):
+    """Future for the IP of one hostname, as handed out by DnsCache.submit().
+
+    started is a second future resolving to the time.monotonic() at which
+    a worker began the lookup, so deadlines can leave out the time spent
+    queued behind other lookups."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = Future()
+
+
+class DnsCache:
+    """Caches hostname to IP lookups shared by status checks, connect and troubleshooting.
+
+    Lookups run on a small dedicated worker pool and are handed out as
+    futures, so a slow or dead DNS server can only ever make callers wait
+    up to their deadline. A deadline runs from when a worker starts the
+    lookup, not from submission, so a burst of cold lookups doesn't time
+    out at the back of the queue; queue_timeout bounds the wait for a free
+    worker. Successful lookups are kept for positive_ttl seconds and
+    failures for negative_ttl seconds. Concurrent requests for the same
+    hostname share a single in-flight lookup.
+
+    Lookups a user is waiting on (connect, troubleshooting) are submitted
+    with interactive=True and run on their own worker, so they never queue
+    behind the lookups of a status sweep."""
+
+    def __init__(self, positive_ttl=300, negative_ttl=30, lookup_timeout=2, max_workers=4,
+                 queue_timeout=30, interactive_workers=1, resolver=socket.gethostbyname,
+                 clock=time.monotonic):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.lookup_timeout = lookup_timeout  # Default deadline for resolve() and wait()
+        self.queue_timeout = queue_timeout  # Longest wait for a worker to pick a lookup up
+        self.resolver = resolver
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="DnsCache")
+        self._interactive_executor = ThreadPoolExecutor(max_workers=interactive_workers,
+                                                        thread_name_prefix="DnsCacheInteractive")
+        self._lock = threading.Lock()
+        self._entries = {}  # hostname -> (expires_at, ip, error)
+        self._in_flight = {}  # hostname -> (Future of the lookup, Future of its start time)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # Requests that shared another caller's in-flight lookup
+
+    def submit(self, hostname, interactive=False):
+        """Start resolving hostname and return a DnsLookup future for its IP.
+
+        The future fails with socket.gaierror if the name cannot be resolved.
+        Each caller gets its own future, so cancelling it (e.g. when a
+        deadline passes) never affects other callers of the same lookup.
+        An interactive lookup joins an in-flight lookup only once a worker
+        runs it; one still queued is overtaken on the interactive worker."""
+        key = hostname.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > self.clock():
+                self.hits += 1
+                return self._completed(entry[1], entry[2])
+
+            in_flight = self._in_flight.get(key)
+            if in_flight and not (interactive and not in_flight[1].done()):
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                started = Future()
+                # The worker removes this entry under the same lock, so it
+                # cannot finish before it has been registered here
+                executor = self._interactive_executor if interactive else self._executor
+                lookup = executor.submit(self._lookup, key, hostname, started)
+                # A lookup cancelled by shutdown() never starts; don't leave callers waiting for it
+                lookup.add_done_callback(lambda done: done.cancelled() and started.cancel())
+                in_flight = (lookup, started)
+                self._in_flight[key] = in_flight
+
+        lookup, started = in_flight
+        future = DnsLookup()
+        started.add_done_callback(lambda done: self._copy_result(done, future.started))
+        lookup.add_done_callback(lambda done: self._copy_result(done, future))
+        return future
+
+    def wait(self, lookup, timeout=None):
+        """Return the IP of a DnsLookup, allowing timeout seconds from when its lookup started.
+
+        Raises socket.gaierror if the name cannot be resolved and
+        DnsTimeoutError if the lookup misses its deadline or no worker
+        picks it up within queue_timeout."""
+        timeout = self.lookup_timeout if timeout is None else timeout
+        try:
+            started_at = lookup.started.result(self.queue_timeout)
+        except FutureTimeoutError:
+            raise DnsTimeoutError(f"DNS lookup still queued after {self.queue_timeout} seconds")
+        try:
+            return lookup.result(max(0, started_at + timeout - time.monotonic()))
+        except FutureTimeoutError:
+            raise DnsTimeoutError(f"DNS lookup timed out after {timeout} seconds")
+
+    def resolve(self, hostname, timeout=None):
+        """Return the IP for hostname, waiting at most timeout seconds once the lookup runs.
+
+        Raises socket.gaierror if the name cannot be resolved and
+        DnsTimeoutError if the lookup misses its deadline."""
+        try:
+            return self.wait(self.submit(hostname), timeout)
+        except DnsTimeoutError as e:
+            raise DnsTimeoutError(f"{hostname}: {str(e)}")
+
+    def invalidate(self, hostname=None):
+        """Forget one cached hostname, or everything when no hostname is given"""
+        with self._lock:
+            if hostname is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(hostname.lower(), None)
+
+    def stats(self):
+        """Get cache counters for display or logging"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+                "entries": len(self._entries)
+            }
+
+    def shutdown(self):
+        """Stop the worker pools without waiting for hung lookups"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._interactive_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _lookup(self, key, hostname, started):
+        started.set_result(time.monotonic())
+        ip, error = None, None
+        try:
+            ip = self.resolver(hostname)
+        except (OSError, UnicodeError) as e:
+            error = e if isinstance(e, socket.gaierror) else socket.gaierror(str(e))
+
+        ttl = self.negative_ttl if error else self.positive_ttl
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, ip, error)
+            # An interactive lookup may have taken over the entry; leave that one registered
+            if self._in_flight.get(key, (None, None))[1] is started:
+                del self._in_flight[key]
+        if error:
+            raise error
+        return ip
+
+    def _copy_result(self, lookup, future):
+        if not future.set_running_or_notify_cancel():
+            return  # The caller gave up on this lookup
+        if lookup.cancelled():
+            future.set_exception(DnsTimeoutError("DNS lookup was cancelled"))
+            return
+        error = lookup.exception()
+        if error:
+            future.set_exception(socket.gaierror(*error.args))
+        else:
+            future.set_result(lookup.result())
+
+    def _completed(self, ip, error):
+        future = DnsLookup()
+        future.started.set_result(time.monotonic())
+        if error:
+            # Use a fresh exception so callers don't share one traceback
+            future.set_exception(socket.gaierror(*error.args))
+        else:
+            future.set_result(ip)
+        return future
@@ -0,0 +1,169 @@
+"""Streaming reader for machine inventories (CSV or NDJSON).
+
+Files are read line by line, so a 20k-row hypervisor export never has to
+fit in memory as text. Columns are matched to machine fields by header
+name (see COLUMN_ALIASES) or by an explicit column map. The CSV written
+by "Export Machine List" reads back as-is, as does the NDJSON written by
+vm_status_cli.py.
+"""
+import csv
+import json
+import os
+import re
+from collections import namedtuple
+
+# One machine from an inventory file; empty fields are "" (tags: empty tuple)
+InventoryRow = namedtuple("InventoryRow", ["name", "description", "category", "tags", "rdp_path"])
+
+# Result of read_inventory(): machines merged by name, in file order, and
+# the set of fields the file has columns for
+Inventory = namedtuple("Inventory", ["machines", "rows", "duplicates", "fields"])
+
+# Field -> header names it is read from (compared case-insensitively)
+COLUMN_ALIASES = {
+    "name": ("machine name", "name", "machine", "hostname", "host", "computer name", "vm"),
+    "description": ("description", "notes", "comment"),
+    "category": ("category", "group", "folder"),
+    "tags": ("tags", "labels"),
+    "rdp_path": ("custom rdp path", "rdp path", "rdp_path", "rdp file"),
+}
+
+# Placeholder written by the machine list export for "no custom RDP file"
+_DEFAULT_RDP_PATH = "Default"
+
+_TAG_SEPARATORS = re.compile(r"[;,|]")
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+
+def map_columns(header, column_map=None):
+    """Get {field: header name} for the columns of header.
+
+    column_map ({field: header name}) overrides the aliases; unmapped
+    fields are left out. Raises ValueError if no column holds the name."""
+    by_lower = {column.strip().lower(): column for column in header}
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        if column_map and field in column_map:
+            if column_map[field] not in header:
+                raise ValueError(f"Column '{column_map[field]}' not found")
+            columns[field] = column_map[field]
+            continue
+        for alias in aliases:
+            if alias in by_lower:
+                columns[field] = by_lower[alias]
+                break
+    if "name" not in columns:
+        raise ValueError("No machine name column found")
+    return columns
+
+
+def make_row(record, columns):
+    """Build an InventoryRow from a {column: value} record"""
+    def text(field):
+        value = record.get(columns[field]) if field in columns else None
+        # Line breaks would split the record across lines of the data files
+        return " ".join(str(value).split()) if value is not None else ""
+
+    tags = record.get(columns["tags"]) if "tags" in columns else None
+    if not isinstance(tags, (list, tuple)):
+        tags = [tags or ""]
+    # machine_tags.txt stores "machine:tag1,tag2" one machine per line, so list
+    # items are split on the separators too, whitespace (line breaks included)
+    # is collapsed and tags with a colon are dropped
+    tags = [" ".join(tag.split()) for item in tags for tag in _TAG_SEPARATORS.split(str(item))
+            if ":" not in tag]
+    rdp_path = text("rdp_path")
+    return InventoryRow(
+        name=text("name"),
+        description=text("description"),
+        category=text("category"),
+        tags=tuple(dict.fromkeys(tag for tag in tags if tag)),
+        rdp_path="" if rdp_path == _DEFAULT_RDP_PATH else rdp_path,
+    )
+
+
+def iter_csv_rows(lines, column_map=None, fields=None):
+    """Yield InventoryRow records from CSV text lines; the first row is the header.
+
+    The fields found in the header are added to the fields set, if given."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = map_columns(header, column_map)
+    if fields is not None:
+        fields.update(columns)
+    for values in reader:
+        if values:
+            yield make_row(dict(zip(header, values)), columns)
+
+
+def iter_ndjson_rows(lines, column_map=None, fields=None):
+    """Yield InventoryRow records from lines holding one JSON object each.
+
+    The fields found in any object are added to the fields set, if given."""
+    columns_by_keys = {}
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ValueError(f"Line {line_number} is not valid JSON")
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object")
+        keys = tuple(record)
+        if keys not in columns_by_keys:
+            columns_by_keys[keys] = map_columns(keys, column_map)
+            if fields is not None:
+                fields.update(columns_by_keys[keys])
+        yield make_row(record, columns_by_keys[keys])
+
+
+def read_inventory(path, column_map=None, progress=None, progress_every=1000):
+    """Read an inventory file into an Inventory.
+
+    The format follows the extension (NDJSON_EXTENSIONS, otherwise CSV).
+    Rows naming the same machine (ignoring case) are merged: later values
+    win and tags are combined. progress(rows, fraction) is called every
+    progress_every rows with the share of the file read so far; it runs on
+    the reading thread."""
+    total_bytes = os.path.getsize(path) or 1
+    bytes_read = [0]
+    machines = {}
+    fields = set()
+    rows = duplicates = 0
+
+    with open(path, "rb") as f:
+        def lines():
+            for number, raw in enumerate(f):
+                bytes_read[0] += len(raw)
+                yield raw.decode("utf-8-sig" if number == 0 else "utf-8", errors="replace")
+
+        parse = iter_ndjson_rows if path.lower().endswith(NDJSON_EXTENSIONS) else iter_csv_rows
+        for row in parse(lines(), column_map, fields):
+            rows += 1
+            if row.name:
+                key = row.name.lower()
+                if key in machines:
+                    duplicates += 1
+                    row = _merge(machines[key], row)
+                machines[key] = row
+            if progress and rows % progress_every == 0:
+                progress(rows, bytes_read[0] / total_bytes)
+
+    if progress:
+        progress(rows, 1.0)
+    return Inventory(list(machines.values()), rows, duplicates, frozenset(fields))
+
+
+def _merge(earlier, later):
+    return InventoryRow(
+        name=earlier.name,
+        description=later.description or earlier.description,
+        category=later.category or earlier.category,
+        tags=tuple(dict.fromkeys(earlier.tags + later.tags)),
+        rdp_path=later.rdp_path or earlier.rdp_path,
+    )
@@ -0,0 +1,92 @@
+"""Keyed diff between the machine list and an external inventory.
+
+The inventory (see inventory_import) is the source of truth for the
+fields it has columns for. Machines are matched by name, ignoring case.
+Tags are only ever added: tags assigned in VM Manager but missing from
+the source are kept. Fields the source has no column for, and data the
+source never holds (last-used times, IPs, probe settings), are left
+untouched.
+"""
+from collections import namedtuple
+
+# Changes needed to bring the machine list in line with an inventory.
+# added: InventoryRow for each new machine; removed: machine names;
+# changed: MachineChange for each machine whose fields differ
+InventoryDiff = namedtuple("InventoryDiff", ["added", "removed", "changed"])
+
+# fields: {field: (current value, new value)}
+MachineChange = namedtuple("MachineChange", ["name", "fields"])
+
+SYNCED_FIELDS = ("description", "category", "tags", "rdp_path")
+
+
+def diff_inventory(current, machines, fields, remove_missing=True):
+    """Compare current ({pc_name: InventoryRow}) with the inventory's machines.
+
+    fields is the set of fields the inventory has columns for; others are
+    not compared. With remove_missing, machines absent from the inventory
+    are listed as removed, unless the inventory has no machines or no name
+    column: an empty or half-written file must not wipe the machine list."""
+    by_lower = {pc_name.lower(): pc_name for pc_name in current}
+    seen = set()
+    added, changed = [], []
+    for row in machines:
+        pc_name = by_lower.get(row.name.lower())
+        if pc_name is None:
+            added.append(row)
+            continue
+        seen.add(pc_name)
+        differences = _differences(current[pc_name], row, fields)
+        if differences:
+            changed.append(MachineChange(pc_name, differences))
+    if not machines or "name" not in fields:
+        remove_missing = False
+    removed = [pc_name for pc_name in current if pc_name not in seen] if remove_missing else []
+    return InventoryDiff(added, removed, changed)
+
+
+def _differences(current, row, fields):
+    differences = {}
+    for field in SYNCED_FIELDS:
+        if field not in fields:
+            continue
+        old, new = getattr(current, field), getattr(row, field)
+        if field == "tags":
+            new = old + tuple(tag for tag in new if tag not in old)
+        elif field == "category" and new == "Default":
+            new = ""
+        if old != new:
+            differences[field] = (old, new)
+    return differences
+
+
+def format_diff(diff, invalid=(), limit=20):
+    """Describe a diff for a dry-run preview, listing up to limit machines per section"""
+    if not (diff.added or diff.removed or diff.changed or invalid):
+        return "Already in sync: nothing to change."
+
+    lines = [f"{len(diff.added)} to add, {len(diff.removed)} to remove, {len(diff.changed)} to update."]
+
+    def section(title, items):
+        if items:
+            lines.append("")
+            lines.append(f"{title} ({len(items)}):")
+            lines.extend(f"  {item}" for item in items[:limit])
+            if len(items) > limit:
+                lines.append(f"  ... and {len(items) - limit} more")
+
+    section("Add", [row.name for row in diff.added])
+    section("Remove", diff.removed)
+    section("Update", [
+        f"{change.name}: " + ", ".join(
+            f"{field} {_show(old)} -> {_show(new)}" for field, (old, new) in change.fields.items())
+        for change in diff.changed
+    ])
+    section("Invalid names (skipped)", list(invalid))
+    return "\n".join(lines)
+
+
+def _show(value):
+    if isinstance(value, tuple):
+        value = ", ".join(value)
+    return f"'{value}'" if value else "(none)"
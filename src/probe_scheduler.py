@@ -0,0 +1,295 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+_NO_STATUS = object()
+
+
+class ProbeScheduler:
+    """Decides when each machine is next due for a status probe.
+
+    Machines live in a priority queue keyed by their next-probe time.
+    Machines whose status stays the same back off exponentially up to
+    max_interval; machines that just changed state, were just connected
+    to, or are being watched (e.g. an open troubleshoot window) are
+    probed sooner. New machines are spread evenly across one interval and
+    every reschedule is jittered, so probes never fire in lockstep.
+
+    The UI can also say which machines are on screen and whether the window
+    is active, unfocused or hidden. Machines that are filtered out or
+    scrolled away, and every machine while the window is hidden, drop to
+    background_interval; machines coming back into view are refreshed
+    promptly.
+
+    A machine that fails failure_threshold probes in a row trips its
+    circuit breaker: it is then only probed every open_interval until a
+    probe succeeds or the breaker is reset, so dead entries stop taking
+    up sweep time."""
+
+    def __init__(self, base_interval=5, max_interval=120, backoff_factor=2,
+                 urgent_delay=1, jitter=0.1, background_interval=300, unfocused_factor=2,
+                 failure_threshold=0, open_interval=1800, clock=time.monotonic, rng=None):
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.urgent_delay = urgent_delay  # Delay used to re-check machines that need attention
+        self.jitter = jitter  # Fraction of each interval randomly added or removed
+        self.background_interval = background_interval  # Rate for machines nobody is looking at
+        self.unfocused_factor = unfocused_factor  # Slow-down for visible machines when the window is unfocused
+        self.failure_threshold = failure_threshold  # Consecutive failures that open the breaker (0 = never)
+        self.open_interval = open_interval  # Probe interval while the breaker is open
+        self.clock = clock
+        self._random = rng or random.Random()
+        self._lock = threading.Lock()
+        self._heap = []  # (due_time, sequence, pc_name)
+        self._due = {}  # pc_name -> due_time of its live heap entry
+        self._last_status = {}  # pc_name -> last reported status
+        self._streak = {}  # pc_name -> consecutive probes with unchanged status
+        self._in_flight = set()
+        self._watched = {}  # pc_name -> number of open watchers
+        self._min_interval = {}  # pc_name -> per-machine floor on the probe interval
+        self._failures = {}  # pc_name -> consecutive failed probes
+        self._visible = None  # Machines currently on screen; None means all of them
+        self._window_state = "active"  # "active", "unfocused" or "hidden"
+        self._sequence = itertools.count()
+
+    def set_machines(self, pc_names):
+        """Synchronise the schedule with the current machine list"""
+        pc_names = list(dict.fromkeys(pc_names))
+        wanted = set(pc_names)
+        with self._lock:
+            for pc_name in list(self._known()):
+                if pc_name not in wanted:
+                    self._forget(pc_name)
+            new_names = [pc_name for pc_name in pc_names
+                         if pc_name not in self._due and pc_name not in self._in_flight]
+            self._spread(new_names, self.base_interval)
+
+    def set_base_interval(self, base_interval):
+        """Change the refresh interval and apply it to already scheduled machines"""
+        with self._lock:
+            self.base_interval = base_interval
+            now = self.clock()
+            waiting = [pc_name for pc_name, due_time in self._due.items()
+                       if due_time - now > self.interval_for(pc_name)]
+            # Machines now overdue under the new interval are spread across it
+            self._spread(waiting, self.base_interval)
+
+    def add(self, pc_name):
+        """Schedule a newly added machine for an immediate probe"""
+        with self._lock:
+            if pc_name not in self._in_flight:
+                self._schedule(pc_name, 0)
+
+    def remove(self, pc_name):
+        """Stop scheduling probes for a machine"""
+        with self._lock:
+            self._forget(pc_name)
+
+    def boost(self, pc_name, delay=None):
+        """Probe a machine soon, e.g. right after connecting to it"""
+        delay = self.urgent_delay if delay is None else delay
+        with self._lock:
+            if pc_name in self._in_flight:
+                self._streak[pc_name] = 0
+                return
+            if pc_name not in self._due and pc_name not in self._last_status:
+                return  # Not a scheduled machine
+            self._streak[pc_name] = 0
+            current_due = self._due.get(pc_name)
+            if current_due is None or current_due > self.clock() + delay:
+                self._schedule(pc_name, delay)
+
+    def watch(self, pc_name):
+        """Keep a machine on the base interval while something is watching it"""
+        with self._lock:
+            self._watched[pc_name] = self._watched.get(pc_name, 0) + 1
+        self.boost(pc_name, 0)
+
+    def unwatch(self, pc_name):
+        """Release a watch taken with watch()"""
+        with self._lock:
+            remaining = self._watched.get(pc_name, 0) - 1
+            if remaining > 0:
+                self._watched[pc_name] = remaining
+            else:
+                self._watched.pop(pc_name, None)
+
+    def set_min_interval(self, pc_name, min_interval):
+        """Never probe a machine more often than every min_interval seconds (None to clear)"""
+        with self._lock:
+            if min_interval:
+                self._min_interval[pc_name] = min_interval
+            else:
+                self._min_interval.pop(pc_name, None)
+
+    def set_visible_machines(self, pc_names):
+        """Tell the scheduler which machines are on screen (None for all)"""
+        with self._lock:
+            previous = self._visible
+            self._visible = set(pc_names) if pc_names is not None else None
+            if previous is None:
+                return
+            newly_visible = (self._visible if self._visible is not None else self._known()) - previous
+            self._refresh_overdue(newly_visible)
+
+    def set_window_state(self, window_state):
+        """Tell the scheduler whether the window is 'active', 'unfocused' or 'hidden'"""
+        with self._lock:
+            previous = self._window_state
+            self._window_state = window_state
+            if previous == "hidden" and window_state != "hidden":
+                # Window restored: bring whatever is on screen up to date
+                visible = self._visible if self._visible is not None else self._known()
+                self._refresh_overdue(visible)
+
+    def pop_due(self, limit=None):
+        """Return machines whose probe is due and mark them as in flight.
+
+        Machines that have never been probed come first, then the rest by
+        due time, so a sweep starts with the machines showing no status.
+        Machines beyond limit stay due for the next call."""
+        now = self.clock()
+        with self._lock:
+            ready = []
+            while self._heap and self._heap[0][0] <= now:
+                due_time, _, pc_name = heapq.heappop(self._heap)
+                if self._due.get(pc_name) != due_time:
+                    continue  # Stale entry left behind by a reschedule
+                ready.append((due_time, pc_name))
+            ready.sort(key=lambda entry: (entry[1] in self._last_status, entry[0]))
+            if limit is not None and len(ready) > limit:
+                for due_time, pc_name in ready[limit:]:
+                    heapq.heappush(self._heap, (due_time, next(self._sequence), pc_name))
+                ready = ready[:limit]
+            due = []
+            for _, pc_name in ready:
+                del self._due[pc_name]
+                self._in_flight.add(pc_name)
+                due.append(pc_name)
+        return due
+
+    def record_result(self, pc_name, status):
+        """Reschedule a machine based on the outcome of its probe.
+
+        Returns True if the result opened or closed the machine's circuit breaker."""
+        with self._lock:
+            if pc_name not in self._in_flight and pc_name not in self._due:
+                return False  # Machine was removed while its probe was running
+            self._in_flight.discard(pc_name)
+            was_open = self._is_open(pc_name)
+            if status:
+                self._failures.pop(pc_name, None)
+            else:
+                self._failures[pc_name] = self._failures.get(pc_name, 0) + 1
+            breaker_changed = was_open != self._is_open(pc_name)
+
+            previous = self._last_status.get(pc_name, _NO_STATUS)
+            self._last_status[pc_name] = status
+            if previous is _NO_STATUS:
+                self._streak[pc_name] = 0
+            elif previous != status:
+                # State flipped: confirm the new state quickly
+                self._streak[pc_name] = 0
+                self._schedule(pc_name, max(self.urgent_delay, self._min_interval.get(pc_name, 0)))
+                return breaker_changed
+            else:
+                self._streak[pc_name] = self._streak.get(pc_name, 0) + 1
+            self._schedule(pc_name, self._jittered(self.interval_for(pc_name)))
+            return breaker_changed
+
+    def release(self, pc_names):
+        """Reschedule in-flight machines whose probe never reported, e.g. because the sweep failed"""
+        with self._lock:
+            for pc_name in pc_names:
+                if pc_name in self._in_flight:
+                    self._in_flight.discard(pc_name)
+                    self._schedule(pc_name, self._jittered(self.interval_for(pc_name)))
+
+    def is_open(self, pc_name):
+        """True if the machine's circuit breaker is open"""
+        with self._lock:
+            return self._is_open(pc_name)
+
+    def open_machines(self):
+        """Get the machines whose circuit breaker is open"""
+        with self._lock:
+            return [pc_name for pc_name in self._failures if self._is_open(pc_name)]
+
+    def reset_breaker(self, pc_name):
+        """Close a machine's circuit breaker and probe it right away; returns True if it was open"""
+        with self._lock:
+            was_open = self._is_open(pc_name)
+            self._failures.pop(pc_name, None)
+            if pc_name not in self._known():
+                return was_open
+            self._streak[pc_name] = 0
+            if pc_name not in self._in_flight:
+                self._schedule(pc_name, 0)
+            return was_open
+
+    def interval_for(self, pc_name):
+        """Current probe interval for a machine, including backoff and visibility"""
+        return max(self._interval_for(pc_name), self._min_interval.get(pc_name, 0))
+
+    def _interval_for(self, pc_name):
+        if pc_name in self._watched:
+            return self.base_interval
+        streak = self._streak.get(pc_name, 0)
+        interval = self.base_interval * (self.backoff_factor ** streak)
+        interval = min(interval, max(self.max_interval, self.base_interval))
+        if self._is_open(pc_name):
+            interval = max(interval, self.open_interval)
+        if self._window_state == "hidden" or (self._visible is not None and pc_name not in self._visible):
+            return max(interval, self.background_interval)
+        if self._window_state == "unfocused":
+            return interval * self.unfocused_factor
+        return interval
+
+    def next_due_in(self):
+        """Seconds until the next probe is due, or None if nothing is scheduled"""
+        with self._lock:
+            while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            return max(0, self._heap[0][0] - self.clock())
+
+    def _is_open(self, pc_name):
+        return bool(self.failure_threshold) and self._failures.get(pc_name, 0) >= self.failure_threshold
+
+    def _known(self):
+        return set(self._due) | self._in_flight | set(self._last_status)
+
+    def _refresh_overdue(self, pc_names):
+        """Pull forward machines whose next probe is further away than their interval now allows"""
+        now = self.clock()
+        overdue = [pc_name for pc_name in pc_names
+                   if pc_name in self._due and self._due[pc_name] - now > self.interval_for(pc_name)]
+        self._spread(overdue, self.urgent_delay)
+
+    def _jittered(self, interval):
+        return interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+    def _spread(self, pc_names, interval):
+        """Schedule machines evenly across one interval, each at a random point of its slot"""
+        count = len(pc_names)
+        for index, pc_name in enumerate(pc_names):
+            self._schedule(pc_name, interval * (index + self._random.random()) / count)
+
+    def _schedule(self, pc_name, delay):
+        due_time = self.clock() + delay
+        self._due[pc_name] = due_time
+        heapq.heappush(self._heap, (due_time, next(self._sequence), pc_name))
+
+    def _forget(self, pc_name):
+        # Heap entries are dropped lazily once they no longer match _due
+        self._due.pop(pc_name, None)
+        self._in_flight.discard(pc_name)
+        self._last_status.pop(pc_name, None)
+        self._streak.pop(pc_name, None)
+        self._watched.pop(pc_name, None)
+        self._min_interval.pop(pc_name, None)
+        self._failures.pop(pc_name, None)
@@ -0,0 +1,76 @@
+import asyncio
+import socket
+import struct
+
+# RDP negotiation request asking for TLS or CredSSP, like a modern client
+PROTOCOL_SSL = 0x00000001
+PROTOCOL_HYBRID = 0x00000002
+
+_TPKT_VERSION = 3
+_X224_CONNECTION_REQUEST = 0xE0
+_X224_CONNECTION_CONFIRM = 0xD0
+_TPKT_HEADER_SIZE = 4
+
+
+def build_connection_request(requested_protocols=PROTOCOL_SSL | PROTOCOL_HYBRID):
+    """Build a TPKT-wrapped X.224 Connection Request carrying an RDP negotiation request"""
+    negotiation = struct.pack("<BBHI", 0x01, 0, 8, requested_protocols)  # RDP_NEG_REQ
+    # Length indicator, CR code, destination ref, source ref, class 0
+    x224 = struct.pack(">BBHHB", 6 + len(negotiation), _X224_CONNECTION_REQUEST, 0, 0, 0) + negotiation
+    return struct.pack(">BBH", _TPKT_VERSION, 0, _TPKT_HEADER_SIZE + len(x224)) + x224
+
+
+def is_connection_confirm(data):
+    """Check that data is a TPKT-wrapped X.224 Connection Confirm.
+
+    An RDP negotiation failure inside the confirm still counts: the RDP
+    stack answered, it just didn't like the requested protocols."""
+    if len(data) < _TPKT_HEADER_SIZE + 7:
+        return False
+    version, _, length = struct.unpack(">BBH", data[:_TPKT_HEADER_SIZE])
+    if version != _TPKT_VERSION or length != len(data):
+        return False
+    length_indicator = data[4]
+    code = data[5] & 0xF0
+    return code == _X224_CONNECTION_CONFIRM and length_indicator == len(data) - 5
+
+
+async def x224_handshake(reader, writer, timeout):
+    """Send a Connection Request on an open connection and validate the Confirm within timeout"""
+    try:
+        writer.write(build_connection_request())
+        await asyncio.wait_for(writer.drain(), timeout)
+        header = await asyncio.wait_for(reader.readexactly(_TPKT_HEADER_SIZE), timeout)
+        length = struct.unpack(">H", header[2:4])[0]
+        if header[0] != _TPKT_VERSION or length < _TPKT_HEADER_SIZE + 7:
+            return False
+        body = await asyncio.wait_for(reader.readexactly(length - _TPKT_HEADER_SIZE), timeout)
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError):
+        return False
+    return is_connection_confirm(header + body)
+
+
+def check_rdp_handshake(host, port=3389, timeout=3):
+    """Blocking variant for one-off checks: True if host answers an X.224 Connection Request"""
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.settimeout(timeout)
+            sock.sendall(build_connection_request())
+            header = _recv_exactly(sock, _TPKT_HEADER_SIZE)
+            length = struct.unpack(">H", header[2:4])[0]
+            if header[0] != _TPKT_VERSION or length < _TPKT_HEADER_SIZE + 7:
+                return False
+            body = _recv_exactly(sock, length - _TPKT_HEADER_SIZE)
+    except OSError:
+        return False
+    return is_connection_confirm(header + body)
+
+
+def _recv_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed during RDP handshake")
+        data += chunk
+    return data
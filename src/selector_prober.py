@@ -0,0 +1,163 @@
+import errno
+import selectors
+import socket
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from dns_cache import DnsCache, DnsTimeoutError
+
+# Windows select() handles at most 512 sockets per call
+DEFAULT_BATCH_SIZE = 500 if sys.platform == "win32" else 4096
+
+# Target address of a machine whose DNS lookup timed out: not probed, reported as unknown
+_NOT_RESOLVED = object()
+
+# File descriptors kept free for everything else the process has open
+_FD_HEADROOM = 256
+
+# connect_ex results meaning "connection in progress" on a non-blocking socket
+_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, 10035}  # 10035 = WSAEWOULDBLOCK
+
+
+class SelectorProber:
+    """Probes very large fleets from a single thread with non-blocking connects.
+
+    Targets are processed in batches: every connect in a batch is started at
+    once and completions are collected through one selector, recording the
+    connect latency of each host. This avoids the per-task overhead of the
+    asyncio engine for fleets beyond ~10k machines."""
+
+    def __init__(self, port=3389, timeout=3, batch_size=DEFAULT_BATCH_SIZE, dns_cache=None):
+        self.port = port
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.dns_cache = dns_cache or DnsCache()
+
+    def check_machine_status(self, pc_name, port=None, timeout=None):
+        """Same contract as VMManager.check_machine_status: True if the port accepts connections"""
+        result = self.probe_many([pc_name], port=port, timeout=timeout)
+        return result[pc_name][0]
+
+    def probe_many(self, pc_names, on_result=None, port=None, timeout=None):
+        """Probe every machine and return pc_name -> (is_online, latency_ms, ip).
+
+        latency_ms is None for machines that did not accept a connection;
+        is_online is None for machines whose DNS lookup timed out. on_result(pc_name, is_online, ip, latency_ms) is called as each probe completes."""
+        port = port or self.port
+        timeout = timeout or self.timeout
+        pc_names = list(dict.fromkeys(pc_names))
+        batch_size = min(self.batch_size, max_open_sockets())
+        results = {}
+        for start in range(0, len(pc_names), batch_size):
+            batch = pc_names[start:start + batch_size]
+            self._probe_batch(self._resolve_batch(batch), port, timeout, results, on_result)
+        return results
+
+    def _resolve_batch(self, pc_names):
+        """Resolve a batch of names, starting all lookups before waiting on any"""
+        targets = []
+        lookups = []
+        for pc_name in pc_names:
+            if _is_ipv4(pc_name):
+                targets.append((pc_name, pc_name))
+            else:
+                lookups.append((pc_name, self.dns_cache.submit(pc_name)))
+
+        for pc_name, lookup in lookups:
+            try:
+                # Each deadline runs from when the lookup started, not from submission
+                ip = self.dns_cache.wait(lookup)
+            except DnsTimeoutError:
+                ip = _NOT_RESOLVED
+            except Exception:
+                # Unresolvable: reported offline without an IP
+                ip = None
+            targets.append((pc_name, ip))
+        return targets
+
+    def _probe_batch(self, targets, port, timeout, results, on_result):
+        selector = selectors.DefaultSelector()
+        try:
+            for pc_name, ip in targets:
+                if ip is None:
+                    self._report(results, on_result, pc_name, False, None, None)
+                    continue
+                if ip is _NOT_RESOLVED:
+                    self._report(results, on_result, pc_name, None, None, None)
+                    continue
+                sock = None
+                try:
+                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    sock.setblocking(False)
+                    started = time.perf_counter()
+                    error = sock.connect_ex((ip, port))
+                except OSError:
+                    # E.g. out of file descriptors: fail this machine, not the sweep
+                    if sock is not None:
+                        sock.close()
+                    self._report(results, on_result, pc_name, False, ip, None)
+                    continue
+                if error == 0:
+                    sock.close()
+                    self._report(results, on_result, pc_name, True, ip,
+                                 (time.perf_counter() - started) * 1000)
+                elif error in _IN_PROGRESS:
+                    selector.register(sock, selectors.EVENT_WRITE, (pc_name, ip, started))
+                else:
+                    sock.close()
+                    self._report(results, on_result, pc_name, False, ip, None)
+
+            deadline = time.monotonic() + timeout
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    sock = key.fileobj
+                    pc_name, ip, started = key.data
+                    latency_ms = (time.perf_counter() - started) * 1000
+                    is_online = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                    selector.unregister(sock)
+                    sock.close()
+                    self._report(results, on_result, pc_name, is_online, ip,
+                                 latency_ms if is_online else None)
+
+            # Whatever is still pending missed the deadline
+            for key in list(selector.get_map().values()):
+                pc_name, ip, _ = key.data
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+                self._report(results, on_result, pc_name, False, ip, None)
+        finally:
+            selector.close()
+
+    def _report(self, results, on_result, pc_name, is_online, ip, latency_ms):
+        results[pc_name] = (is_online, latency_ms, ip)
+        if on_result:
+            try:
+                on_result(pc_name, is_online, ip, latency_ms)
+            except Exception as e:
+                print(f"Error handling status result for {pc_name}: {str(e)}")
+
+
+def max_open_sockets():
+    """Most sockets one batch may hold open under the process's file descriptor limit"""
+    if resource is None:
+        return DEFAULT_BATCH_SIZE
+    soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit == resource.RLIM_INFINITY:
+        return DEFAULT_BATCH_SIZE
+    return max(1, soft_limit - min(_FD_HEADROOM, soft_limit // 2))
+
+
+def _is_ipv4(name):
+    try:
+        socket.inet_pton(socket.AF_INET, name)
+        return True
+    except (OSError, ValueError):
+        return False
@@ -0,0 +1,189 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+
+from dns_cache import DnsCache
+from selector_prober import SelectorProber, DEFAULT_BATCH_SIZE
+
+
+def shard_for(pc_name, shards):
+    """Stable shard index of a machine (hash() is salted per process, crc32 is not)"""
+    return zlib.crc32(pc_name.lower().encode("utf-8")) % shards
+
+
+class ShardedProber:
+    """Spreads status probing over a pool of worker processes.
+
+    Each worker owns the machines that hash to its shard and probes them
+    with its own SelectorProber and DNS cache, so probing and socket
+    bookkeeping run outside the UI process and its GIL. Workers stream
+    results back in batches of up to result_batch_size entries (or every
+    flush_interval seconds), so the UI process handles one message per
+    batch instead of one per host.
+
+    Offers the same probe_many() contract as SelectorProber, so it can be
+    handed to StatusEngine as its batch prober.
+
+    While waiting for results the workers are checked every
+    liveness_interval seconds. A worker that died mid-sweep (killed, out
+    of memory) is restarted and the machines it had not reported yet are
+    reported offline, so a sweep always finishes."""
+
+    def __init__(self, workers=None, port=3389, timeout=3, batch_size=DEFAULT_BATCH_SIZE,
+                 result_batch_size=256, flush_interval=0.1, dns_options=None, liveness_interval=0.5):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.port = port
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.result_batch_size = result_batch_size
+        self.flush_interval = flush_interval
+        self.dns_options = dns_options or {}  # Keyword arguments for each worker's DnsCache
+        self.liveness_interval = liveness_interval
+        self._context = multiprocessing.get_context("spawn")  # Never fork a process running Tk
+        self._processes = []
+        self._task_queues = []
+        self._result_queue = None
+        self._sweep_ids = itertools.count(1)
+
+    def start(self):
+        """Start the worker processes (safe to call more than once)"""
+        if self._processes:
+            return
+        self._result_queue = self._context.Queue()
+        self._task_queues = [None] * self.workers
+        self._processes = [None] * self.workers
+        for index in range(self.workers):
+            self._start_worker(index)
+
+    def _start_worker(self, index):
+        """Start (or replace) the worker process of one shard with a fresh task queue"""
+        task_queue = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, task_queue, self._result_queue, self.batch_size, self.result_batch_size,
+                  self.flush_interval, self.dns_options),
+            name=f"ShardedProber-{index}",
+            daemon=True
+        )
+        process.start()
+        self._task_queues[index] = task_queue
+        self._processes[index] = process
+
+    def shutdown(self, timeout=5):
+        """Stop the worker processes"""
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._task_queues = []
+        self._result_queue = None
+
+    def invalidate_dns(self, hostname=None):
+        """Drop cached DNS answers in every worker"""
+        for task_queue in self._task_queues:
+            task_queue.put(("invalidate", hostname))
+
+    def check_machine_status(self, pc_name, port=None, timeout=None):
+        """Same contract as VMManager.check_machine_status: True if the port accepts connections"""
+        return self.probe_many([pc_name], port=port, timeout=timeout)[pc_name][0]
+
+    def probe_many(self, pc_names, on_result=None, port=None, timeout=None):
+        """Probe every machine and return pc_name -> (is_online, latency_ms, ip).
+
+        on_result(pc_name, is_online, ip, latency_ms) is called in this
+        process as each batch of results arrives. Only one sweep may run at
+        a time; StatusEngine runs its batch sweeps one after another."""
+        self.start()
+        for index, process in enumerate(self._processes):
+            if not process.is_alive():
+                print(f"Probe worker {index} exited (code {process.exitcode}); restarting it")
+                self._start_worker(index)
+        port = port or self.port
+        timeout = timeout or self.timeout
+        shards = [[] for _ in range(self.workers)]
+        for pc_name in dict.fromkeys(pc_names):
+            shards[shard_for(pc_name, self.workers)].append(pc_name)
+
+        sweep_id = next(self._sweep_ids)
+        unreported = {}  # Worker index -> machines it has not reported yet this sweep
+        for index, shard in enumerate(shards):
+            if shard:
+                self._task_queues[index].put(("sweep", sweep_id, shard, port, timeout))
+                unreported[index] = set(shard)
+
+        results = {}
+        while unreported:
+            try:
+                message_sweep, index, batch, done = self._result_queue.get(timeout=self.liveness_interval)
+            except queue.Empty:
+                for index in list(unreported):
+                    process = self._processes[index]
+                    if not process.is_alive():
+                        print(f"Probe worker {index} died during a sweep (code {process.exitcode}); "
+                              f"restarting it")
+                        lost = unreported.pop(index)
+                        self._report(results, on_result, [(pc_name, False, None, None) for pc_name in lost])
+                        self._start_worker(index)
+                continue
+            if message_sweep != sweep_id or index not in unreported:
+                continue  # Leftovers from an abandoned sweep or a worker given up on
+            unreported[index].difference_update(entry[0] for entry in batch)
+            self._report(results, on_result, batch)
+            if done:
+                del unreported[index]
+        return results
+
+    def _report(self, results, on_result, batch):
+        for pc_name, is_online, latency_ms, ip in batch:
+            results[pc_name] = (is_online, latency_ms, ip)
+            if on_result:
+                try:
+                    on_result(pc_name, is_online, ip, latency_ms)
+                except Exception as e:
+                    print(f"Error handling status result for {pc_name}: {str(e)}")
+
+
+def _worker_main(index, task_queue, result_queue, batch_size, result_batch_size, flush_interval, dns_options):
+    """Worker process loop: probe the shards it is sent and stream results back in batches"""
+    dns_cache = DnsCache(**dns_options)
+    prober = SelectorProber(batch_size=batch_size, dns_cache=dns_cache)
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                return
+            if task[0] == "invalidate":
+                dns_cache.invalidate(task[1])
+                continue
+
+            _, sweep_id, pc_names, port, timeout = task
+            batch = []
+            reported = set()
+            last_flush = time.monotonic()
+
+            def collect(pc_name, is_online, ip, latency_ms):
+                nonlocal batch, last_flush
+                batch.append((pc_name, is_online, latency_ms, ip))
+                reported.add(pc_name)
+                now = time.monotonic()
+                if len(batch) >= result_batch_size or now - last_flush >= flush_interval:
+                    result_queue.put((sweep_id, index, batch, False))
+                    batch = []
+                    last_flush = now
+
+            try:
+                prober.probe_many(pc_names, on_result=collect, port=port, timeout=timeout)
+            except Exception as e:
+                print(f"Error in probe worker: {str(e)}")
+                # Whatever was not reported counts as offline rather than hanging the sweep
+                batch.extend((pc_name, False, None, None) for pc_name in pc_names
+                             if pc_name not in reported)
+            result_queue.put((sweep_id, index, batch, True))
+    finally:
+        dns_cache.shutdown()
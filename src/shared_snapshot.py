@@ -0,0 +1,236 @@
+import json
+import mmap
+import os
+import socket
+import struct
+import tempfile
+import time
+import uuid
+
+from status_store import MachineStatus
+
+# Snapshot file layout (little endian):
+#   header: magic, format version, record size, capacity, record count,
+#           sequence (odd while the leader is writing), published_at
+#   records: name (utf-8, zero padded), flags, latency_ms, last_probe, IPv4
+SNAPSHOT_MAGIC = b"VMSS"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIQd")
+_RECORD = struct.Struct("<128sBxHd4s")
+_SEQUENCE_OFFSET = 16  # Offset of the sequence field in the header
+_MAX_NAME_BYTES = 128
+_FLAG_ONLINE = 0x01
+_FLAG_PROBED = 0x02
+_NO_LATENCY = 0xFFFF
+
+
+class SnapshotWriter:
+    """Publishes machine status into a memory-mapped, fixed-record file.
+
+    Only the elected leader writes. Every publish rewrites the records in
+    place under a sequence counter that is odd while a write is in
+    progress, so readers can detect and retry torn reads without locking.
+    The file only ever grows, which keeps it safe to map on Windows while
+    other processes have it open."""
+
+    def __init__(self, path, initial_capacity=1024):
+        self.path = path
+        self._file = None
+        self._map = None
+        self._capacity = 0
+        self._sequence = 0
+        self._open(initial_capacity)
+
+    def _open(self, capacity):
+        mode = "r+b" if os.path.exists(self.path) else "w+b"
+        self._file = open(self.path, mode)
+        header = self._file.read(_HEADER.size)
+        if len(header) == _HEADER.size:
+            magic, version, record_size, existing_capacity, _, sequence, _ = _HEADER.unpack(header)
+            if magic == SNAPSHOT_MAGIC and version == SNAPSHOT_VERSION and record_size == _RECORD.size:
+                capacity = max(capacity, existing_capacity)
+                self._sequence = sequence + (sequence & 1)  # Resume after a leader that crashed mid-write
+        self._resize(capacity)
+
+    def _resize(self, capacity):
+        if self._map is not None:
+            self._map.close()
+        size = _HEADER.size + capacity * _RECORD.size
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() < size:
+            self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_WRITE)
+        self._capacity = capacity
+
+    def publish(self, records, published_at=None):
+        """Write {pc_name: MachineStatus} as the current snapshot"""
+        entries = [(pc_name.encode("utf-8"), status) for pc_name, status in records.items()]
+        entries = [(name, status) for name, status in entries if len(name) <= _MAX_NAME_BYTES]
+        if len(entries) > self._capacity:
+            capacity = self._capacity
+            while capacity < len(entries):
+                capacity *= 2
+            self._resize(capacity)
+
+        body = bytearray(len(entries) * _RECORD.size)
+        for index, (name, status) in enumerate(entries):
+            flags = (_FLAG_ONLINE if status.online else 0) | (_FLAG_PROBED if status.last_probe else 0)
+            latency = _NO_LATENCY if status.latency_ms is None else min(int(status.latency_ms), _NO_LATENCY - 1)
+            _RECORD.pack_into(body, index * _RECORD.size, name, flags, latency,
+                              status.last_probe or 0.0, _pack_ip(status.ip))
+
+        self._sequence += 1  # Odd: write in progress
+        struct.pack_into("<Q", self._map, _SEQUENCE_OFFSET, self._sequence)
+        self._map[_HEADER.size:_HEADER.size + len(body)] = body
+        self._sequence += 1
+        _HEADER.pack_into(self._map, 0, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _RECORD.size, self._capacity,
+                          len(entries), self._sequence,
+                          published_at if published_at is not None else time.time())
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SnapshotReader:
+    """Reads the snapshot published by the leader through a read-only mapping"""
+
+    def __init__(self, path, retries=5):
+        self.path = path
+        self.retries = retries
+        self._file = None
+        self._map = None
+
+    def read(self):
+        """Get (sequence, published_at, {pc_name: MachineStatus}), or None if no valid snapshot exists"""
+        for _ in range(self.retries):
+            if not self._ensure_mapped():
+                return None
+            header = self._map[:_HEADER.size]
+            magic, version, record_size, capacity, count, sequence, published_at = _HEADER.unpack(header)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or record_size != _RECORD.size:
+                return None  # Unknown format: written by another version of the application
+            if _HEADER.size + capacity * _RECORD.size > len(self._map):
+                self.close()  # Leader grew the file: map it again
+                continue
+            if sequence & 1:
+                time.sleep(0.001)
+                continue
+            body = self._map[_HEADER.size:_HEADER.size + count * _RECORD.size]
+            if struct.unpack_from("<Q", self._map, _SEQUENCE_OFFSET)[0] != sequence:
+                continue  # Torn read: the leader wrote while we copied
+            return sequence, published_at, _unpack_records(body, count)
+        return None
+
+    def _ensure_mapped(self):
+        if self._map is not None:
+            return True
+        try:
+            self._file = open(self.path, "rb")
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _HEADER.size:
+                self.close()
+                return False
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+            return True
+        except (OSError, ValueError):
+            self.close()
+            return False
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LeaderLease:
+    """Elects one prober among several application instances through a lock file.
+
+    The lock file names the current owner and when its lease expires. The
+    owner renews it while running; if it crashes, the lease runs out and
+    the next instance to call try_acquire() takes over."""
+
+    def __init__(self, path, lease_seconds=15, owner_id=None, clock=time.time):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.owner_id = owner_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.clock = clock
+
+    def try_acquire(self):
+        """Take or renew the lease; returns True if this instance is the leader"""
+        current = self._read()
+        now = self.clock()
+        if current and current.get("owner") != self.owner_id and current.get("expires", 0) > now:
+            return False
+        try:
+            self._write({"owner": self.owner_id, "expires": now + self.lease_seconds})
+        except OSError:
+            return False
+        # Another instance may have taken over at the same moment; the last write wins
+        current = self._read()
+        return bool(current) and current.get("owner") == self.owner_id
+
+    def holder(self):
+        """Get the owner id of the current, unexpired lease, or None"""
+        current = self._read()
+        if current and current.get("expires", 0) > self.clock():
+            return current.get("owner")
+        return None
+
+    def release(self):
+        """Give up the lease if this instance holds it"""
+        current = self._read()
+        if current and current.get("owner") == self.owner_id:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, lease):
+        directory = os.path.dirname(self.path) or "."
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(lease, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+def _pack_ip(ip):
+    if not ip:
+        return bytes(4)
+    try:
+        return socket.inet_aton(ip)
+    except OSError:
+        return bytes(4)  # Not IPv4: readers see no IP
+
+
+def _unpack_records(body, count):
+    records = {}
+    for index in range(count):
+        name, flags, latency, last_probe, ip = _RECORD.unpack_from(body, index * _RECORD.size)
+        probed = bool(flags & _FLAG_PROBED)
+        records[name.rstrip(b"\0").decode("utf-8", "replace")] = MachineStatus(
+            online=bool(flags & _FLAG_ONLINE) if probed else None,
+            last_probe=last_probe if probed else None,
+            latency_ms=None if latency == _NO_LATENCY else latency,
+            ip=socket.inet_ntoa(ip) if ip != bytes(4) else None
+        )
+    return records
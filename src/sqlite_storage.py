@@ -0,0 +1,342 @@
+"""Single-file SQLite storage for VM Manager.
+
+SqliteStorage has the same load/save surface as FileManager, but keeps all
+machine data in one database with one indexed table per kind of data. The
+save methods still receive the complete collection, as the rest of the
+application expects; they compare it against what was last loaded or saved
+and only write the rows that differ, so tagging one machine updates one
+machine's rows instead of rewriting every machine's tags.
+
+The application uses this storage when DB_FILE_NAME exists in the data
+directory. Create it from the existing text files with
+
+    python sqlite_storage.py [--data-dir DIR]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+
+DB_FILE_NAME = "vmmanager.db"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS machines (name TEXT PRIMARY KEY, position INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS last_used (machine TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS descriptions (machine TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS machine_rdp (machine TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS machine_ips (machine TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS machine_categories (machine TEXT PRIMARY KEY, category TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS machine_categories_by_category ON machine_categories (category);
+CREATE TABLE IF NOT EXISTS categories (name TEXT PRIMARY KEY, position INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS category_colors (category TEXT PRIMARY KEY, color TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS tags (name TEXT PRIMARY KEY, position INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS machine_tags (
+    machine TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (machine, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS machine_tags_by_tag ON machine_tags (tag);
+CREATE TABLE IF NOT EXISTS machine_probe (
+    machine TEXT PRIMARY KEY,
+    port INTEGER,
+    timeout REAL,
+    min_interval REAL
+);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# Tables mapping one key to one text value: table -> (key column, value column)
+_VALUE_TABLES = {
+    "last_used": ("machine", "value"),
+    "descriptions": ("machine", "value"),
+    "machine_rdp": ("machine", "value"),
+    "machine_ips": ("machine", "value"),
+    "machine_categories": ("machine", "category"),
+    "category_colors": ("category", "color"),
+    "settings": ("key", "value"),
+}
+
+_PROBE_FIELDS = ("port", "timeout", "min_interval")
+
+
+class SqliteStorage:
+    """Stores machine data, settings, categories and tags in one SQLite file.
+
+    Drop-in replacement for FileManager. Every save runs in a single
+    transaction, and only rows that changed since the last load or save
+    are written. Safe to use from several threads (e.g. write-behind
+    saves of machine IPs)."""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self._lock = threading.Lock()
+        self._connection = None
+        self._cache = {}  # table -> contents as last loaded or saved
+        self.update_paths()
+
+    def update_paths(self):
+        """(Re)open the database when the data directory changes"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self.db_path = os.path.join(self.data_dir, DB_FILE_NAME)
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            with self._connection:
+                self._connection.executescript(_SCHEMA)
+                self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._cache = {}
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _write(self, statements):
+        """Run [(sql, rows)] in one transaction, skipping empty row lists"""
+        statements = [(sql, rows) for sql, rows in statements if rows]
+        if statements:
+            with self._connection:
+                for sql, rows in statements:
+                    self._connection.executemany(sql, rows)
+
+    # Key -> value tables. The cache holds the stored strings.
+
+    def _cached_values(self, table):
+        if table not in self._cache:
+            key_column, value_column = _VALUE_TABLES[table]
+            self._cache[table] = dict(self._connection.execute(f"SELECT {key_column}, {value_column} FROM {table}"))
+        return self._cache[table]
+
+    def _load_values(self, table):
+        with self._lock:
+            return dict(self._cached_values(table))
+
+    def _save_values(self, table, values):
+        key_column, value_column = _VALUE_TABLES[table]
+        with self._lock:
+            stored = self._cached_values(table)
+            changed = [(key, str(value)) for key, value in values.items()
+                       if stored.get(key) != value and stored.get(key) != str(value)]
+            removed = [(key,) for key in _removed_keys(stored, values, dict(changed))]
+            self._write([
+                (f"DELETE FROM {table} WHERE {key_column} = ?", removed),
+                (f"INSERT OR REPLACE INTO {table} ({key_column}, {value_column}) VALUES (?, ?)", changed),
+            ])
+            for (key,) in removed:
+                del stored[key]
+            stored.update(changed)
+
+    # Ordered lists of unique names. The cache holds the stored order.
+
+    def _cached_list(self, table):
+        if table not in self._cache:
+            self._cache[table] = [name for name, in self._connection.execute(
+                f"SELECT name FROM {table} ORDER BY position")]
+        return self._cache[table]
+
+    def _load_list(self, table):
+        with self._lock:
+            return list(self._cached_list(table))
+
+    def _save_list(self, table, names):
+        with self._lock:
+            stored = self._cached_list(table)
+            if names == stored:
+                return
+            positions = {}
+            for name in names:
+                positions.setdefault(name, len(positions))
+            stored_positions = {name: position for position, name in enumerate(stored)}
+            self._write([
+                (f"DELETE FROM {table} WHERE name = ?",
+                 [(name,) for name in stored_positions if name not in positions]),
+                (f"INSERT OR REPLACE INTO {table} (name, position) VALUES (?, ?)",
+                 [item for item in positions.items() if stored_positions.get(item[0]) != item[1]]),
+            ])
+            self._cache[table] = list(positions)
+
+    def load_pcs(self):
+        return self._load_list("machines")
+
+    def save_pcs(self, pc_names):
+        self._save_list("machines", pc_names)
+
+    def load_last_used_times(self):
+        return self._load_values("last_used")
+
+    def save_last_used_times(self, last_used_times):
+        self._save_values("last_used", last_used_times)
+
+    def load_descriptions(self):
+        return self._load_values("descriptions")
+
+    def save_descriptions(self, descriptions):
+        self._save_values("descriptions", descriptions)
+
+    def load_machine_rdp_paths(self):
+        return self._load_values("machine_rdp")
+
+    def save_machine_rdp_paths(self, machine_rdp_paths):
+        self._save_values("machine_rdp", machine_rdp_paths)
+
+    def load_categories(self):
+        """Load categories; Default always exists and comes first if it was missing"""
+        categories = self._load_list("categories")
+        if not categories:
+            categories = ["Default"]
+            self.save_categories(categories)
+        elif "Default" not in categories:
+            categories.insert(0, "Default")
+        return categories
+
+    def save_categories(self, categories):
+        self._save_list("categories", categories)
+
+    def load_machine_categories(self):
+        return self._load_values("machine_categories")
+
+    def save_machine_categories(self, machine_categories):
+        self._save_values("machine_categories", machine_categories)
+
+    def load_tags(self):
+        return self._load_list("tags")
+
+    def save_tags(self, tags):
+        self._save_list("tags", tags)
+
+    def _cached_machine_tags(self):
+        if "machine_tags" not in self._cache:
+            machine_tags = {}
+            for machine, tag in self._connection.execute(
+                    "SELECT machine, tag FROM machine_tags ORDER BY machine, position"):
+                machine_tags.setdefault(machine, []).append(tag)
+            self._cache["machine_tags"] = machine_tags
+        return self._cache["machine_tags"]
+
+    def load_machine_tags(self):
+        with self._lock:
+            return {machine: list(tags) for machine, tags in self._cached_machine_tags().items()}
+
+    def save_machine_tags(self, machine_tags):
+        """Save machine-tag assignments; only machines whose tag list changed are rewritten"""
+        with self._lock:
+            stored = self._cached_machine_tags()
+            changed = {machine: list(tags) for machine, tags in machine_tags.items()
+                       if stored.get(machine) != tags}
+            removed = _removed_keys(stored, machine_tags, changed)
+            self._write([
+                ("DELETE FROM machine_tags WHERE machine = ?", [(machine,) for machine in (*changed, *removed)]),
+                ("INSERT INTO machine_tags (machine, position, tag) VALUES (?, ?, ?)",
+                 [(machine, position, tag) for machine, tags in changed.items()
+                  for position, tag in enumerate(tags)]),
+            ])
+            for machine in removed:
+                del stored[machine]
+            stored.update(changed)
+
+    def load_category_colors(self):
+        return self._load_values("category_colors")
+
+    def save_category_colors(self, category_colors):
+        self._save_values("category_colors", category_colors)
+
+    def load_machine_ips(self):
+        return self._load_values("machine_ips")
+
+    def save_machine_ips(self, machine_ips):
+        self._save_values("machine_ips", machine_ips)
+
+    def _cached_probe_configs(self):
+        if "machine_probe" not in self._cache:
+            self._cache["machine_probe"] = {
+                machine: tuple(values) for machine, *values in self._connection.execute(
+                    f"SELECT machine, {', '.join(_PROBE_FIELDS)} FROM machine_probe")
+            }
+        return self._cache["machine_probe"]
+
+    def load_machine_probe_configs(self):
+        """Load per-machine probe overrides as {pc_name: {"port", "timeout", "min_interval"}}"""
+        with self._lock:
+            return {
+                machine: {field: value for field, value in zip(_PROBE_FIELDS, values) if value is not None}
+                for machine, values in self._cached_probe_configs().items()
+            }
+
+    def save_machine_probe_configs(self, configs):
+        rows = {machine: tuple(config.get(field) for field in _PROBE_FIELDS)
+                for machine, config in configs.items() if config}
+        with self._lock:
+            stored = self._cached_probe_configs()
+            self._write([
+                ("DELETE FROM machine_probe WHERE machine = ?",
+                 [(machine,) for machine in stored if machine not in rows]),
+                (f"INSERT OR REPLACE INTO machine_probe (machine, {', '.join(_PROBE_FIELDS)}) VALUES (?, ?, ?, ?)",
+                 [(machine, *values) for machine, values in rows.items() if stored.get(machine) != values]),
+            ])
+            self._cache["machine_probe"] = rows
+
+    def load_settings(self):
+        return self._load_values("settings")
+
+    def save_settings(self, settings):
+        self._save_values("settings", settings)
+
+
+def _removed_keys(stored, current, changed):
+    """Keys of stored that are missing from current.
+
+    changed holds every key of current that differs from stored, so the
+    sizes tell whether anything was removed without scanning stored."""
+    added = sum(1 for key in changed if key not in stored)
+    if len(stored) + added == len(current):
+        return []
+    return [key for key in stored if key not in current]
+
+
+def migrate(source, target):
+    """Copy everything source (e.g. a FileManager) holds into target (a SqliteStorage)"""
+    target.save_settings(source.load_settings())
+    target.save_pcs(source.load_pcs())
+    target.save_last_used_times(source.load_last_used_times())
+    target.save_descriptions(source.load_descriptions())
+    target.save_machine_rdp_paths(source.load_machine_rdp_paths())
+    target.save_categories(source.load_categories())
+    target.save_machine_categories(source.load_machine_categories())
+    target.save_category_colors(source.load_category_colors())
+    target.save_tags(source.load_tags())
+    target.save_machine_tags(source.load_machine_tags())
+    target.save_machine_ips(source.load_machine_ips())
+    target.save_machine_probe_configs(source.load_machine_probe_configs())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move VM Manager's text data files into " + DB_FILE_NAME)
+    parser.add_argument("--data-dir", help="data directory to migrate (default: the GUI's data directory)")
+    args = parser.parse_args(argv)
+
+    from VMmanagerpython import FileManager
+
+    file_manager = FileManager(args.data_dir)
+    if os.path.exists(os.path.join(file_manager.data_dir, DB_FILE_NAME)):
+        print(f"{DB_FILE_NAME} already exists in {file_manager.data_dir}; nothing to do", file=sys.stderr)
+        return 1
+    storage = SqliteStorage(file_manager.data_dir)
+    try:
+        migrate(file_manager, storage)
+    except Exception:
+        storage.close()
+        os.remove(storage.db_path)  # Half-migrated database would take over on next start
+        raise
+    storage.close()
+    print(f"Migrated {len(file_manager.load_pcs())} machines into {storage.db_path}. "
+          f"The text files are left in place as a backup.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
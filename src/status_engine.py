@@ -0,0 +1,208 @@
+import asyncio
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dns_cache import DnsCache, DnsTimeoutError
+from rdp_probe import x224_handshake
+
+
+class StatusEngine:
+    """Runs machine status probes on a single asyncio event loop.
+
+    All probes share one background thread. A semaphore caps how many probes
+    are in flight at once, so a sweep over thousands of machines uses a
+    bounded number of sockets instead of one OS thread per machine.
+
+    For very large fleets a batch prober (see SelectorProber) can take over
+    the probing; its sweeps then run one after another on a single worker
+    thread instead of as one asyncio task per machine.
+
+    With handshake_interval set, an open port is not enough: at most once
+    per interval per machine the probe also sends an RDP X.224 Connection
+    Request on the same connection and requires a Connection Confirm. A
+    machine that failed it stays offline, and is re-checked on every probe
+    until it answers again. Batch probers only test the port, so the
+    handshake can't be combined with one."""
+
+    def __init__(self, on_result=None, max_concurrency=200, port=3389, timeout=3, dns_cache=None,
+                 batch_prober=None, handshake_interval=None, clock=time.monotonic):
+        if batch_prober and handshake_interval:
+            raise ValueError("The RDP handshake is not supported with a batch prober")
+        self.on_result = on_result  # Called as on_result(pc_name, is_online, ip, latency_ms) from the engine thread
+        self.dns_cache = dns_cache or DnsCache()
+        self.batch_prober = batch_prober
+        self._batch_executor = None
+        if batch_prober:
+            self._batch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="BatchProber")
+        self.max_concurrency = max_concurrency
+        self.port = port
+        self.timeout = timeout
+        self.probe_overrides = {}  # pc_name -> {"port": ..., "timeout": ...} replacing the defaults above
+        self.handshake_interval = handshake_interval  # Seconds between RDP handshakes, None to disable
+        self.clock = clock
+        self._handshakes = {}  # pc_name -> (checked_at, answered) of the last RDP handshake
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._ready = threading.Event()
+
+    def start(self):
+        """Start the background event loop thread (safe to call more than once)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="StatusEngine", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self, timeout=5):
+        """Stop the event loop and wait for the engine thread to finish"""
+        if self._loop is None or self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+        if self._batch_executor:
+            self._batch_executor.shutdown(wait=False, cancel_futures=True)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def sweep(self, pc_names):
+        """Probe all given machines concurrently.
+
+        Returns a concurrent.futures.Future that resolves to a dict of
+        pc_name -> bool once every probe has finished. Individual results are
+        also reported through on_result as soon as each probe completes."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._sweep(list(pc_names)), self._loop)
+
+    def check_rdp(self, pc_name):
+        """Check one machine's port and RDP handshake now, for the troubleshoot window.
+
+        Returns a concurrent.futures.Future of (port_open, rdp_answered); it
+        fails with socket.gaierror if the name can't be resolved."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._check_rdp(pc_name), self._loop)
+
+    async def _check_rdp(self, pc_name):
+        ip = await self._resolve(pc_name)
+        port, timeout = self.probe_target(pc_name)
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except (asyncio.TimeoutError, OSError):
+            return False, False
+        try:
+            return True, await x224_handshake(reader, writer, timeout)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            # Cancel whatever is still pending so the loop can close cleanly
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+    async def _sweep(self, pc_names):
+        if self.batch_prober:
+            loop = asyncio.get_running_loop()
+            # The batch prober takes one port and timeout per call, so group machines
+            # by their overrides; None leaves the prober's own default in place
+            groups = {}
+            for pc_name in pc_names:
+                overrides = self.probe_overrides.get(pc_name, {})
+                groups.setdefault((overrides.get("port"), overrides.get("timeout")), []).append(pc_name)
+            results = {}
+            for (port, timeout), group in groups.items():
+                results.update(await loop.run_in_executor(
+                    self._batch_executor, self.batch_prober.probe_many, group, self.on_result, port, timeout
+                ))
+            return {pc_name: result[0] for pc_name, result in results.items()}
+
+        results = await asyncio.gather(*(self._probe(pc_name) for pc_name in pc_names))
+        return dict(zip(pc_names, results))
+
+    async def _probe(self, pc_name):
+        async with self._semaphore:
+            ip, is_online, latency_ms = await self._check(pc_name)
+        if self.on_result:
+            try:
+                self.on_result(pc_name, is_online, ip, latency_ms)
+            except Exception as e:
+                print(f"Error handling status result for {pc_name}: {str(e)}")
+        return is_online
+
+    async def _check(self, pc_name):
+        """Resolve the machine and time a TCP connection to the probe port.
+
+        Returns (ip, is_online, latency_ms); latency_ms is None unless the
+        machine is online. is_online is None if DNS did not answer in time:
+        the machine was not probed, which says nothing about it being down."""
+        try:
+            ip = await self._resolve(pc_name)
+        except (DnsTimeoutError, asyncio.TimeoutError):
+            return None, None, None
+        except socket.gaierror:
+            # Don't show error message during status check
+            return None, False, None
+
+        port, timeout = self.probe_target(pc_name)
+        started = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except (asyncio.TimeoutError, OSError):
+            return ip, False, None
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        is_online = True
+        if self._handshake_due(pc_name):
+            is_online = await x224_handshake(reader, writer, timeout)
+            self._handshakes[pc_name] = (self.clock(), is_online)
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return ip, is_online, latency_ms if is_online else None
+
+    async def _resolve(self, pc_name):
+        """Resolve through the DNS cache; the deadline starts once a worker runs the lookup"""
+        lookup = self.dns_cache.submit(pc_name)
+        started_at = await asyncio.wait_for(asyncio.wrap_future(lookup.started), self.dns_cache.queue_timeout)
+        remaining = started_at + self.dns_cache.lookup_timeout - time.monotonic()
+        return await asyncio.wait_for(asyncio.wrap_future(lookup), max(0, remaining))
+
+    def probe_target(self, pc_name):
+        """Get the (port, timeout) used to probe a machine"""
+        overrides = self.probe_overrides.get(pc_name, {})
+        return overrides.get("port") or self.port, overrides.get("timeout") or self.timeout
+
+    def _handshake_due(self, pc_name):
+        if not self.handshake_interval:
+            return False
+        last = self._handshakes.get(pc_name)
+        if last is None or not last[1]:
+            return True
+        return self.clock() - last[0] >= self.handshake_interval
+
+    def forget(self, pc_name):
+        """Drop per-machine state for a machine that was removed"""
+        self._handshakes.pop(pc_name, None)
+        self.probe_overrides.pop(pc_name, None)
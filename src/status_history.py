@@ -0,0 +1,142 @@
+import threading
+import time
+from array import array
+
+# Latency slot values with a special meaning (real latencies are capped below them)
+DOWN = 0xFFFF
+UP_NO_LATENCY = 0xFFFE
+MAX_LATENCY_MS = 0xFFFD
+
+
+class StatusHistory:
+    """Fixed-size ring buffer of probe samples for one machine.
+
+    Each sample is a whole-second timestamp and a latency in milliseconds
+    (or a marker for "down"), stored in two typed arrays, so a machine
+    always costs the same few bytes per sample however long it runs."""
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._timestamps = array("I", bytes(array("I").itemsize * capacity))
+        self._latencies = array("H", bytes(array("H").itemsize * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def record(self, online, latency_ms=None, timestamp=None):
+        """Add a sample, overwriting the oldest one when the buffer is full"""
+        if timestamp is None:
+            timestamp = time.time()
+        if not online:
+            value = DOWN
+        elif latency_ms is None:
+            value = UP_NO_LATENCY
+        else:
+            value = min(int(round(latency_ms)), MAX_LATENCY_MS)
+        self._timestamps[self._next] = int(timestamp)
+        self._latencies[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def samples(self, window=None, now=None):
+        """Get (timestamp, online, latency_ms) samples, oldest first, optionally limited to the last window seconds"""
+        now = time.time() if now is None else now
+        since = now - window if window is not None else None
+        start = (self._next - self._count) % self.capacity
+        result = []
+        for offset in range(self._count):
+            index = (start + offset) % self.capacity
+            timestamp = self._timestamps[index]
+            if since is not None and timestamp < since:
+                continue
+            value = self._latencies[index]
+            online = value != DOWN
+            latency_ms = value if online and value != UP_NO_LATENCY else None
+            result.append((timestamp, online, latency_ms))
+        return result
+
+    def uptime_percent(self, window=None, now=None):
+        """Time-weighted share of the window the machine was up, or None without samples.
+
+        Each sample's state is assumed to hold until the next sample, so the
+        result stays meaningful when probe intervals back off."""
+        now = time.time() if now is None else now
+        samples = self.samples(window, now)
+        if not samples:
+            return None
+        up_time = 0.0
+        total_time = 0.0
+        for index, (timestamp, online, _) in enumerate(samples):
+            end = samples[index + 1][0] if index + 1 < len(samples) else now
+            duration = max(end - timestamp, 0)
+            total_time += duration
+            if online:
+                up_time += duration
+        if total_time == 0:
+            return 100.0 if samples[-1][1] else 0.0
+        return up_time / total_time * 100
+
+    def flap_count(self, window=None, now=None):
+        """Number of up/down transitions in the window"""
+        samples = self.samples(window, now)
+        return sum(1 for previous, current in zip(samples, samples[1:]) if previous[1] != current[1])
+
+    def mean_latency(self, window=None, now=None):
+        """Mean connect latency in ms over samples that recorded one, or None"""
+        latencies = [latency for _, _, latency in self.samples(window, now) if latency is not None]
+        if not latencies:
+            return None
+        return sum(latencies) / len(latencies)
+
+
+class FleetHistory:
+    """Status history buffers for every machine, fed by the status engine"""
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._histories = {}
+
+    def record(self, pc_name, online, latency_ms=None, timestamp=None):
+        """Add a sample for a machine, creating its buffer on first use"""
+        with self._lock:
+            history = self._histories.get(pc_name)
+            if history is None:
+                history = self._histories[pc_name] = StatusHistory(self.capacity)
+            history.record(online, latency_ms, timestamp)
+
+    def remove(self, pc_name):
+        with self._lock:
+            self._histories.pop(pc_name, None)
+
+    def samples(self, pc_name, window=None, now=None):
+        with self._lock:
+            history = self._histories.get(pc_name)
+            return history.samples(window, now) if history else []
+
+    def summary(self, pc_name, window=None, now=None):
+        """Get {"uptime", "flaps", "mean_latency", "samples"} for one machine, or None"""
+        with self._lock:
+            history = self._histories.get(pc_name)
+            if history is None:
+                return None
+            return {
+                "uptime": history.uptime_percent(window, now),
+                "flaps": history.flap_count(window, now),
+                "mean_latency": history.mean_latency(window, now),
+                "samples": len(history.samples(window, now))
+            }
+
+    def flakiest(self, window=None, limit=None, now=None):
+        """Get (pc_name, summary) pairs for the fleet, most flaps and least uptime first"""
+        with self._lock:
+            names = list(self._histories)
+        summaries = []
+        for pc_name in names:
+            summary = self.summary(pc_name, window, now)
+            if summary and summary["samples"]:
+                summaries.append((pc_name, summary))
+        summaries.sort(key=lambda item: (-item[1]["flaps"], item[1]["uptime"]))
+        return summaries[:limit] if limit else summaries
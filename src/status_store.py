@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import namedtuple
+
+from change_queue import ChangeQueue
+
+# Immutable status record for one machine; replaced as a whole on every write
+MachineStatus = namedtuple("MachineStatus", ["online", "last_probe", "latency_ms", "ip"])
+
+# Not probed yet: online is None rather than False so it isn't shown as offline
+UNKNOWN_STATUS = MachineStatus(online=None, last_probe=None, latency_ms=None, ip=None)
+
+# Health states derived from a status record
+UNKNOWN = "unknown"
+HEALTHY = "healthy"
+SLOW = "slow"
+DOWN = "down"
+
+
+def classify_health(status, slow_latency_ms):
+    """Classify a status record as UNKNOWN, HEALTHY, SLOW or DOWN.
+
+    Machines that did not accept a connection within the probe timeout are
+    down; machines that did, but took slow_latency_ms or longer, are slow.
+    Machines that have never been probed are unknown."""
+    if status.last_probe is None:
+        return UNKNOWN
+    if not status.online:
+        return DOWN
+    if status.latency_ms is not None and status.latency_ms >= slow_latency_ms:
+        return SLOW
+    return HEALTHY
+
+
+class StatusStore:
+    """Thread-safe, versioned store of per-machine status.
+
+    Probe threads write through update(), the single writer path, which
+    swaps in a new immutable record under a lock and bumps the version.
+    get() never locks, it only reads the current record; snapshot() takes
+    the lock so its version always matches its records. The version lets
+    consumers skip work when nothing has changed."""
+
+    def __init__(self, pc_names=(), slow_latency_ms=150, max_pending_changes=10000):
+        self.slow_latency_ms = slow_latency_ms
+        self._lock = threading.Lock()
+        self._records = {pc_name: UNKNOWN_STATUS for pc_name in pc_names}
+        # Machines whose health state changed and haven't been drained yet
+        self._changes = ChangeQueue(max_pending_changes)
+        self._version = 0
+
+    @property
+    def version(self):
+        """Monotonically increasing number, bumped on every write"""
+        return self._version
+
+    def __contains__(self, pc_name):
+        return pc_name in self._records
+
+    def get(self, pc_name):
+        """Get the current status record of a machine"""
+        return self._records.get(pc_name, UNKNOWN_STATUS)
+
+    def health(self, pc_name):
+        """Get the UNKNOWN/HEALTHY/SLOW/DOWN state of a machine"""
+        return classify_health(self.get(pc_name), self.slow_latency_ms)
+
+    def age(self, pc_name, now=None):
+        """Seconds since the machine was last probed, or None if it never was"""
+        last_probe = self.get(pc_name).last_probe
+        if last_probe is None:
+            return None
+        return max(0.0, (time.time() if now is None else now) - last_probe)
+
+    def snapshot(self):
+        """Get (version, {pc_name: MachineStatus}) as a consistent copy"""
+        with self._lock:
+            return self._version, dict(self._records)
+
+    def update(self, pc_name, online, ip=None, latency_ms=None, probed_at=None):
+        """Record a probe result; returns True if the machine's online state changed"""
+        with self._lock:
+            previous = self._records.get(pc_name)
+            if previous is None:
+                return False  # Machine was removed while its probe was running
+            current = MachineStatus(
+                online=online,
+                last_probe=probed_at if probed_at is not None else time.time(),
+                latency_ms=latency_ms,
+                ip=ip or previous.ip
+            )
+            self._records[pc_name] = current
+            if (classify_health(previous, self.slow_latency_ms)
+                    != classify_health(current, self.slow_latency_ms)):
+                self._changes.put(pc_name)
+            changed = previous.online != online
+            self._version += 1
+            return changed
+
+    def add(self, pc_name):
+        """Start tracking a machine"""
+        with self._lock:
+            if pc_name not in self._records:
+                self._records[pc_name] = UNKNOWN_STATUS
+                self._version += 1
+
+    def remove(self, pc_name):
+        """Stop tracking a machine"""
+        with self._lock:
+            if self._records.pop(pc_name, None) is not None:
+                self._changes.discard(pc_name)
+                self._version += 1
+
+    def mark_changed(self, pc_name):
+        """Report a machine as changed so its card is redrawn, without a new probe result"""
+        with self._lock:
+            if pc_name in self._records:
+                self._changes.put(pc_name)
+                self._version += 1
+
+    def set_slow_latency(self, slow_latency_ms):
+        """Change the slow threshold; machines whose health changes with it are reported as changed"""
+        with self._lock:
+            for pc_name, status in self._records.items():
+                if (classify_health(status, self.slow_latency_ms)
+                        != classify_health(status, slow_latency_ms)):
+                    self._changes.put(pc_name)
+            self.slow_latency_ms = slow_latency_ms
+            self._version += 1
+
+    def drain_changes(self, limit=None):
+        """Take up to limit changed machines, oldest first; returns (pc_names, overflowed).
+
+        overflowed is True if more machines changed than the queue could
+        track; the caller should then treat every machine as changed."""
+        return self._changes.drain(limit)
+
+    def pop_changes(self):
+        """Get and clear the machines whose health state changed since the last call"""
+        changes, overflowed = self._changes.drain()
+        if overflowed:
+            return set(self._records)
+        return set(changes)
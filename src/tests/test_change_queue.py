@@ -0,0 +1,70 @@
+import unittest
+import threading
+import sys
+import os
+
+# Add parent directory to path to find change_queue module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from change_queue import ChangeQueue
+
+
+class TestChangeQueue(unittest.TestCase):
+    def test_drain_is_fifo_and_bounded(self):
+        queue = ChangeQueue()
+        for key in ("VM1", "VM2", "VM3"):
+            queue.put(key)
+        self.assertEqual(queue.drain(2), (["VM1", "VM2"], False))
+        self.assertEqual(queue.drain(2), (["VM3"], False))
+        self.assertEqual(queue.drain(), ([], False))
+
+    def test_waiting_key_is_coalesced(self):
+        queue = ChangeQueue()
+        queue.put("VM1")
+        queue.put("VM2")
+        queue.put("VM1")
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.drain(), (["VM1", "VM2"], False))
+        # Once drained it can be queued again
+        queue.put("VM1")
+        self.assertEqual(queue.drain(), (["VM1"], False))
+
+    def test_discard(self):
+        queue = ChangeQueue()
+        queue.put("VM1")
+        queue.put("VM2")
+        queue.discard("VM1")
+        queue.put("VM3")
+        queue.put("VM1")
+        self.assertEqual(queue.drain(), (["VM2", "VM3", "VM1"], False))
+
+    def test_overflow_requests_resync_once(self):
+        queue = ChangeQueue(capacity=3)
+        for i in range(10):
+            queue.put(f"VM{i}")
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(queue.drain(100), ([], True))
+        self.assertEqual(queue.drain(100), ([], False))
+        queue.put("VM1")
+        self.assertEqual(queue.drain(), (["VM1"], False))
+
+    def test_concurrent_producers(self):
+        queue = ChangeQueue(capacity=10000)
+        threads = [
+            threading.Thread(target=lambda t=t: [queue.put(f"VM{t}-{i}") for i in range(500)])
+            for t in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        drained = []
+        while any(thread.is_alive() for thread in threads) or len(queue):
+            drained.extend(queue.drain(100)[0])
+        for thread in threads:
+            thread.join()
+        drained.extend(queue.drain()[0])
+        self.assertEqual(len(drained), 4000)
+        self.assertEqual(len(set(drained)), 4000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import socket
+import threading
+import time
+import sys
+import os
+
+# Add parent directory to path to find dns_cache module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_cache import DnsCache, DnsTimeoutError
+
+
+class FakeResolver:
+    def __init__(self, answers, delay=0):
+        self.answers = answers
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, hostname):
+        self.calls += 1
+        time.sleep(self.delay)
+        answer = self.answers.get(hostname)
+        if answer is None:
+            raise socket.gaierror(11001, "getaddrinfo failed")
+        return answer
+
+
+class TestDnsCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.resolver = FakeResolver({"VM1": "10.0.0.1"})
+        self.cache = DnsCache(positive_ttl=60, negative_ttl=10, resolver=self.resolver,
+                              clock=lambda: self.now)
+
+    def tearDown(self):
+        self.cache.shutdown()
+
+    def test_positive_lookups_are_cached_until_ttl(self):
+        self.assertEqual(self.cache.resolve("VM1"), "10.0.0.1")
+        self.assertEqual(self.cache.resolve("vm1"), "10.0.0.1")
+        self.assertEqual(self.resolver.calls, 1)
+        self.now += 61
+        self.cache.resolve("VM1")
+        self.assertEqual(self.resolver.calls, 2)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_failures_are_cached_for_negative_ttl(self):
+        for _ in range(3):
+            with self.assertRaises(socket.gaierror):
+                self.cache.resolve("gone")
+        self.assertEqual(self.resolver.calls, 1)
+        self.now += 11
+        with self.assertRaises(socket.gaierror):
+            self.cache.resolve("gone")
+        self.assertEqual(self.resolver.calls, 2)
+
+    def test_invalidate_forces_new_lookup(self):
+        self.cache.resolve("VM1")
+        self.cache.invalidate("VM1")
+        self.cache.resolve("VM1")
+        self.assertEqual(self.resolver.calls, 2)
+
+    def test_concurrent_lookups_are_coalesced(self):
+        self.resolver.delay = 0.2
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.resolve("VM1")))
+                   for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["10.0.0.1"] * 10)
+        self.assertEqual(self.resolver.calls, 1)
+        self.assertEqual(self.cache.stats()["coalesced"], 9)
+
+    def test_slow_lookup_misses_deadline_without_blocking_others(self):
+        self.resolver.delay = 0.5
+        started = time.monotonic()
+        with self.assertRaises(DnsTimeoutError):
+            self.cache.resolve("VM1", timeout=0.05)
+        self.assertLess(time.monotonic() - started, 0.4)
+        # A later caller shares the lookup that is still running
+        future = self.cache.submit("VM1")
+        self.assertEqual(future.result(timeout=2), "10.0.0.1")
+        self.assertEqual(self.resolver.calls, 1)
+
+    def test_deadline_starts_when_lookup_runs(self):
+        resolver = FakeResolver({f"VM{i}": f"10.0.0.{i}" for i in range(6)}, delay=0.1)
+        cache = DnsCache(lookup_timeout=0.3, max_workers=1, resolver=resolver)
+        self.addCleanup(cache.shutdown)
+        lookups = [cache.submit(f"VM{i}") for i in range(6)]
+        # The last lookup waits ~0.5 s for the single worker, longer than its deadline
+        self.assertEqual([cache.wait(lookup) for lookup in lookups], [f"10.0.0.{i}" for i in range(6)])
+
+    def test_lookup_stuck_in_queue_times_out(self):
+        resolver = FakeResolver({"VM1": "10.0.0.1", "VM2": "10.0.0.2"}, delay=0.5)
+        cache = DnsCache(max_workers=1, queue_timeout=0.1, resolver=resolver)
+        self.addCleanup(cache.shutdown)
+        cache.submit("VM1")
+        with self.assertRaises(DnsTimeoutError):
+            cache.resolve("VM2")
+
+    def test_interactive_lookups_skip_the_sweep_queue(self):
+        answers = {f"VM{i}": f"10.0.0.{i}" for i in range(6)}
+        resolver = FakeResolver(answers, delay=0.3)
+        cache = DnsCache(max_workers=1, resolver=resolver)
+        self.addCleanup(cache.shutdown)
+        for i in range(5):
+            cache.submit(f"VM{i}")
+        started = time.monotonic()
+        # VM4 is still queued behind the sweep; the interactive lookup overtakes it
+        self.assertEqual(cache.wait(cache.submit("VM4", interactive=True)), "10.0.0.4")
+        self.assertEqual(cache.wait(cache.submit("VM5", interactive=True)), "10.0.0.5")
+        self.assertLess(time.monotonic() - started, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
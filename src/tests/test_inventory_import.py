@@ -0,0 +1,83 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add parent directory to path to find inventory_import module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory_import import InventoryRow, read_inventory
+
+
+class TestInventoryImport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_reads_machine_list_export(self):
+        path = self.write("vm_machine_list.csv",
+                          "Machine Name,Description,Last Used,Custom RDP Path\r\n"
+                          "VM1,\"Build box, \nsecond floor\",01/02 10:00,Default\r\n"
+                          "VM2,,Never,C:\\rdp\\vm2.rdp\r\n")
+        inventory = read_inventory(path)
+        self.assertEqual(inventory.rows, 2)
+        self.assertEqual(inventory.fields, {"name", "description", "rdp_path"})
+        self.assertEqual(inventory.machines, [
+            InventoryRow("VM1", "Build box, second floor", "", (), ""),
+            InventoryRow("VM2", "", "", (), "C:\\rdp\\vm2.rdp"),
+        ])
+
+    def test_category_and_tag_columns_and_merging(self):
+        path = self.write("inventory.csv",
+                          "\ufeffHostname,Group,Labels\n"
+                          "vm-a,Lab,gpu; win11\n"
+                          "vm-b,,\n"
+                          "VM-A,Build,win11|fast\n")
+        inventory = read_inventory(path)
+        self.assertEqual(inventory.duplicates, 1)
+        self.assertEqual(inventory.machines, [
+            InventoryRow("vm-a", "", "Build", ("gpu", "win11", "fast"), ""),
+            InventoryRow("vm-b", "", "", (), ""),
+        ])
+
+    def test_explicit_column_map(self):
+        path = self.write("inventory.csv", "VM Id,Display Name\n42,vm-42\n")
+        with self.assertRaises(ValueError):
+            read_inventory(path)
+        inventory = read_inventory(path, column_map={"name": "Display Name", "description": "VM Id"})
+        self.assertEqual(inventory.machines, [InventoryRow("vm-42", "42", "", (), "")])
+
+    def test_ndjson_with_progress(self):
+        lines = [json.dumps({"name": f"vm-{i}", "category": "Lab", "tags": ["a", "b"], "online": True})
+                 for i in range(25)]
+        path = self.write("inventory.ndjson", "\n".join(lines) + "\n\n")
+        reports = []
+        inventory = read_inventory(path, progress=lambda rows, fraction: reports.append((rows, fraction)),
+                                   progress_every=10)
+        self.assertEqual(len(inventory.machines), 25)
+        self.assertEqual(inventory.machines[0], InventoryRow("vm-0", "", "Lab", ("a", "b"), ""))
+        self.assertEqual([rows for rows, _ in reports], [10, 20, 25])
+        self.assertEqual(reports[-1][1], 1.0)
+        self.assertTrue(0 < reports[0][1] < 1)
+
+    def test_bad_ndjson_line(self):
+        path = self.write("inventory.ndjson", '{"name": "vm-1"}\nnot json\n')
+        with self.assertRaises(ValueError):
+            read_inventory(path)
+
+    def test_ndjson_tags_cannot_break_the_tag_file(self):
+        path = self.write("inventory.ndjson", json.dumps({"name": "vm-1", "tags": ["a,b", "c:d", " e "]}) + "\n")
+        self.assertEqual(read_inventory(path).machines[0].tags, ("a", "b", "e"))
+
+
+if __name__ == "__main__":
+    unittest.main()
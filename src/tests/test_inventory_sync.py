@@ -0,0 +1,69 @@
+import unittest
+import os
+import sys
+
+# Add parent directory to path to find inventory_sync module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory_import import InventoryRow
+from inventory_sync import MachineChange, diff_inventory, format_diff
+
+ALL_FIELDS = {"name", "description", "category", "tags", "rdp_path"}
+
+
+class TestDiffInventory(unittest.TestCase):
+    def setUp(self):
+        self.current = {
+            "VM1": InventoryRow("VM1", "Web", "", ("manual",), ""),
+            "VM2": InventoryRow("VM2", "DB", "Servers", (), ""),
+            "VM3": InventoryRow("VM3", "", "", (), ""),
+        }
+
+    def test_unchanged_inventory_is_empty_diff(self):
+        diff = diff_inventory(self.current, list(self.current.values()), ALL_FIELDS)
+        self.assertEqual((diff.added, diff.removed, diff.changed), ([], [], []))
+        self.assertEqual(format_diff(diff), "Already in sync: nothing to change.")
+
+    def test_adds_removes_and_changes_are_keyed_by_name(self):
+        diff = diff_inventory(self.current, [
+            InventoryRow("vm1", "Web", "", ("manual",), ""),
+            InventoryRow("VM2", "Database", "Servers", (), ""),
+            InventoryRow("VM4", "New", "", (), ""),
+        ], ALL_FIELDS)
+        self.assertEqual([row.name for row in diff.added], ["VM4"])
+        self.assertEqual(diff.removed, ["VM3"])
+        self.assertEqual(diff.changed, [MachineChange("VM2", {"description": ("DB", "Database")})])
+
+    def test_keep_missing_machines(self):
+        diff = diff_inventory(self.current, [self.current["VM1"]], ALL_FIELDS, remove_missing=False)
+        self.assertEqual(diff.removed, [])
+
+    def test_empty_inventory_removes_nothing(self):
+        self.assertEqual(diff_inventory(self.current, [], ALL_FIELDS).removed, [])
+        self.assertEqual(diff_inventory(self.current, [], set()).removed, [])
+
+    def test_tags_are_only_added(self):
+        diff = diff_inventory(self.current, [InventoryRow("VM1", "Web", "", ("lab",), "")], ALL_FIELDS)
+        self.assertEqual(diff.changed, [MachineChange("VM1", {"tags": (("manual",), ("manual", "lab"))})])
+        diff = diff_inventory(self.current, [InventoryRow("VM1", "Web", "", (), "")], ALL_FIELDS)
+        self.assertEqual(diff.changed, [])
+
+    def test_only_fields_with_columns_are_compared(self):
+        diff = diff_inventory(self.current, [InventoryRow("VM2", "", "", (), "")], {"name", "description"})
+        self.assertEqual(diff.changed, [MachineChange("VM2", {"description": ("DB", "")})])
+
+    def test_default_category_matches_none(self):
+        diff = diff_inventory(self.current, [InventoryRow("VM3", "", "Default", (), "")], ALL_FIELDS)
+        self.assertEqual(diff.changed, [])
+
+    def test_format_diff_limits_listing(self):
+        current = {f"VM{i}": InventoryRow(f"VM{i}", "", "", (), "") for i in range(30)}
+        diff = diff_inventory(current, [InventoryRow("VM30", "", "", (), "")], ALL_FIELDS)
+        text = format_diff(diff, invalid=["bad name"], limit=5)
+        self.assertIn("1 to add, 30 to remove, 0 to update.", text)
+        self.assertIn("... and 25 more", text)
+        self.assertIn("bad name", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
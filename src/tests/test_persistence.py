@@ -0,0 +1,235 @@
+import unittest
+import io
+import os
+import sys
+import tempfile
+from concurrent.futures import Future
+from contextlib import redirect_stdout
+
+# Add parent directory to path to find VMmanagerpython module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory_import import Inventory, InventoryRow, read_inventory
+from VMmanagerpython import FileManager, VMManager
+
+
+class TestDeferredSaves(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = self.temp_dir.name
+        with open(os.path.join(self.data_dir, "settings.txt"), "w") as f:
+            f.write("save_delay=60\n")
+        with open(os.path.join(self.data_dir, "pcs.txt"), "w") as f:
+            f.write("".join(f"VM{i}\n" for i in range(50)))
+        self.vm_manager = VMManager(data_dir=self.data_dir, interactive=False)
+
+    def tearDown(self):
+        self.vm_manager.shutdown()
+        self.temp_dir.cleanup()
+
+    def test_edits_are_written_once_in_the_background(self):
+        self.vm_manager.add_tag("lab")
+        for i in range(50):
+            self.vm_manager.add_machine_tag(f"VM{i}", "lab")
+        machine_tags_path = os.path.join(self.data_dir, "machine_tags.txt")
+        self.assertFalse(os.path.exists(machine_tags_path))
+
+        self.vm_manager.flush_saves()
+        self.assertEqual(FileManager(self.data_dir).load_machine_tags(),
+                         {f"VM{i}": ["lab"] for i in range(50)})
+        self.assertEqual(FileManager(self.data_dir).load_tags(), ["lab"])
+
+    def test_shutdown_flushes_pending_saves(self):
+        self.vm_manager.delete_pc("VM3")
+        self.vm_manager.shutdown()
+        pc_names = FileManager(self.data_dir).load_pcs()
+        self.assertEqual(len(pc_names), 49)
+        self.assertNotIn("VM3", pc_names)
+        # Atomic writes leave no temporary files behind
+        self.assertEqual([name for name in os.listdir(self.data_dir) if name.startswith(".tmp_")], [])
+
+    def test_bulk_add_dedupes_validates_and_saves_once(self):
+        pasted = ["  new-1 ", "VM1", "new-2", "NEW-1", "", "bad name", "10.0.0.5", "host:3389"]
+        result = self.vm_manager.add_pcs(pasted)
+        self.assertEqual(result.added, ["new-1", "new-2", "10.0.0.5"])
+        self.assertEqual(result.duplicates, ["VM1", "NEW-1"])
+        self.assertEqual(result.invalid, ["bad name", "host:3389"])
+        self.assertEqual(self.vm_manager.pc_names[-3:], ["new-1", "new-2", "10.0.0.5"])
+        self.assertIn("new-2", self.vm_manager.status_store)
+
+        self.vm_manager.flush_saves()
+        self.assertEqual(FileManager(self.data_dir).load_pcs(), self.vm_manager.pc_names)
+
+    def test_single_add_uses_the_bulk_checks(self):
+        self.assertTrue(self.vm_manager.add_pc("new-1"))
+        self.assertFalse(self.vm_manager.add_pc("vm1"))
+        self.assertFalse(self.vm_manager.add_pc("bad name"))
+        self.assertFalse(self.vm_manager.add_pc("host:1"))
+        self.assertEqual(self.vm_manager.pc_names[50:], ["new-1"])
+
+    def test_bulk_add_of_thousands(self):
+        result = self.vm_manager.add_pcs([f"bulk-{i}" for i in range(5000)] * 2)
+        self.assertEqual((len(result.added), len(result.duplicates)), (5000, 5000))
+        self.assertEqual(len(self.vm_manager.pc_names), 5050)
+
+    def test_import_inventory_updates_all_collections(self):
+        self.vm_manager.add_tag("lab")
+        result = self.vm_manager.import_inventory([
+            InventoryRow("vm1", "Updated", "", ("lab",), ""),
+            InventoryRow("new-1", "Fresh", "Build", ("lab", "gpu"), "C:\\new-1.rdp"),
+            InventoryRow("not valid", "", "", (), ""),
+        ])
+        self.assertEqual(result.added, ["new-1"])
+        self.assertEqual(result.updated, ["VM1"])
+        self.assertEqual(result.invalid, ["not valid"])
+        self.assertEqual(self.vm_manager.get_description("VM1"), "Updated")
+        self.assertEqual(self.vm_manager.get_machine_category("new-1"), "Build")
+        self.assertIn("Build", self.vm_manager.categories)
+        self.assertEqual(self.vm_manager.get_machine_tags("new-1"), ["lab", "gpu"])
+        self.assertEqual(self.vm_manager.tags, ["lab", "gpu"])
+
+        self.vm_manager.flush_saves()
+        file_manager = FileManager(self.data_dir)
+        self.assertIn("new-1", file_manager.load_pcs())
+        self.assertEqual(file_manager.load_machine_rdp_paths(), {"new-1": "C:\\new-1.rdp"})
+        self.assertEqual(file_manager.load_machine_tags()["VM1"], ["lab"])
+
+    def test_inventory_sync_touches_only_affected_machines(self):
+        self.vm_manager.add_tag("manual")
+        self.vm_manager.add_machine_tag("VM1", "manual")
+        self.vm_manager.last_used_times["VM1"] = "2026-01-01 10:00:00"
+        machines = [InventoryRow(f"VM{i}", "", "", (), "") for i in range(2, 50)]
+        machines.append(InventoryRow("VM1", "Synced", "", ("hyperv",), ""))
+        machines.append(InventoryRow("VM50", "", "", (), ""))
+        inventory = Inventory(machines, len(machines), 0, frozenset({"name", "description", "tags"}))
+
+        diff, invalid = self.vm_manager.diff_inventory(inventory)
+        self.assertEqual(invalid, [])
+        self.assertEqual([row.name for row in diff.added], ["VM50"])
+        self.assertEqual(diff.removed, ["VM0"])
+        self.assertEqual([change.name for change in diff.changed], ["VM1"])
+        self.assertIn("VM0", self.vm_manager.pc_names)  # Preview changes nothing
+
+        self.vm_manager.apply_inventory_diff(diff)
+        self.assertNotIn("VM0", self.vm_manager.pc_names)
+        self.assertIn("VM50", self.vm_manager.pc_names)
+        self.assertEqual(self.vm_manager.get_description("VM1"), "Synced")
+        self.assertEqual(self.vm_manager.get_machine_tags("VM1"), ["manual", "hyperv"])
+        self.assertEqual(self.vm_manager.last_used_times["VM1"], "2026-01-01 10:00:00")
+
+        # Syncing the same file again is a no-op
+        diff, _ = self.vm_manager.diff_inventory(inventory)
+        self.assertEqual((diff.added, diff.removed, diff.changed), ([], [], []))
+
+    def test_multi_line_tags_cell_survives_a_reload(self):
+        path = os.path.join(self.data_dir, "inventory.csv")
+        with open(path, "w", newline="") as f:
+            f.write('Machine Name,Tags\r\nvm-tags,"a\nb;c"\r\n')
+        self.vm_manager.import_inventory(read_inventory(path).machines)
+        self.assertEqual(self.vm_manager.get_machine_tags("vm-tags"), ["a b", "c"])
+        self.vm_manager.shutdown()
+
+        self.vm_manager = VMManager(data_dir=self.data_dir, interactive=False)
+        self.assertEqual(self.vm_manager.get_machine_tags("vm-tags"), ["a b", "c"])
+
+    def test_empty_inventory_file_removes_nothing(self):
+        path = os.path.join(self.data_dir, "inventory.csv")
+        for text in ("", "Machine Name,Description\n"):
+            with open(path, "w") as f:
+                f.write(text)
+            diff, _ = self.vm_manager.diff_inventory(read_inventory(path))
+            self.assertEqual(diff.removed, [])
+
+    def test_truncated_inventory_file_is_not_removed_automatically(self):
+        path = os.path.join(self.data_dir, "inventory.csv")
+        with open(path, "w") as f:
+            f.write("Machine Name,Description\nVM0,First\nVM")
+        applied, missing = self.vm_manager.sync_inventory(read_inventory(path), remove_missing=True)
+        self.assertTrue(all(f"VM{i}" in self.vm_manager.pc_names for i in range(50)))
+        self.assertEqual(applied.removed, [])
+        self.assertEqual(missing, [f"VM{i}" for i in range(1, 50)])  # Left for the user to confirm
+        self.assertEqual(self.vm_manager.get_description("VM0"), "First")
+
+
+class TestStatusBookkeeping(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = self.temp_dir.name
+        with open(os.path.join(self.data_dir, "pcs.txt"), "w") as f:
+            f.write("".join(f"VM{i}\n" for i in range(50)))
+        self.vm_manager = VMManager(data_dir=self.data_dir, interactive=False)
+
+    def tearDown(self):
+        self.vm_manager.shutdown()
+        self.temp_dir.cleanup()
+
+    def test_due_probes_start_with_unprobed_machines(self):
+        now = [0.0]
+        scheduler = self.vm_manager.probe_scheduler
+        scheduler.clock = lambda: now[0]
+        swept = []
+
+        def sweep(pc_names):
+            swept.append(pc_names)
+            return done_sweep
+
+        done_sweep = Future()
+        done_sweep.set_result({})
+        self.vm_manager.status_engine.sweep = sweep
+        scheduler.set_machines([])
+        scheduler.set_machines(self.vm_manager.pc_names)
+        now[0] += 10
+        self.vm_manager.run_due_probes()
+        for pc_name in swept[0]:
+            scheduler.record_result(pc_name, True)
+
+        now[0] += 1000
+        self.vm_manager.add_pc("NEW1")
+        self.vm_manager.run_due_probes()
+        self.assertEqual(swept[1][0], "NEW1")
+        self.assertEqual(len(swept[1]), 51)
+
+    def test_failed_sweep_hands_machines_back(self):
+        now = [0.0]
+        scheduler = self.vm_manager.probe_scheduler
+        scheduler.clock = lambda: now[0]
+        failed_sweep = Future()
+        failed_sweep.set_exception(OSError(24, "Too many open files"))
+        self.vm_manager.status_engine.sweep = lambda pc_names: failed_sweep
+        scheduler.set_machines([])
+        scheduler.set_machines(self.vm_manager.pc_names)
+        now[0] += 10
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(self.vm_manager.run_due_probes(), 50)
+        now[0] += 1000
+        self.assertEqual(len(scheduler.pop_due()), 50)
+
+    def test_dns_timeout_keeps_last_status(self):
+        scheduler = self.vm_manager.probe_scheduler
+        scheduler.add("VM1")
+        self.assertIn("VM1", scheduler.pop_due())
+        self.vm_manager._handle_status_result("VM1", None, None)
+        self.assertIsNone(self.vm_manager.status_store.get("VM1").last_probe)
+        self.assertEqual(self.vm_manager.get_machine_health("VM1"), "unknown")
+        scheduler.add("VM1")  # No longer in flight, so it can be scheduled again
+        self.assertIn("VM1", scheduler.pop_due())
+
+
+class TestSharedStatusSetting(unittest.TestCase):
+    def make_manager(self, value):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        with open(os.path.join(temp_dir.name, "settings.txt"), "w") as f:
+            f.write(f"shared_status={value}\n")
+        vm_manager = VMManager(data_dir=temp_dir.name, interactive=False)
+        self.addCleanup(vm_manager.shutdown)
+        return vm_manager
+
+    def test_only_1_turns_shared_status_on(self):
+        for value in ("0", "False", ""):
+            self.assertIsNone(self.make_manager(value).leader_lease, value)
+        self.assertIsNotNone(self.make_manager("1").leader_lease)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to find probe_scheduler module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from probe_scheduler import ProbeScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProbeScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = ProbeScheduler(base_interval=5, max_interval=40, jitter=0, clock=self.clock)
+        self.scheduler.set_machines(["VM1", "VM2"])
+
+    def probe(self, pc_name, status):
+        """Advance to the machine's due time, pop it and report a result"""
+        while pc_name not in self.scheduler.pop_due():
+            self.clock.now += self.scheduler.next_due_in() or 0.1
+        self.scheduler.record_result(pc_name, status)
+        return self.scheduler.interval_for(pc_name)
+
+    def test_new_machines_are_spread_across_one_interval(self):
+        scheduler = ProbeScheduler(base_interval=10, clock=self.clock)
+        scheduler.set_machines([f"VM{i}" for i in range(100)])
+        self.clock.now += 5
+        first_half = scheduler.pop_due()
+        self.assertEqual(len(first_half), 50)
+        self.clock.now += 5
+        self.assertEqual(len(scheduler.pop_due()), 50)
+        # In-flight machines are not handed out twice
+        self.assertEqual(scheduler.pop_due(), [])
+
+    def test_unprobed_machines_are_popped_first(self):
+        self.clock.now += 5
+        self.scheduler.pop_due()
+        self.scheduler.record_result("VM1", True)
+        self.scheduler.record_result("VM2", True)
+        self.scheduler.add("VM3")
+        self.clock.now += 100
+        self.assertEqual(self.scheduler.pop_due(limit=1), ["VM3"])
+        self.assertEqual(sorted(self.scheduler.pop_due()), ["VM1", "VM2"])
+
+    def test_reschedules_are_jittered(self):
+        scheduler = ProbeScheduler(base_interval=10, jitter=0.2, clock=self.clock)
+        scheduler.set_machines(["VM1"])
+        delays = set()
+        for _ in range(20):
+            self.clock.now += 100
+            scheduler.pop_due()
+            scheduler.record_result("VM1", True)
+            delays.add(round(scheduler.next_due_in(), 6))
+            scheduler.remove("VM1")
+            scheduler.set_machines(["VM1"])
+        self.assertGreater(len(delays), 1)
+        self.assertTrue(all(8 <= delay <= 12 for delay in delays))
+
+    def test_base_interval_change_applies_to_waiting_machines(self):
+        self.scheduler.remove("VM2")
+        for _ in range(4):
+            self.probe("VM1", True)
+        self.assertAlmostEqual(self.scheduler.next_due_in(), 40)
+        self.scheduler.set_base_interval(1)
+        self.assertLessEqual(self.scheduler.next_due_in(), 1)
+
+    def test_stable_machine_backs_off_to_ceiling(self):
+        intervals = [self.probe("VM1", False) for _ in range(6)]
+        self.assertEqual(intervals, [5, 10, 20, 40, 40, 40])
+
+    def test_state_change_is_rechecked_quickly(self):
+        self.scheduler.remove("VM2")
+        for _ in range(4):
+            self.probe("VM1", False)
+        self.probe("VM1", True)
+        self.assertAlmostEqual(self.scheduler.next_due_in(), self.scheduler.urgent_delay)
+
+    def test_boost_pulls_probe_forward(self):
+        self.scheduler.remove("VM2")
+        for _ in range(4):
+            self.probe("VM1", True)
+        self.scheduler.boost("VM1")
+        self.assertAlmostEqual(self.scheduler.next_due_in(), self.scheduler.urgent_delay)
+        self.assertEqual(self.probe("VM1", True), 10)
+
+    def test_watched_machine_stays_on_base_interval(self):
+        for _ in range(4):
+            self.probe("VM1", False)
+        self.scheduler.watch("VM1")
+        self.assertEqual(self.probe("VM1", False), 5)
+        self.scheduler.unwatch("VM1")
+        self.assertGreater(self.scheduler.interval_for("VM1"), 5)
+
+    def test_removed_machine_result_is_ignored(self):
+        self.scheduler.pop_due()
+        self.scheduler.remove("VM1")
+        self.scheduler.record_result("VM1", True)
+        self.scheduler.record_result("VM2", True)
+        self.clock.now += 1000
+        self.assertEqual(self.scheduler.pop_due(), ["VM2"])
+
+    def test_min_interval_is_a_floor(self):
+        self.scheduler.set_min_interval("VM1", 30)
+        self.assertEqual(self.scheduler.interval_for("VM1"), 30)
+        self.scheduler.watch("VM1")
+        self.assertEqual(self.scheduler.interval_for("VM1"), 30)
+        self.scheduler.set_min_interval("VM1", None)
+        self.assertEqual(self.scheduler.interval_for("VM1"), 5)
+
+    def test_breaker_opens_after_consecutive_failures(self):
+        scheduler = ProbeScheduler(base_interval=5, max_interval=40, jitter=0, failure_threshold=3,
+                                   open_interval=600, clock=self.clock)
+        scheduler.set_machines(["VM1"])
+        opened = []
+        for _ in range(3):
+            self.clock.now += scheduler.next_due_in()
+            scheduler.pop_due()
+            opened.append(scheduler.record_result("VM1", False))
+        self.assertEqual(opened, [False, False, True])
+        self.assertTrue(scheduler.is_open("VM1"))
+        self.assertEqual(scheduler.open_machines(), ["VM1"])
+        self.assertAlmostEqual(scheduler.next_due_in(), 600)
+
+        # One success closes it again
+        self.clock.now += 600
+        scheduler.pop_due()
+        self.assertTrue(scheduler.record_result("VM1", True))
+        self.assertFalse(scheduler.is_open("VM1"))
+
+    def test_reset_breaker_probes_immediately(self):
+        scheduler = ProbeScheduler(base_interval=5, jitter=0, failure_threshold=1, clock=self.clock)
+        scheduler.set_machines(["VM1"])
+        self.clock.now += 5
+        scheduler.pop_due()
+        scheduler.record_result("VM1", False)
+        self.assertTrue(scheduler.reset_breaker("VM1"))
+        self.assertFalse(scheduler.is_open("VM1"))
+        self.assertEqual(scheduler.pop_due(), ["VM1"])
+        self.assertFalse(scheduler.reset_breaker("VM1"))
+
+    def test_offscreen_machines_use_background_interval(self):
+        self.scheduler.set_visible_machines(["VM1"])
+        self.assertEqual(self.scheduler.interval_for("VM1"), 5)
+        self.assertEqual(self.scheduler.interval_for("VM2"), 300)
+        self.scheduler.set_visible_machines(None)
+        self.assertEqual(self.scheduler.interval_for("VM2"), 5)
+
+    def test_machine_scrolled_into_view_is_probed_promptly(self):
+        self.scheduler.set_visible_machines(["VM1"])
+        self.clock.now += 5
+        self.scheduler.pop_due()
+        self.scheduler.record_result("VM1", True)
+        self.scheduler.record_result("VM2", True)
+        self.clock.now += 10
+        self.assertEqual(self.scheduler.pop_due(), ["VM1"])
+        self.scheduler.record_result("VM1", True)
+        self.scheduler.set_visible_machines(["VM2"])
+        self.clock.now += 1
+        self.assertEqual(self.scheduler.pop_due(), ["VM2"])
+
+    def test_window_state_slows_probes(self):
+        self.scheduler.set_window_state("unfocused")
+        self.assertEqual(self.scheduler.interval_for("VM1"), 10)
+        self.scheduler.set_window_state("hidden")
+        self.assertEqual(self.scheduler.interval_for("VM1"), 300)
+        self.scheduler.watch("VM1")
+        self.assertEqual(self.scheduler.interval_for("VM1"), 5)
+
+    def test_restored_window_refreshes_visible_machines(self):
+        self.scheduler.set_window_state("hidden")
+        self.clock.now += 5
+        self.scheduler.pop_due()
+        self.scheduler.record_result("VM1", True)
+        self.scheduler.record_result("VM2", True)
+        self.clock.now += 10
+        self.assertEqual(self.scheduler.pop_due(), [])
+        self.scheduler.set_window_state("active")
+        self.clock.now += 1
+        self.assertEqual(sorted(self.scheduler.pop_due()), ["VM1", "VM2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
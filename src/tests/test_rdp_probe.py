@@ -0,0 +1,124 @@
+import unittest
+import socket
+import struct
+import threading
+import sys
+import os
+
+# Add parent directory to path to find rdp_probe module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rdp_probe import build_connection_request, is_connection_confirm, check_rdp_handshake
+from status_engine import StatusEngine
+
+# X.224 Connection Confirm with an RDP_NEG_RSP selecting TLS
+CONNECTION_CONFIRM = (struct.pack(">BBH", 3, 0, 19) + struct.pack(">BBHHB", 14, 0xD0, 0, 0x1234, 0)
+                      + struct.pack("<BBHI", 0x02, 0, 8, 1))
+
+
+class StandInRdpServer:
+    """Speaks just enough RDP to answer a Connection Request, or hangs like a stuck session host"""
+    def __init__(self, hung=False):
+        self.hung = hung
+        self.requests = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        self.connections = []
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections.append(conn)
+            conn.settimeout(2)
+            try:
+                header = conn.recv(4)
+                if len(header) < 4:
+                    continue
+                body = conn.recv(struct.unpack(">H", header[2:4])[0] - 4)
+                self.requests.append(header + body)
+                if not self.hung:
+                    conn.sendall(CONNECTION_CONFIRM)
+            except OSError:
+                pass
+
+    def close(self):
+        self.sock.close()
+        for conn in self.connections:
+            conn.close()
+
+
+class TestRdpProbe(unittest.TestCase):
+    def test_connection_request_layout(self):
+        request = build_connection_request()
+        self.assertEqual(request[0], 3)
+        self.assertEqual(struct.unpack(">H", request[2:4])[0], len(request))
+        self.assertEqual(request[5], 0xE0)
+        self.assertEqual(request[4], len(request) - 5)
+
+    def test_confirm_validation(self):
+        self.assertTrue(is_connection_confirm(CONNECTION_CONFIRM))
+        self.assertFalse(is_connection_confirm(build_connection_request()))
+        self.assertFalse(is_connection_confirm(b"HTTP/1.1 400 Bad Request\r\n\r\n"))
+        self.assertFalse(is_connection_confirm(CONNECTION_CONFIRM[:-1]))
+
+    def test_blocking_check_against_stand_in_server(self):
+        server = StandInRdpServer()
+        try:
+            self.assertTrue(check_rdp_handshake("127.0.0.1", server.port, timeout=2))
+            self.assertEqual(server.requests, [build_connection_request()])
+        finally:
+            server.close()
+
+    def test_blocking_check_times_out_on_hung_server(self):
+        server = StandInRdpServer(hung=True)
+        try:
+            self.assertFalse(check_rdp_handshake("127.0.0.1", server.port, timeout=0.3))
+        finally:
+            server.close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEngineHandshake(unittest.TestCase):
+    def make_engine(self, server):
+        self.clock = FakeClock()
+        engine = StatusEngine(port=server.port, timeout=0.3, handshake_interval=60, clock=self.clock)
+        self.addCleanup(engine.stop)
+        return engine
+
+    def test_handshake_runs_once_per_interval(self):
+        server = StandInRdpServer()
+        self.addCleanup(server.close)
+        engine = self.make_engine(server)
+        for _ in range(3):
+            self.assertEqual(engine.sweep(["127.0.0.1"]).result(timeout=5), {"127.0.0.1": True})
+        self.assertEqual(len(server.requests), 1)
+        self.clock.now += 60
+        engine.sweep(["127.0.0.1"]).result(timeout=5)
+        self.assertEqual(len(server.requests), 2)
+
+    def test_hung_session_host_is_offline(self):
+        server = StandInRdpServer(hung=True)
+        self.addCleanup(server.close)
+        engine = self.make_engine(server)
+        self.assertEqual(engine.sweep(["127.0.0.1"]).result(timeout=5), {"127.0.0.1": False})
+        # Failed machines are re-checked on the next probe rather than after the interval
+        engine.sweep(["127.0.0.1"]).result(timeout=5)
+        self.assertEqual(len(server.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
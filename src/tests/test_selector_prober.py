@@ -0,0 +1,79 @@
+import unittest
+import errno
+import socket
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to path to find selector_prober module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selector_prober import SelectorProber, max_open_sockets
+from status_engine import StatusEngine
+
+
+class TestSelectorProber(unittest.TestCase):
+    def setUp(self):
+        # Listener on all interfaces so every 127.x.y.z address reaches it
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("0.0.0.0", 0))
+        self.listener.listen(512)
+        self.port = self.listener.getsockname()[1]
+        self.prober = SelectorProber(port=self.port, timeout=1, batch_size=50)
+
+    def tearDown(self):
+        self.listener.close()
+        self.prober.dns_cache.shutdown()
+
+    def test_check_machine_status_contract(self):
+        self.assertTrue(self.prober.check_machine_status("127.0.0.1"))
+        self.assertFalse(self.prober.check_machine_status("no-such-host.invalid"))
+
+    def test_probe_many_records_latency_across_batches(self):
+        targets = [f"127.0.{i // 200}.{i % 200 + 1}" for i in range(120)]
+        reported = []
+        results = self.prober.probe_many(targets, on_result=lambda name, online, ip, latency_ms: reported.append(name))
+        self.assertEqual(len(results), 120)
+        self.assertEqual(sorted(reported), sorted(targets))
+        for is_online, latency_ms, ip in results.values():
+            self.assertTrue(is_online)
+            self.assertGreaterEqual(latency_ms, 0)
+
+    def test_closed_port_is_offline(self):
+        self.listener.close()
+        is_online, latency_ms, ip = self.prober.probe_many(["127.0.0.1"])["127.0.0.1"]
+        self.assertFalse(is_online)
+        self.assertIsNone(latency_ms)
+        self.assertEqual(ip, "127.0.0.1")
+
+    def test_out_of_descriptors_fails_only_that_machine(self):
+        real_socket = socket.socket
+        opened = []
+
+        def limited_socket(*args):
+            if len(opened) >= 2:
+                raise OSError(errno.EMFILE, "Too many open files")
+            opened.append(None)
+            return real_socket(*args)
+
+        targets = ["127.0.0.1", "127.0.0.2", "127.0.0.3", "127.0.0.4"]
+        with mock.patch("selector_prober.socket.socket", limited_socket):
+            results = self.prober.probe_many(targets)
+        self.assertEqual([results[target][0] for target in targets], [True, True, False, False])
+
+    def test_batches_fit_the_descriptor_limit(self):
+        self.assertGreater(max_open_sockets(), 0)
+        with mock.patch("selector_prober.resource.getrlimit", return_value=(1024, 4096)):
+            self.assertEqual(max_open_sockets(), 768)
+
+    def test_engine_delegates_to_batch_prober(self):
+        engine = StatusEngine(batch_prober=self.prober)
+        try:
+            results = engine.sweep(["127.0.0.1", "127.0.0.2"]).result(timeout=5)
+        finally:
+            engine.stop()
+        self.assertEqual(results, {"127.0.0.1": True, "127.0.0.2": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
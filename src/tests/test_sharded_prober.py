@@ -0,0 +1,104 @@
+import unittest
+import io
+import socket
+import sys
+import os
+import threading
+import time
+from contextlib import redirect_stdout
+
+# Add parent directory to path to find sharded_prober module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sharded_prober import ShardedProber, shard_for
+from status_engine import StatusEngine
+
+
+class TestShardedProber(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Listener on all interfaces so every 127.x.y.z address reaches it
+        cls.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        cls.listener.bind(("0.0.0.0", 0))
+        cls.listener.listen(512)
+        cls.port = cls.listener.getsockname()[1]
+        cls.prober = ShardedProber(workers=2, port=cls.port, timeout=1, result_batch_size=16)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.prober.shutdown()
+        cls.listener.close()
+
+    def test_shards_are_stable_and_cover_all_workers(self):
+        names = [f"VM{i}" for i in range(100)]
+        shards = [shard_for(name, 4) for name in names]
+        self.assertEqual(shards, [shard_for(name, 4) for name in names])
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+        self.assertEqual(shard_for("vm1", 4), shard_for("VM1", 4))
+
+    def test_probe_many_streams_batched_results(self):
+        targets = [f"127.0.1.{i + 1}" for i in range(100)]
+        reported = []
+        results = self.prober.probe_many(
+            targets, on_result=lambda name, online, ip, latency_ms: reported.append(name))
+        self.assertEqual(sorted(results), sorted(targets))
+        self.assertEqual(sorted(reported), sorted(targets))
+        self.assertTrue(all(is_online for is_online, _, _ in results.values()))
+
+    def test_unresolvable_machine_is_offline(self):
+        self.assertFalse(self.prober.check_machine_status("no-such-host.invalid"))
+
+    def test_engine_delegates_to_sharded_prober(self):
+        engine = StatusEngine(batch_prober=self.prober)
+        try:
+            results = engine.sweep(["127.0.0.1", "127.0.0.2"]).result(timeout=10)
+        finally:
+            engine.stop()
+        self.assertEqual(results, {"127.0.0.1": True, "127.0.0.2": True})
+
+
+class TestWorkerFailure(unittest.TestCase):
+    def setUp(self):
+        # A listener whose backlog is full never answers, so probes to it hang
+        self.stuck = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.stuck.bind(("127.0.0.1", 0))
+        self.stuck.listen(0)
+        self.backlog = []
+        for _ in range(3):
+            client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            client.setblocking(False)
+            client.connect_ex(self.stuck.getsockname())
+            self.backlog.append(client)
+        self.prober = ShardedProber(workers=1, port=self.stuck.getsockname()[1], timeout=30,
+                                    liveness_interval=0.1)
+
+    def tearDown(self):
+        self.prober.shutdown()
+        for client in self.backlog:
+            client.close()
+        self.stuck.close()
+
+    def test_worker_killed_during_sweep(self):
+        self.prober.start()
+        worker = self.prober._processes[0]
+        threading.Timer(1, worker.kill).start()
+        started = time.monotonic()
+        with redirect_stdout(io.StringIO()):
+            results = self.prober.probe_many(["127.0.0.1"])
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(results, {"127.0.0.1": (False, None, None)})
+
+        # The worker was replaced and the next sweep runs normally
+        self.assertIsNot(self.prober._processes[0], worker)
+        self.assertTrue(self.prober._processes[0].is_alive())
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(16)
+        try:
+            self.assertTrue(self.prober.probe_many(["127.0.0.1"], port=listener.getsockname()[1])["127.0.0.1"][0])
+        finally:
+            listener.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
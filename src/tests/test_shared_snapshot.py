@@ -0,0 +1,113 @@
+import unittest
+import os
+import struct
+import sys
+import tempfile
+
+# Add parent directory to path to find shared_snapshot module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_snapshot import LeaderLease, SnapshotReader, SnapshotWriter
+from status_store import MachineStatus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "status_snapshot.bin")
+        self.writer = SnapshotWriter(self.path, initial_capacity=4)
+        self.reader = SnapshotReader(self.path)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        records = {
+            "VM1": MachineStatus(online=True, last_probe=123.5, latency_ms=12.7, ip="10.0.0.1"),
+            "VM2": MachineStatus(online=False, last_probe=124.0, latency_ms=None, ip=None),
+            "VM3": MachineStatus(online=None, last_probe=None, latency_ms=None, ip=None),
+        }
+        self.writer.publish(records, published_at=200.0)
+        sequence, published_at, read_back = self.reader.read()
+        self.assertEqual(published_at, 200.0)
+        self.assertEqual(sequence % 2, 0)
+        self.assertEqual(read_back["VM1"], MachineStatus(True, 123.5, 12, "10.0.0.1"))
+        self.assertEqual(read_back["VM2"], records["VM2"])
+        self.assertEqual(read_back["VM3"], records["VM3"])
+
+    def test_reader_follows_growth(self):
+        self.writer.publish({"VM1": MachineStatus(True, 1.0, None, None)})
+        self.assertEqual(len(self.reader.read()[2]), 1)
+        many = {f"VM{i}": MachineStatus(True, 1.0, None, None) for i in range(50)}
+        self.writer.publish(many)
+        sequence, _, read_back = self.reader.read()
+        self.assertEqual(set(read_back), set(many))
+
+    def test_write_in_progress_is_not_read(self):
+        self.writer.publish({"VM1": MachineStatus(True, 1.0, None, None)})
+        with open(self.path, "r+b") as f:
+            f.seek(16)
+            f.write(struct.pack("<Q", 7))  # Odd sequence: leader mid-write
+        self.assertIsNone(SnapshotReader(self.path, retries=2).read())
+
+    def test_unknown_version_is_ignored(self):
+        self.writer.publish({"VM1": MachineStatus(True, 1.0, None, None)})
+        with open(self.path, "r+b") as f:
+            f.seek(4)
+            f.write(struct.pack("<H", 99))
+        self.assertIsNone(SnapshotReader(self.path).read())
+
+    def test_missing_file_reads_none(self):
+        self.assertIsNone(SnapshotReader(os.path.join(self.temp_dir.name, "missing.bin")).read())
+
+
+class TestLeaderLease(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "prober.lock")
+        self.clock = FakeClock()
+        self.first = LeaderLease(self.path, lease_seconds=15, owner_id="first", clock=self.clock)
+        self.second = LeaderLease(self.path, lease_seconds=15, owner_id="second", clock=self.clock)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_only_one_leader(self):
+        self.assertTrue(self.first.try_acquire())
+        self.assertFalse(self.second.try_acquire())
+        self.assertEqual(self.second.holder(), "first")
+
+    def test_renewal_keeps_the_lease(self):
+        self.first.try_acquire()
+        self.clock.now += 10
+        self.assertTrue(self.first.try_acquire())
+        self.clock.now += 10
+        self.assertFalse(self.second.try_acquire())
+
+    def test_crashed_leader_lease_expires(self):
+        self.first.try_acquire()
+        self.clock.now += 16
+        self.assertIsNone(self.second.holder())
+        self.assertTrue(self.second.try_acquire())
+        self.assertFalse(self.first.try_acquire())
+
+    def test_release_hands_over_immediately(self):
+        self.first.try_acquire()
+        self.second.release()  # Not the holder: no effect
+        self.assertFalse(self.second.try_acquire())
+        self.first.release()
+        self.assertTrue(self.second.try_acquire())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add parent directory to path to find sqlite_storage module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlite_storage import DB_FILE_NAME, SqliteStorage, migrate
+from VMmanagerpython import FileManager, VMManager
+
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage = SqliteStorage(self.temp_dir.name)
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    def reopen(self):
+        self.storage.close()
+        self.storage = SqliteStorage(self.temp_dir.name)
+
+    def test_round_trip(self):
+        self.storage.save_pcs(["VM2", "VM1", "VM3"])
+        self.storage.save_descriptions({"VM1": "build: box"})
+        self.storage.save_machine_tags({"VM1": ["lab", "gpu"], "VM2": ["lab"]})
+        self.storage.save_machine_probe_configs({"VM1": {"port": 3390, "min_interval": 60.0}, "VM2": {}})
+        self.storage.save_settings({"refresh_interval": 5, "rdp_path": ""})
+        self.reopen()
+        self.assertEqual(self.storage.load_pcs(), ["VM2", "VM1", "VM3"])
+        self.assertEqual(self.storage.load_descriptions(), {"VM1": "build: box"})
+        self.assertEqual(self.storage.load_machine_tags(), {"VM1": ["lab", "gpu"], "VM2": ["lab"]})
+        self.assertEqual(self.storage.load_machine_probe_configs(), {"VM1": {"port": 3390, "min_interval": 60.0}})
+        # Values come back as strings, like the settings text file
+        self.assertEqual(self.storage.load_settings(), {"refresh_interval": "5", "rdp_path": ""})
+        self.assertEqual(self.storage.load_categories(), ["Default"])
+
+    def test_removed_entries_are_deleted(self):
+        self.storage.save_machine_ips({"VM1": "10.0.0.1", "VM2": "10.0.0.2"})
+        self.storage.save_pcs(["VM1", "VM2", "VM3"])
+        self.storage.save_machine_ips({"VM2": "10.0.0.2", "VM3": "10.0.0.3"})
+        self.storage.save_pcs(["VM3", "VM1"])
+        self.reopen()
+        self.assertEqual(self.storage.load_machine_ips(), {"VM2": "10.0.0.2", "VM3": "10.0.0.3"})
+        self.assertEqual(self.storage.load_pcs(), ["VM3", "VM1"])
+
+    def test_save_writes_only_changed_rows(self):
+        machine_tags = {f"VM{i}": ["lab", "win11"] for i in range(1000)}
+        self.storage.save_machine_tags(machine_tags)
+        connection = self.storage._connection
+        before = connection.total_changes
+        machine_tags["VM7"] = ["lab", "win11", "gpu"]
+        self.storage.save_machine_tags(machine_tags)
+        # Only VM7's rows are rewritten: two deleted, three inserted
+        self.assertEqual(connection.total_changes - before, 5)
+        del machine_tags["VM8"]
+        self.storage.save_machine_tags(machine_tags)
+        self.assertEqual(connection.total_changes - before, 7)
+        self.reopen()
+        loaded = self.storage.load_machine_tags()
+        self.assertEqual(loaded["VM7"], ["lab", "win11", "gpu"])
+        self.assertNotIn("VM8", loaded)
+
+    def test_migrate_from_text_files(self):
+        source_dir = os.path.join(self.temp_dir.name, "text")
+        file_manager = FileManager(source_dir)
+        file_manager.save_pcs(["VM1", "VM2"])
+        file_manager.save_machine_categories({"VM1": "Lab"})
+        file_manager.save_categories(["Default", "Lab"])
+        file_manager.save_category_colors({"Lab": "#FF0000"})
+        file_manager.save_tags(["gpu"])
+        file_manager.save_machine_tags({"VM2": ["gpu"]})
+        file_manager.save_machine_ips({"VM1": "10.0.0.1"})
+        file_manager.save_settings({"theme": "light"})
+
+        target = SqliteStorage(source_dir)
+        migrate(file_manager, target)
+        target.close()
+        self.assertTrue(os.path.exists(os.path.join(source_dir, DB_FILE_NAME)))
+
+        # The database takes over from the text files
+        vm_manager = VMManager(data_dir=source_dir, interactive=False)
+        try:
+            self.assertIsInstance(vm_manager.file_manager, SqliteStorage)
+            self.assertEqual(vm_manager.pc_names, ["VM1", "VM2"])
+            self.assertEqual(vm_manager.get_machine_category("VM1"), "Lab")
+            self.assertEqual(vm_manager.category_colors, {"Lab": "#FF0000"})
+            self.assertEqual(vm_manager.get_machine_tags("VM2"), ["gpu"])
+            self.assertEqual(vm_manager.machine_ips, {"VM1": "10.0.0.1"})
+            self.assertEqual(vm_manager.settings_manager.settings["theme"], "light")
+        finally:
+            vm_manager.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import asyncio
+import socket
+import sys
+import os
+import time
+
+# Add parent directory to path to find status_engine module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_cache import DnsCache
+from selector_prober import SelectorProber
+from status_engine import StatusEngine
+
+
+class TestStatusEngine(unittest.TestCase):
+    def setUp(self):
+        # Local listener standing in for an RDP host
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(128)
+        self.port = self.listener.getsockname()[1]
+        self.results = {}
+        self.latencies = {}
+        self.engine = StatusEngine(
+            on_result=self.record_result,
+            port=self.port,
+            timeout=1
+        )
+
+    def record_result(self, pc_name, is_online, ip, latency_ms):
+        self.results[pc_name] = (is_online, ip)
+        self.latencies[pc_name] = latency_ms
+
+    def tearDown(self):
+        self.engine.stop()
+        self.listener.close()
+
+    def test_sweep_reports_online_machine(self):
+        results = self.engine.sweep(["127.0.0.1"]).result(timeout=5)
+        self.assertEqual(results, {"127.0.0.1": True})
+        self.assertEqual(self.results["127.0.0.1"], (True, "127.0.0.1"))
+        self.assertGreaterEqual(self.latencies["127.0.0.1"], 0)
+
+    def test_sweep_reports_closed_port_offline(self):
+        self.listener.close()
+        results = self.engine.sweep(["127.0.0.1"]).result(timeout=5)
+        self.assertEqual(results, {"127.0.0.1": False})
+        self.assertIsNone(self.latencies["127.0.0.1"])
+
+    def test_per_machine_port_override(self):
+        engine = StatusEngine(port=1, timeout=1)
+        self.addCleanup(engine.stop)
+        self.assertEqual(engine.sweep(["127.0.0.1"]).result(timeout=5), {"127.0.0.1": False})
+        engine.probe_overrides["127.0.0.1"] = {"port": self.port}
+        self.assertEqual(engine.probe_target("127.0.0.1"), (self.port, 1))
+        self.assertEqual(engine.sweep(["127.0.0.1"]).result(timeout=5), {"127.0.0.1": True})
+
+    def test_dns_timeout_is_not_offline(self):
+        def slow_resolver(hostname):
+            time.sleep(0.5)
+            return "127.0.0.1"
+
+        dns_cache = DnsCache(lookup_timeout=0.1, resolver=slow_resolver)
+        self.addCleanup(dns_cache.shutdown)
+        engine = StatusEngine(on_result=self.record_result, port=self.port, timeout=1, dns_cache=dns_cache)
+        self.addCleanup(engine.stop)
+        self.assertEqual(engine.sweep(["VM1"]).result(timeout=5), {"VM1": None})
+        self.assertEqual(self.results["VM1"], (None, None))
+
+    def test_handshake_needs_the_asyncio_engine(self):
+        prober = SelectorProber()
+        self.addCleanup(prober.dns_cache.shutdown)
+        with self.assertRaises(ValueError):
+            StatusEngine(batch_prober=prober, handshake_interval=60)
+
+    def test_check_rdp_without_rdp_service(self):
+        # The listener accepts but never answers the X.224 request
+        port_open, rdp_answered = self.engine.check_rdp("127.0.0.1").result(timeout=5)
+        self.assertTrue(port_open)
+        self.assertFalse(rdp_answered)
+        self.listener.close()
+        self.assertEqual(self.engine.check_rdp("127.0.0.1").result(timeout=5), (False, False))
+
+    def test_unresolvable_machine_is_offline(self):
+        results = self.engine.sweep(["no-such-host.invalid"]).result(timeout=10)
+        self.assertEqual(results, {"no-such-host.invalid": False})
+        self.assertEqual(self.results["no-such-host.invalid"], (False, None))
+
+    def test_concurrency_is_capped(self):
+        in_flight = {"current": 0, "peak": 0}
+
+        async def slow_check(pc_name):
+            in_flight["current"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            return None, True, 1.0
+
+        engine = StatusEngine(max_concurrency=5)
+        engine._check = slow_check
+        try:
+            results = engine.sweep([f"vm{i}" for i in range(50)]).result(timeout=5)
+        finally:
+            engine.stop()
+        self.assertEqual(len(results), 50)
+        self.assertLessEqual(in_flight["peak"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
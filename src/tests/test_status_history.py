@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to find status_history module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from status_history import StatusHistory, FleetHistory
+
+
+class TestStatusHistory(unittest.TestCase):
+    def test_ring_buffer_keeps_newest_samples(self):
+        history = StatusHistory(capacity=4)
+        for second in range(6):
+            history.record(True, latency_ms=second, timestamp=1000 + second)
+        samples = history.samples(now=2000)
+        self.assertEqual(len(history), 4)
+        self.assertEqual([sample[0] for sample in samples], [1002, 1003, 1004, 1005])
+        self.assertEqual([sample[2] for sample in samples], [2, 3, 4, 5])
+
+    def test_uptime_is_time_weighted(self):
+        history = StatusHistory()
+        history.record(True, timestamp=1000)
+        history.record(False, timestamp=1030)  # Up for 30 s
+        history.record(True, timestamp=1040)   # Down for 10 s
+        self.assertAlmostEqual(history.uptime_percent(now=1100), 90.0)
+
+    def test_flaps_and_latency_respect_window(self):
+        history = StatusHistory()
+        for offset, online, latency in [(0, True, 10), (10, False, None), (20, True, 30),
+                                        (30, False, None), (40, True, 50)]:
+            history.record(online, latency, timestamp=1000 + offset)
+        self.assertEqual(history.flap_count(now=1045), 4)
+        self.assertAlmostEqual(history.mean_latency(now=1045), 30.0)
+        # Only the last two samples fall in a 20 s window
+        self.assertEqual(history.flap_count(window=20, now=1045), 1)
+        self.assertAlmostEqual(history.mean_latency(window=20, now=1045), 50.0)
+
+    def test_down_and_unknown_latency_markers(self):
+        history = StatusHistory()
+        history.record(False, timestamp=1000)
+        history.record(True, timestamp=1001)
+        history.record(True, latency_ms=999999, timestamp=1002)
+        samples = history.samples(now=1003)
+        self.assertEqual(samples[0], (1000, False, None))
+        self.assertEqual(samples[1], (1001, True, None))
+        self.assertTrue(samples[2][1])
+        self.assertLess(samples[2][2], 0xFFFE)
+
+
+class TestFleetHistory(unittest.TestCase):
+    def test_flakiest_machine_comes_first(self):
+        fleet = FleetHistory(capacity=16)
+        for offset in range(6):
+            fleet.record("stable", True, 5, timestamp=1000 + offset)
+            fleet.record("flaky", offset % 2 == 0, None, timestamp=1000 + offset)
+        ranking = fleet.flakiest(now=1010)
+        self.assertEqual([name for name, _ in ranking], ["flaky", "stable"])
+        self.assertEqual(ranking[0][1]["flaps"], 5)
+        fleet.remove("flaky")
+        self.assertIsNone(fleet.summary("flaky"))
+
+
+if __name__ == "__main__":
+    unittest.main()
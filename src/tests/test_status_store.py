@@ -0,0 +1,117 @@
+import unittest
+import threading
+import sys
+import os
+
+# Add parent directory to path to find status_store module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from status_store import StatusStore, UNKNOWN_STATUS, UNKNOWN, HEALTHY, SLOW, DOWN
+
+
+class TestStatusStore(unittest.TestCase):
+    def setUp(self):
+        self.store = StatusStore(["VM1", "VM2"])
+
+    def test_new_machines_start_unknown(self):
+        self.assertEqual(self.store.get("VM1"), UNKNOWN_STATUS)
+        self.assertEqual(self.store.version, 0)
+
+    def test_update_records_details_and_bumps_version(self):
+        self.assertTrue(self.store.update("VM1", True, ip="10.0.0.1", latency_ms=12.5, probed_at=100.0))
+        record = self.store.get("VM1")
+        self.assertEqual((record.online, record.ip, record.latency_ms, record.last_probe),
+                         (True, "10.0.0.1", 12.5, 100.0))
+        self.assertEqual(self.store.version, 1)
+        # Same state again is a write but not a change
+        self.assertFalse(self.store.update("VM1", True))
+        self.assertEqual(self.store.version, 2)
+        self.assertEqual(self.store.get("VM1").ip, "10.0.0.1")
+
+    def test_pop_changes_reports_only_flips(self):
+        # First results leave the unknown state, so both count as changes
+        self.store.update("VM1", True)
+        self.store.update("VM2", False)
+        self.assertEqual(self.store.pop_changes(), {"VM1", "VM2"})
+        self.store.update("VM1", True)
+        self.store.update("VM2", True)
+        self.assertEqual(self.store.pop_changes(), {"VM2"})
+        self.assertEqual(self.store.pop_changes(), set())
+
+    def test_drain_changes_in_frames(self):
+        store = StatusStore([f"VM{i}" for i in range(10)])
+        for i in range(10):
+            store.update(f"VM{i}", True)
+        first, overflowed = store.drain_changes(4)
+        self.assertEqual((first, overflowed), (["VM0", "VM1", "VM2", "VM3"], False))
+        self.assertEqual(len(store.drain_changes()[0]), 6)
+
+    def test_change_overflow_resyncs_everything(self):
+        names = [f"VM{i}" for i in range(10)]
+        store = StatusStore(names, max_pending_changes=5)
+        for name in names:
+            store.update(name, False)
+        self.assertEqual(store.pop_changes(), set(names))
+        store.update("VM1", True)
+        self.assertEqual(store.pop_changes(), {"VM1"})
+
+    def test_health_uses_latency_threshold(self):
+        store = StatusStore(["VM1"], slow_latency_ms=100)
+        store.update("VM1", False)
+        self.assertEqual(store.health("VM1"), DOWN)
+        store.update("VM1", True, latency_ms=20)
+        self.assertEqual(store.health("VM1"), HEALTHY)
+        store.pop_changes()
+        # Getting slow is a change even though the machine stayed online
+        self.assertFalse(store.update("VM1", True, latency_ms=250))
+        self.assertEqual(store.health("VM1"), SLOW)
+        self.assertEqual(store.pop_changes(), {"VM1"})
+        store.set_slow_latency(500)
+        self.assertEqual(store.health("VM1"), HEALTHY)
+        self.assertEqual(store.pop_changes(), {"VM1"})
+
+    def test_unprobed_machine_is_unknown_not_offline(self):
+        self.assertIsNone(self.store.get("VM1").online)
+        self.assertEqual(self.store.health("VM1"), UNKNOWN)
+        self.assertIsNone(self.store.age("VM1"))
+        # The first result is a change even when the machine turns out to be offline
+        self.assertTrue(self.store.update("VM1", False, probed_at=100.0))
+        self.assertEqual(self.store.health("VM1"), DOWN)
+        self.assertEqual(self.store.age("VM1", now=130.0), 30.0)
+
+    def test_mark_changed_reports_machine(self):
+        self.store.mark_changed("VM2")
+        self.store.mark_changed("VM3")
+        self.assertEqual(self.store.pop_changes(), {"VM2"})
+        self.assertEqual(self.store.version, 1)
+
+    def test_snapshot_is_isolated_from_later_writes(self):
+        version, snapshot = self.store.snapshot()
+        self.store.update("VM1", True)
+        self.assertFalse(snapshot["VM1"].online)
+        self.assertGreater(self.store.version, version)
+
+    def test_removed_machine_ignores_late_results(self):
+        self.store.remove("VM1")
+        self.assertFalse(self.store.update("VM1", True))
+        self.assertNotIn("VM1", self.store)
+
+    def test_concurrent_writers(self):
+        names = [f"VM{i}" for i in range(100)]
+        store = StatusStore(names)
+
+        def writer():
+            for name in names:
+                store.update(name, True)
+
+        threads = [threading.Thread(target=writer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(store.version, 800)
+        self.assertEqual(store.pop_changes(), set(names))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+from contextlib import redirect_stdout, redirect_stderr
+
+# Add parent directory to path to find vm_status_cli module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vm_status_cli
+
+
+class TestStatusCli(unittest.TestCase):
+    def setUp(self):
+        # Local listener standing in for an RDP host
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        port = self.listener.getsockname()[1]
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = self.temp_dir.name
+        with open(os.path.join(self.data_dir, "pcs.txt"), "w") as f:
+            f.write("127.0.0.1\nno-such-host.invalid\n")
+        with open(os.path.join(self.data_dir, "settings.txt"), "w") as f:
+            f.write(f"probe_port={port}\nprobe_timeout=1\n")
+        with open(os.path.join(self.data_dir, "machine_tags.txt"), "w") as f:
+            f.write("127.0.0.1:lab\n")
+
+    def tearDown(self):
+        self.listener.close()
+        self.temp_dir.cleanup()
+
+    def run_cli(self, *args):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            exit_code = vm_status_cli.main(["--data-dir", self.data_dir, *args])
+        return exit_code, stdout.getvalue()
+
+    def test_ndjson_streams_one_record_per_machine(self):
+        exit_code, output = self.run_cli()
+        self.assertEqual(exit_code, 0)
+        records = {record["name"]: record for record in map(json.loads, output.splitlines())}
+        self.assertEqual(set(records), {"127.0.0.1", "no-such-host.invalid"})
+        local = records["127.0.0.1"]
+        self.assertTrue(local["online"])
+        self.assertEqual(local["ip"], "127.0.0.1")
+        self.assertGreaterEqual(local["latency_ms"], 0)
+        self.assertEqual(local["category"], "Default")
+        self.assertEqual(local["tags"], ["lab"])
+        self.assertFalse(records["no-such-host.invalid"]["online"])
+
+    def test_json_format_and_exit_code(self):
+        exit_code, output = self.run_cli("--format", "json", "--fail-on-offline")
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(len(json.loads(output)), 2)
+
+    def test_machine_selection(self):
+        _, output = self.run_cli("127.0.0.1")
+        self.assertEqual([json.loads(line)["name"] for line in output.splitlines()], ["127.0.0.1"])
+        _, output = self.run_cli("--tag", "lab")
+        self.assertEqual([json.loads(line)["name"] for line in output.splitlines()], ["127.0.0.1"])
+
+    def test_probe_options_reach_the_batch_prober(self):
+        with open(os.path.join(self.data_dir, "settings.txt"), "a") as f:
+            f.write("probe_backend=selectors\nrdp_handshake_interval=60\n")
+        with redirect_stdout(io.StringIO()) as stdout:
+            vm_manager = vm_status_cli.VMManager(data_dir=self.data_dir, interactive=False)
+        self.assertIn("rdp_handshake_interval is not supported", stdout.getvalue())
+        try:
+            vm_status_cli.apply_probe_options(vm_manager, timeout=0.5, concurrency=64)
+            self.assertEqual(vm_manager.status_engine.timeout, 0.5)
+            self.assertEqual(vm_manager.status_engine.batch_prober.timeout, 0.5)
+            self.assertEqual(vm_manager.status_engine.batch_prober.batch_size, 64)
+        finally:
+            vm_manager.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import time
+import sys
+import os
+
+# Add parent directory to path to find write_behind module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from write_behind import WriteBehind
+
+
+class TestWriteBehind(unittest.TestCase):
+    def test_burst_of_marks_is_saved_once(self):
+        saves = []
+        writer = WriteBehind(delay=0.1)
+        for _ in range(1000):
+            writer.mark_dirty("machine_ips", lambda: saves.append("machine_ips"))
+        self.assertEqual(saves, [])
+        time.sleep(0.3)
+        self.assertEqual(saves, ["machine_ips"])
+
+    def test_close_flushes_pending_saves(self):
+        saves = []
+        writer = WriteBehind(delay=60)
+        writer.mark_dirty("a", lambda: saves.append("a"))
+        writer.mark_dirty("b", lambda: saves.append("b"))
+        writer.close()
+        self.assertEqual(sorted(saves), ["a", "b"])
+        # Nothing left to write afterwards
+        writer.flush()
+        self.assertEqual(len(saves), 2)
+
+    def test_failed_save_does_not_block_others(self):
+        saves = []
+        writer = WriteBehind(delay=60)
+
+        def failing_save():
+            raise OSError("disk full")
+
+        writer.mark_dirty("broken", failing_save)
+        writer.mark_dirty("ok", lambda: saves.append("ok"))
+        writer.flush()
+        self.assertEqual(saves, ["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Headless status sweep for VM Manager.
+
+Loads the same data directory as the GUI, probes every machine (or a
+filtered subset) concurrently and writes one JSON object per machine as
+soon as its probe completes (NDJSON), or a single JSON array at the end.
+
+Usage: python vm_status_cli.py [--data-dir DIR] [--format ndjson|json]
+                               [--category NAME] [--tag NAME] [machine ...]
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+from VMmanagerpython import VMManager
+
+
+def status_record(vm_manager, pc_name, is_online, ip, latency_ms):
+    """Build the output record for one probe result"""
+    return {
+        "name": pc_name,
+        "ip": ip,
+        "online": is_online,
+        "latency_ms": round(latency_ms, 1) if latency_ms is not None else None,
+        "health": vm_manager.get_machine_health(pc_name),
+        "category": vm_manager.get_machine_category(pc_name),
+        "tags": vm_manager.get_machine_tags(pc_name),
+    }
+
+
+def select_machines(vm_manager, machines=None, category=None, tags=None):
+    """Pick the machines to probe, keeping the order of the machine list"""
+    selected = list(machines) if machines else list(vm_manager.pc_names)
+    if category:
+        in_category = set(vm_manager.get_machines_by_category(category))
+        selected = [pc_name for pc_name in selected if pc_name in in_category]
+    if tags:
+        tagged = set(vm_manager.get_machines_by_multiple_tags(tags))
+        selected = [pc_name for pc_name in selected if pc_name in tagged]
+    return selected
+
+
+def apply_probe_options(vm_manager, timeout=None, concurrency=None):
+    """Apply --timeout and --concurrency to the status engine and its batch prober, if any.
+
+    For a batch prober the concurrency is the number of connects started
+    at once (per worker process with probe_backend=processes)."""
+    engine = vm_manager.status_engine
+    if timeout:
+        engine.timeout = timeout
+        if engine.batch_prober:
+            engine.batch_prober.timeout = timeout
+    if concurrency:
+        engine.max_concurrency = concurrency
+        if engine.batch_prober:
+            engine.batch_prober.batch_size = concurrency
+
+
+def run_sweep(vm_manager, pc_names, output, output_format="ndjson"):
+    """Probe pc_names and write results to output; returns the list of records"""
+    records = []
+    output_lock = threading.Lock()
+
+    def on_result(pc_name, is_online, ip, latency_ms=None):
+        # Keep the manager's bookkeeping (status store, IP changes) up to date
+        vm_manager._handle_status_result(pc_name, is_online, ip, latency_ms)
+        record = status_record(vm_manager, pc_name, is_online, ip, latency_ms)
+        with output_lock:
+            records.append(record)
+            if output_format == "ndjson":
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+
+    vm_manager.status_engine.on_result = on_result
+    vm_manager.status_engine.sweep(pc_names).result()
+    if output_format == "json":
+        json.dump(records, output, indent=2)
+        output.write("\n")
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("machines", nargs="*", help="machines to probe (default: all)")
+    parser.add_argument("--data-dir", help="data directory to load (default: the GUI's data directory)")
+    parser.add_argument("--format", choices=["ndjson", "json"], default="ndjson")
+    parser.add_argument("--category", help="only probe machines in this category")
+    parser.add_argument("--tag", action="append", dest="tags", help="only probe machines with this tag")
+    parser.add_argument("--timeout", type=float, help="connect timeout in seconds")
+    parser.add_argument("--concurrency", type=int, help="maximum probes in flight")
+    parser.add_argument("--fail-on-offline", action="store_true",
+                        help="exit with status 1 if any machine is offline")
+    args = parser.parse_args(argv)
+
+    vm_manager = VMManager(data_dir=args.data_dir, interactive=False)
+    try:
+        apply_probe_options(vm_manager, args.timeout, args.concurrency)
+        pc_names = select_machines(vm_manager, args.machines, args.category, args.tags)
+
+        started = time.perf_counter()
+        records = run_sweep(vm_manager, pc_names, sys.stdout, args.format)
+        elapsed = time.perf_counter() - started
+        online = sum(1 for record in records if record["online"])
+        print(f"{len(records)} machines probed, {online} online, in {elapsed:.2f} s", file=sys.stderr)
+    finally:
+        vm_manager.shutdown()
+
+    if args.fail_on_offline and online < len(records):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import threading
+
+
+class WriteBehind:
+    """Coalesces repeated saves of the same data into one delayed write.
+
+    mark_dirty(key, save) arms a timer the first time a key becomes dirty;
+    further marks before it fires are absorbed, so a burst of changes costs
+    a single save. flush() writes everything that is pending right away
+    and is used on shutdown."""
+
+    def __init__(self, delay=5.0):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # One flush at a time, so saves of a key never overlap
+        self._pending = {}  # key -> save function
+        self._timer = None
+
+    def mark_dirty(self, key, save):
+        """Schedule save() to run once within the next delay seconds"""
+        with self._lock:
+            self._pending[key] = save
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Run all pending saves now"""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            for key, save in pending.items():
+                try:
+                    save()
+                except Exception as e:
+                    print(f"Error saving {key}: {str(e)}")
+
+    def close(self):
+        """Flush pending saves before the application exits"""
+        self.flush()